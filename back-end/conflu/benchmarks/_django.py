@@ -0,0 +1,41 @@
+"""
+Configuração comum dos benchmarks: Django com um banco SQLite temporário
+(migrado do zero), para nunca tocar no db.sqlite3 do projeto.
+
+Uso: `python -m benchmarks.<nome>` a partir de back-end/conflu.
+"""
+import os
+import statistics
+import tempfile
+from pathlib import Path
+
+
+def configurar(**banco):
+    """
+    Configura o Django num banco temporário e aplica as migrations.
+    `banco` sobrescreve chaves de DATABASES['default'] (ex.: OPTIONS).
+    """
+    os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'conflu_ai.settings')
+    os.environ.setdefault('SECRET_KEY', 'benchmark')
+
+    import django
+    from django.conf import settings
+
+    pasta = Path(tempfile.mkdtemp(prefix='conflu-bench-'))
+    settings.DATABASES['default']['NAME'] = pasta / 'bench.sqlite3'
+    settings.DATABASES['default'].update(banco)
+    settings.REPLICA_PATH = pasta / 'bench.replica.sqlite3'
+    settings.DATABASES['replica']['NAME'] = f"file:{settings.REPLICA_PATH}?mode=ro&immutable=1"
+    settings.QRCODE_DIR = pasta / 'qrcodes'
+    settings.ALLOWED_HOSTS = ['*']
+    django.setup()
+
+    from django.core.management import call_command
+    call_command('migrate', verbosity=0)
+    return pasta
+
+
+def resumo_latencias(latencias):
+    ordenadas = sorted(latencias)
+    p95 = ordenadas[int(len(ordenadas) * 0.95) - 1] if ordenadas else 0
+    return f"p50 {statistics.median(ordenadas) * 1000:.1f} ms, p95 {p95 * 1000:.1f} ms"
@@ -0,0 +1,106 @@
+"""
+Vazão das listagens sob ASGI (uvicorn): viewset síncrona do DRF
+(/api/alunos/) x view async (/api/async/alunos/).
+
+O servidor roda num processo filho sobre um banco temporário populado;
+o cliente abre N conexões keep-alive e dispara as requisições em paralelo.
+
+    python -m benchmarks.asgi --requisicoes 2000 --conexoes 50
+"""
+import argparse
+import asyncio
+import multiprocessing
+import socket
+import time
+from benchmarks._django import configurar, resumo_latencias
+
+ROTAS = {
+    'sync': '/api/alunos/?limit=50',
+    'async': '/api/async/alunos/?limit=50',
+}
+
+
+def porta_livre():
+    with socket.socket() as s:
+        s.bind(('127.0.0.1', 0))
+        return s.getsockname()[1]
+
+
+def servir(porta):
+    import uvicorn
+    from conflu_ai.asgi import application
+
+    uvicorn.run(application, host='127.0.0.1', port=porta, log_level='warning', lifespan='off')
+
+
+async def esperar_servidor(porta, tentativas=100):
+    for _ in range(tentativas):
+        try:
+            _, writer = await asyncio.open_connection('127.0.0.1', porta)
+            writer.close()
+            return
+        except OSError:
+            await asyncio.sleep(0.1)
+    raise RuntimeError('servidor não subiu')
+
+
+async def cliente(porta, caminho, quantidade, latencias, erros):
+    reader, writer = await asyncio.open_connection('127.0.0.1', porta)
+    pedido = f'GET {caminho} HTTP/1.1\r\nHost: localhost\r\n\r\n'.encode()
+    for _ in range(quantidade):
+        inicio = time.perf_counter()
+        writer.write(pedido)
+        cabecalho = await reader.readuntil(b'\r\n\r\n')
+        linhas = cabecalho.decode('latin-1').split('\r\n')
+        tamanho = next(int(l.split(':', 1)[1]) for l in linhas if l.lower().startswith('content-length:'))
+        await reader.readexactly(tamanho)
+        latencias.append(time.perf_counter() - inicio)
+        if not linhas[0].split()[1].startswith('2'):
+            erros.append(linhas[0])
+    writer.close()
+
+
+async def carga(porta, caminho, requisicoes, conexoes):
+    latencias, erros = [], []
+    inicio = time.perf_counter()
+    await asyncio.gather(*(
+        cliente(porta, caminho, requisicoes // conexoes, latencias, erros) for _ in range(conexoes)
+    ))
+    return time.perf_counter() - inicio, latencias, erros
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--requisicoes', type=int, default=2000)
+    parser.add_argument('--conexoes', type=int, default=50)
+    parser.add_argument('--alunos', type=int, default=5000)
+    args = parser.parse_args()
+
+    configurar()
+    from django.db import connections
+    from cadastro.models import Aluno
+
+    Aluno.objects.bulk_create(
+        [Aluno(nome=f'Aluno {i}', email=f'aluno{i}@bench') for i in range(args.alunos)], batch_size=1000
+    )
+    connections.close_all()
+
+    porta = porta_livre()
+    servidor = multiprocessing.get_context('fork').Process(target=servir, args=(porta,), daemon=True)
+    servidor.start()
+    try:
+        asyncio.run(esperar_servidor(porta))
+        # Aquecimento: imports e conexões do servidor
+        asyncio.run(carga(porta, ROTAS['sync'], 20, 2))
+        asyncio.run(carga(porta, ROTAS['async'], 20, 2))
+        for modo, caminho in ROTAS.items():
+            total, latencias, erros = asyncio.run(carga(porta, caminho, args.requisicoes, args.conexoes))
+            print(f"{modo:5} {len(latencias)} requisições em {total:.2f}s ({len(latencias) / total:.0f}/s), "
+                  f"{resumo_latencias(latencias)}, {len(erros)} erro(s)")
+    finally:
+        servidor.terminate()
+        servidor.join()
+
+
+if __name__ == '__main__':
+    main()
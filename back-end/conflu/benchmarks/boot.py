@@ -0,0 +1,107 @@
+"""
+Tempo de boot do servidor: custo de import das URLs (e quais dependências
+pesadas ficaram fora dele) e tempo até a primeira requisição respondida,
+comparando `migrate && serve` com o `serve`, que só roda o migrate quando há
+migrations pendentes.
+
+Tudo roda em processos filhos sobre um banco temporário já migrado, para
+que cada medida parta de um interpretador limpo.
+
+    python -m benchmarks.boot --rodadas 5
+"""
+import argparse
+import json
+import os
+import socket
+import statistics
+import subprocess
+import sys
+import time
+import urllib.request
+from pathlib import Path
+from benchmarks._django import configurar
+
+PESADOS = ['reportlab', 'PyPDF2', 'smtplib', 'qrcode', 'PIL']
+
+IMPORTAR_URLS = f"""
+import json, sys, time
+inicio = time.perf_counter()
+import django
+django.setup()
+import conflu_ai.urls
+fim = time.perf_counter()
+print(json.dumps({{
+    'ms': (fim - inicio) * 1000,
+    'carregados': [m for m in {PESADOS!r} if m in sys.modules],
+}}))
+"""
+
+
+def porta_livre():
+    with socket.socket() as s:
+        s.bind(('127.0.0.1', 0))
+        return s.getsockname()[1]
+
+
+def ambiente(pasta):
+    """Settings do projeto apontando para o banco temporário do benchmark."""
+    (pasta / 'boot_settings.py').write_text(
+        "from conflu_ai.settings import *\n"
+        f"DATABASES['default']['NAME'] = {str(pasta / 'bench.sqlite3')!r}\n"
+        f"REPLICA_PATH = {str(pasta / 'bench.replica.sqlite3')!r}\n"
+        "DATABASES['replica']['NAME'] = f'file:{REPLICA_PATH}?mode=ro&immutable=1'\n"
+        "ALLOWED_HOSTS = ['*']\n"
+    )
+    env = dict(os.environ)
+    env['PYTHONPATH'] = os.pathsep.join(filter(None, [str(pasta), os.getcwd(), env.get('PYTHONPATH')]))
+    env['DJANGO_SETTINGS_MODULE'] = 'boot_settings'
+    return env
+
+
+def importar_urls(env):
+    saida = subprocess.run([sys.executable, '-c', IMPORTAR_URLS], env=env, capture_output=True, text=True, check=True)
+    return json.loads(saida.stdout.strip().splitlines()[-1])
+
+
+def primeira_resposta(comando, env, porta, timeout=60):
+    """Sobe o servidor e mede até o primeiro 200 em /api/alunos/."""
+    inicio = time.perf_counter()
+    processo = subprocess.Popen(comando.format(python=sys.executable, porta=porta), shell=True, env=env,
+                                stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL, start_new_session=True)
+    try:
+        while time.perf_counter() - inicio < timeout:
+            try:
+                with urllib.request.urlopen(f'http://127.0.0.1:{porta}/api/alunos/?limit=1', timeout=1) as resposta:
+                    if resposta.status == 200:
+                        return time.perf_counter() - inicio
+            except OSError:
+                time.sleep(0.02)
+        raise RuntimeError('servidor não respondeu')
+    finally:
+        os.killpg(processo.pid, 15)
+        processo.wait()
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--rodadas', type=int, default=5)
+    args = parser.parse_args()
+
+    pasta = Path(configurar())
+    env = ambiente(pasta)
+
+    medidas = [importar_urls(env) for _ in range(args.rodadas)]
+    print(f"import de conflu_ai.urls: {statistics.median(m['ms'] for m in medidas):.1f} ms (mediana)")
+    print(f"dependências pesadas carregadas no boot: {', '.join(medidas[0]['carregados']) or 'nenhuma'}")
+
+    comandos = {
+        'migrate && serve': '{python} manage.py migrate && {python} manage.py serve --sem-migrate --port {porta} --workers 1',
+        'serve': '{python} manage.py serve --port {porta} --workers 1',
+    }
+    for nome, comando in comandos.items():
+        tempos = [primeira_resposta(comando, env, porta_livre()) for _ in range(args.rodadas)]
+        print(f"{nome:>18}: primeira resposta em {statistics.median(tempos) * 1000:.0f} ms (mediana de {args.rodadas})")
+
+
+if __name__ == '__main__':
+    main()
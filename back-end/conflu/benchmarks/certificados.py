@@ -0,0 +1,77 @@
+"""
+Vazão da emissão de certificados de uma turma inteira.
+
+Compara o caminho de hoje (um certificado por vez, como nas chamadas
+repetidas a POST /api/certificados/, sem o SMTP) com o render em lote de
+certificados.lote em 1..N processos (um PDF por aluno e PDF único), e
+mede a montagem do ZIP. A subida dos workers (spawn + parse do template) é medida à parte:
+no servidor o pool é criado uma vez e reaproveitado.
+
+    python -m benchmarks.certificados --alunos 300 --processos 1 2 4
+"""
+import argparse
+import os
+import time
+from benchmarks._django import configurar
+
+
+def preparar(alunos):
+    from datetime import timedelta
+    from django.utils import timezone
+    from cadastro.models import Aluno, Curso, Matricula, Turma
+
+    hoje = timezone.localdate()
+    curso = Curso.objects.create(nome='Benchmark', valor=100, quant_dias=1)
+    turma = Turma.objects.create(curso_id=curso, localidade='Sala 1', data_inicio=hoje, data_fim=hoje + timedelta(days=1))
+    criados = Aluno.objects.bulk_create([Aluno(nome=f'Aluno Benchmark {i}', email=f'aluno{i}@bench') for i in range(alunos)])
+    Matricula.objects.bulk_create([
+        Matricula(aluno_id=aluno, turma_id=turma, fonte='bench', data_matricula=hoje) for aluno in criados
+    ])
+    return turma.pk
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--alunos', type=int, default=300)
+    parser.add_argument('--processos', type=int, nargs='+', default=sorted({1, os.cpu_count() or 1}))
+    args = parser.parse_args()
+
+    configurar()
+    from conflu_ai import settings
+    from certificados import fila, gerar, lote
+
+    turma_id = preparar(args.alunos)
+    nomes = [nome for nome, _ in fila.alunos_da_turma(turma_id)]
+    print(f"{len(nomes)} certificados, {os.cpu_count()} CPU(s)")
+
+    inicio = time.perf_counter()
+    for nome in nomes:
+        gerar.gerar_certificado(nome, settings.CERTIFICADO_BASE)
+    duracao = time.perf_counter() - inicio
+    print(f"{'serial':>14}: {len(nomes) / duracao:6.1f} cert/s ({duracao:.2f}s)")
+
+    for processos in args.processos:
+        inicio = time.perf_counter()
+        lote.renderizar(nomes[:processos], processos)
+        subida = time.perf_counter() - inicio
+
+        inicio = time.perf_counter()
+        certificados = lote.renderizar(nomes, processos)
+        duracao = time.perf_counter() - inicio
+        print(f"{f'{processos} processo(s)':>14}: {len(nomes) / duracao:6.1f} cert/s ({duracao:.2f}s, subida do pool {subida:.2f}s)")
+
+        inicio = time.perf_counter()
+        unico = lote.renderizar_pdf_unico(nomes, processos)
+        duracao = time.perf_counter() - inicio
+        print(f"{'PDF único':>14}: {len(nomes) / duracao:6.1f} cert/s ({duracao:.2f}s, {len(unico) / 1e6:.1f} MB)")
+
+    inicio = time.perf_counter()
+    conteudo = lote.zipar(nomes, certificados)
+    print(f"{'montar zip':>14}: {time.perf_counter() - inicio:.2f}s, {len(conteudo) / 1e6:.1f} MB")
+
+    for executor in lote._POOLS.values():
+        executor.shutdown()
+
+
+if __name__ == '__main__':
+    main()
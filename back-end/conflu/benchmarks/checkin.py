@@ -0,0 +1,87 @@
+"""
+Leituras simultâneas do QR code de uma aula.
+
+Compara o registro síncrono (um upsert por leitura, via
+POST /api/aulas/<id>/frequencia/) com o check-in em lote
+(POST /api/checkin/, gravado pela fila de cadastro.checkin).
+
+    python -m benchmarks.checkin --alunos 200 --threads 50
+"""
+import argparse
+import time
+from concurrent.futures import ThreadPoolExecutor
+from benchmarks._django import configurar, resumo_latencias
+
+
+def preparar(alunos):
+    from datetime import timedelta
+    from django.utils import timezone
+    from cadastro.models import Aluno, Aula, Curso, Matricula, Turma
+
+    hoje = timezone.localdate()
+    curso = Curso.objects.create(nome='Benchmark', valor=100, quant_dias=1)
+    turma = Turma.objects.create(curso_id=curso, localidade='Sala 1', data_inicio=hoje, data_fim=hoje + timedelta(days=1))
+    aula = Aula.objects.create(turma_id=turma, data=hoje)
+    criados = Aluno.objects.bulk_create([Aluno(nome=f'Aluno {i}', email=f'aluno{i}@bench') for i in range(alunos)])
+    matriculas = Matricula.objects.bulk_create([
+        Matricula(aluno_id=aluno, turma_id=turma, fonte='bench', data_matricula=hoje) for aluno in criados
+    ])
+    return aula, [matricula.id for matricula in matriculas]
+
+
+def disparar(threads, requisicoes):
+    from django.db import connections
+    from django.test import Client
+
+    def enviar(requisicao):
+        url, corpo = requisicao
+        inicio = time.perf_counter()
+        try:
+            resposta = Client().post(url, corpo, content_type='application/json')
+            ok = resposta.status_code < 300
+        except Exception:
+            ok = False
+        finally:
+            connections.close_all()
+        return time.perf_counter() - inicio, ok
+
+    inicio = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=threads) as pool:
+        resultados = list(pool.map(enviar, requisicoes))
+    total = time.perf_counter() - inicio
+    return total, [latencia for latencia, _ in resultados], sum(1 for _, ok in resultados if not ok)
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--alunos', type=int, default=200)
+    parser.add_argument('--threads', type=int, default=50)
+    args = parser.parse_args()
+
+    configurar()
+    import json
+    from cadastro import checkin
+    from cadastro.models import Frequencia
+
+    aula, matriculas = preparar(args.alunos)
+
+    sincrono = [
+        (f'/api/aulas/{aula.id}/frequencia/', json.dumps([{'matricula_id': m, 'presente': True}]))
+        for m in matriculas
+    ]
+    total, latencias, erros = disparar(args.threads, sincrono)
+    print(f"síncrono:  {len(sincrono)} leituras em {total:.2f}s ({len(sincrono) / total:.0f}/s), "
+          f"{resumo_latencias(latencias)}, {erros} erro(s)")
+
+    Frequencia.objects.all().delete()
+    token = checkin.token_aula(aula)
+    em_lote = [('/api/checkin/', json.dumps({'token': token, 'matricula_id': m})) for m in matriculas]
+    total, latencias, erros = disparar(args.threads, em_lote)
+    checkin.fila.esvaziar()
+    gravadas = Frequencia.objects.filter(aula_id=aula, presente=True).count()
+    print(f"em lote:   {len(em_lote)} leituras em {total:.2f}s ({len(em_lote) / total:.0f}/s), "
+          f"{resumo_latencias(latencias)}, {erros} erro(s), {gravadas} presença(s) gravada(s)")
+
+
+if __name__ == '__main__':
+    main()
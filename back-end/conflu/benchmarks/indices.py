@@ -0,0 +1,141 @@
+"""
+Plano de execução das consultas principais do cadastro.
+
+Popula um banco temporário, roda ANALYZE e confere com
+EXPLAIN QUERY PLAN que cada consulta é uma busca por índice nas colunas
+esperadas, sem varrer a tabela nem ordenar em memória (as constraints
+únicas aparecem como sqlite_autoindex_*). Também mede o tempo médio de
+cada consulta. Sai com código 1 se alguma não usar índice.
+
+    python -m benchmarks.indices --alunos 20000
+"""
+import argparse
+import random
+import sys
+import time
+from datetime import date, timedelta
+from benchmarks._django import configurar
+
+REPETICOES = 50
+
+
+def popular(quant_alunos):
+    from cadastro.models import Aluno, Aula, Curso, Frequencia, Matricula, Pagamento, Turma
+
+    random.seed(42)
+    inicio = date(2025, 1, 6)
+    cursos = Curso.objects.bulk_create([
+        Curso(nome=f'Curso {i}', valor=100 + i, quant_dias=5) for i in range(50)
+    ])
+    turmas = Turma.objects.bulk_create([
+        Turma(
+            curso_id=random.choice(cursos),
+            localidade=f'Sala {i % 10}',
+            data_inicio=inicio + timedelta(days=7 * (i % 80)),
+            data_fim=inicio + timedelta(days=7 * (i % 80) + 4),
+        )
+        for i in range(quant_alunos // 40)
+    ])
+    aulas = Aula.objects.bulk_create([
+        Aula(turma_id=turma, data=turma.data_inicio + timedelta(days=d))
+        for turma in turmas for d in range(5)
+    ])
+    alunos = Aluno.objects.bulk_create([
+        Aluno(nome=f'Aluno {i:06d}', email=f'aluno{i}@bench') for i in range(quant_alunos)
+    ], batch_size=1000)
+    matriculas = Matricula.objects.bulk_create([
+        Matricula(aluno_id=aluno, turma_id=turma, fonte='bench', data_matricula=turma.data_inicio)
+        for aluno in alunos
+        for turma in random.sample(turmas, 2)
+    ], batch_size=1000)
+    aulas_por_turma = {}
+    for aula in aulas:
+        aulas_por_turma.setdefault(aula.turma_id_id, []).append(aula)
+    Frequencia.objects.bulk_create([
+        Frequencia(aula_id=aula, matricula_id=matricula, presente=random.random() < 0.8)
+        for matricula in matriculas[::4]
+        for aula in aulas_por_turma[matricula.turma_id_id]
+    ], batch_size=1000)
+    Pagamento.objects.bulk_create([
+        Pagamento(
+            aluno_id=random.choice(alunos),
+            curso_id=random.choice(cursos),
+            status=random.choice(['pago', 'pendente', 'cancelado']),
+            tipo_pagamento=random.choice(['Pix', 'Boleto', 'Cartão']),
+        )
+        for _ in range(quant_alunos)
+    ], batch_size=1000)
+    return alunos, turmas, aulas, matriculas, cursos
+
+
+def consultas(alunos, turmas, aulas, matriculas, cursos):
+    from cadastro.models import Aluno, Aula, Frequencia, Matricula, Pagamento, Turma
+
+    aluno, turma, aula, matricula, curso = alunos[100], turmas[10], aulas[50], matriculas[200], cursos[5]
+    return [
+        ('matrícula de um aluno na turma', 'aluno_id_id=? AND turma_id_id=?',
+         Matricula.objects.filter(aluno_id=matricula.aluno_id_id, turma_id=matricula.turma_id_id)),
+        ('matrículas de um aluno', 'aluno_id_id=?',
+         Matricula.objects.filter(aluno_id=aluno.id)),
+        ('pagamentos de um aluno num curso', 'aluno_id_id=? AND curso_id_id=?',
+         Pagamento.objects.filter(aluno_id=aluno.id, curso_id=curso.id)),
+        ('pagamentos pendentes mais recentes', 'status=?',
+         Pagamento.objects.filter(status='pendente').order_by('-created_at')[:20]),
+        ('frequência de uma aula', 'aula_id_id=?',
+         Frequencia.objects.filter(aula_id=aula.id)),
+        ('frequência de uma matrícula numa aula', 'aula_id_id=? AND matricula_id_id=?',
+         Frequencia.objects.filter(aula_id=aula.id, matricula_id=matricula.id)),
+        ('turmas de um curso por início', 'curso_id_id=?',
+         Turma.objects.filter(curso_id=curso.id).order_by('data_inicio')),
+        ('turmas de um curso a partir de uma data', 'curso_id_id=? AND data_inicio>?',
+         Turma.objects.filter(curso_id=curso.id, data_inicio__gte=date(2025, 6, 1))),
+        ('aulas de uma turma por data', 'turma_id_id=?',
+         Aula.objects.filter(turma_id=turma.id).order_by('data')),
+        ('alunos por prefixo do nome', 'nome>? AND nome<?',
+         Aluno.objects.filter(nome__gte='Aluno 0001', nome__lt='Aluno 0001\uffff')),
+    ]
+
+
+def plano(queryset):
+    from django.db import connection
+
+    sql, params = queryset.query.sql_with_params()
+    with connection.cursor() as cursor:
+        cursor.execute('EXPLAIN QUERY PLAN ' + sql, params)
+        return ' | '.join(linha[-1] for linha in cursor.fetchall())
+
+
+def medir(queryset):
+    inicio = time.perf_counter()
+    for _ in range(REPETICOES):
+        list(queryset.all())
+    return (time.perf_counter() - inicio) / REPETICOES
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--alunos', type=int, default=20000)
+    args = parser.parse_args()
+
+    configurar()
+    from django.db import connection
+
+    inicio = time.perf_counter()
+    dados = popular(args.alunos)
+    with connection.cursor() as cursor:
+        cursor.execute('ANALYZE')
+    print(f"banco populado em {time.perf_counter() - inicio:.1f}s\n")
+
+    falhas = 0
+    for descricao, busca, queryset in consultas(*dados):
+        detalhe = plano(queryset)
+        ok = f'({busca})' in detalhe and 'SCAN' not in detalhe and 'TEMP B-TREE' not in detalhe
+        falhas += not ok
+        print(f"[{'ok' if ok else 'FALHOU'}] {descricao}: {medir(queryset) * 1000:.2f} ms")
+        print(f"      {detalhe}")
+
+    sys.exit(1 if falhas else 0)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,100 @@
+"""
+Concorrência no SQLite: configuração padrão x a de conflu_ai.settings.
+
+"padrao" é o sqlite3 sem OPTIONS (rollback journal, BEGIN DEFERRED, uma
+conexão por requisição); "ajustado" usa os PRAGMAs de SQLITE_PRAGMAS
+(WAL etc.), BEGIN IMMEDIATE e CONN_MAX_AGE. Cada modo roda num processo
+e banco próprios, com threads escritoras (transação que lê e depois
+grava, como as views de cadastro) e leitoras (listagem) ao mesmo tempo.
+
+    python -m benchmarks.sqlite --segundos 5 --escritores 4 --leitores 8
+"""
+import argparse
+import subprocess
+import sys
+import threading
+import time
+from benchmarks._django import configurar
+
+MODOS = ('padrao', 'ajustado')
+
+
+def executar(modo, segundos, escritores, leitores):
+    if modo == 'padrao':
+        configurar(OPTIONS={}, CONN_MAX_AGE=0)
+    else:
+        configurar()
+
+    from django.db import OperationalError, close_old_connections, connection, transaction
+    from cadastro.models import Empresa
+
+    Empresa.objects.bulk_create([Empresa(nome=f'Empresa {i}') for i in range(1000)])
+    connection.close()
+
+    fim = time.monotonic() + segundos
+    contagem = {'escritas': 0, 'leituras': 0, 'travado': 0}
+    trava = threading.Lock()
+
+    def somar(chave):
+        with trava:
+            contagem[chave] += 1
+
+    def escritor(n):
+        while time.monotonic() < fim:
+            try:
+                with transaction.atomic():
+                    total = Empresa.objects.count()
+                    Empresa.objects.create(nome=f'Nova {n}-{total}')
+                somar('escritas')
+            except OperationalError:
+                somar('travado')
+            finally:
+                # Equivale ao fim de uma requisição (request_finished)
+                close_old_connections()
+
+    def leitor():
+        while time.monotonic() < fim:
+            try:
+                list(Empresa.objects.order_by('-id').values_list('id', 'nome')[:50])
+                somar('leituras')
+            except OperationalError:
+                somar('travado')
+            finally:
+                close_old_connections()
+
+    threads = [threading.Thread(target=escritor, args=(n,)) for n in range(escritores)]
+    threads += [threading.Thread(target=leitor) for _ in range(leitores)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    print(f"{modo:9} escritas {contagem['escritas'] / segundos:7.0f}/s  "
+          f"leituras {contagem['leituras'] / segundos:7.0f}/s  "
+          f"'database is locked': {contagem['travado']}")
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--segundos', type=float, default=5)
+    parser.add_argument('--escritores', type=int, default=4)
+    parser.add_argument('--leitores', type=int, default=8)
+    parser.add_argument('--modo', choices=MODOS)
+    args = parser.parse_args()
+
+    if args.modo:
+        executar(args.modo, args.segundos, args.escritores, args.leitores)
+        return
+
+    # Um processo por modo: as configurações de banco são lidas no django.setup()
+    for modo in MODOS:
+        subprocess.run(
+            [sys.executable, '-m', 'benchmarks.sqlite', '--modo', modo,
+             '--segundos', str(args.segundos), '--escritores', str(args.escritores),
+             '--leitores', str(args.leitores)],
+            check=True,
+        )
+
+
+if __name__ == '__main__':
+    main()
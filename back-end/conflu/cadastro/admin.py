@@ -6,7 +6,21 @@ admin.site.register(Aluno)
 admin.site.register(Aula)
 admin.site.register(Curso)
 admin.site.register(Empresa)
-admin.site.register(Matricula)
 admin.site.register(Pagamento)
-admin.site.register(Turma)
-admin.site.register(Frequencia)
+
+
+# Os __str__ destes models navegam pelas FKs; list_select_related evita
+# uma consulta por linha na listagem do admin.
+@admin.register(Turma)
+class TurmaAdmin(admin.ModelAdmin):
+    list_select_related = ('curso_id',)
+
+
+@admin.register(Matricula)
+class MatriculaAdmin(admin.ModelAdmin):
+    list_select_related = ('aluno_id', 'turma_id__curso_id')
+
+
+@admin.register(Frequencia)
+class FrequenciaAdmin(admin.ModelAdmin):
+    list_select_related = ('matricula_id__aluno_id',)
@@ -0,0 +1,32 @@
+"""
+Geração do cronograma de aulas de uma turma.
+"""
+from datetime import timedelta
+from cadastro.models import Aula
+from cadastro import resumo, versions
+
+
+def dias_de_aula(inicio, fim, quantidade):
+    """Os primeiros `quantidade` dias úteis (seg-sex) entre `inicio` e `fim`, inclusive."""
+    dias = []
+    dia = inicio
+    while dia <= fim and len(dias) < quantidade:
+        if dia.weekday() < 5:
+            dias.append(dia)
+        dia += timedelta(days=1)
+    return dias
+
+
+def dias_uteis(inicio, fim):
+    return len(dias_de_aula(inicio, fim, (fim - inicio).days + 1))
+
+
+def gerar_aulas(turma, curso):
+    """Cria todas as aulas da turma com um único bulk_create."""
+    aulas = Aula.objects.bulk_create([
+        Aula(turma_id=turma, data=dia)
+        for dia in dias_de_aula(turma.data_inicio, turma.data_fim, curso.quant_dias)
+    ])
+    resumo.atualizar_turma(turma.pk)
+    versions.tocar(Aula)
+    return aulas
@@ -4,3 +4,6 @@ from django.apps import AppConfig
 class CadastroConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'cadastro'
+
+    def ready(self):
+        from cadastro import signals  # noqa: F401
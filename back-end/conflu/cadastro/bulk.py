@@ -0,0 +1,223 @@
+"""
+Criação, atualização e exclusão em lote para as viewsets do cadastro.
+
+A validação é feita por conjunto: os campos de cada item passam pelo
+serializer sem o UniqueValidator (que faria uma consulta por item) e a
+unicidade é conferida com uma única consulta `campo__in` por campo.
+Se algum item for inválido nada é gravado e a resposta traz uma lista
+de erros alinhada com a entrada, como o DRF faz com `many=True`.
+
+A exclusão usa `QuerySet.delete()` com os receivers por objeto
+desligados (`signals.em_lote`) e `sincronizar` roda uma vez para o lote.
+"""
+from django.apps import apps
+from django.db import IntegrityError, transaction
+from django.db.models import ProtectedError, RestrictedError
+from django.db.models.functions import Lower
+from rest_framework import serializers, status
+from rest_framework.decorators import action
+from rest_framework.response import Response
+from rest_framework.validators import UniqueValidator
+from cadastro.models import Aluno, Curso, Empresa
+from cadastro.catalogo import CATALOGOS
+from cadastro import search, signals, versions
+from cadastro.validators import normalizar_email
+
+LOTE = 500
+MAX_ITENS = 5000
+
+# Campos conferidos em conjunto contra o banco e contra o próprio lote
+UNICOS = {
+    Aluno: {'email': "Já existe um aluno com este email."},
+    Empresa: {'cnpj': "Já existe uma empresa com este CNPJ."},
+    Curso: {},
+}
+
+# Campos únicos comparados depois de normalizados (sem diferença de maiúsculas)
+NORMALIZADORES = {'email': normalizar_email}
+
+TIPOS_BUSCA = {Aluno: 'aluno', Empresa: 'empresa', Curso: 'curso'}
+
+
+def sincronizar(model, ids=None, removidos=None):
+    """
+    Escritas em lote não disparam signals: atualiza aqui o índice de busca,
+    a versão da tabela e o catálogo em memória.
+    """
+    tipo = TIPOS_BUSCA.get(model)
+    if tipo and ids:
+        search.reindexar_tipo(tipo, ids)
+    if tipo and removidos:
+        search.remover(tipo, *removidos)
+    versions.tocar(model)
+    if model in CATALOGOS:
+        CATALOGOS[model].invalidar()
+
+
+def _sem_unique_validator(serializer):
+    for field in serializer.fields.values():
+        field.validators = [v for v in field.validators if not isinstance(v, UniqueValidator)]
+    return serializer
+
+
+def _valor(item, campo):
+    valor = item.get(campo) if isinstance(item, dict) else None
+    if valor in (None, ''):
+        return None
+    return str(valor).strip()
+
+
+def _conferir_unicos(model, itens, erros, ids=None):
+    for campo, mensagem in UNICOS[model].items():
+        valores = [_valor(item, campo) for item in itens]
+        registros, coluna = model.objects.all(), campo
+        if campo in NORMALIZADORES:
+            valores = [NORMALIZADORES[campo](v) if v else v for v in valores]
+            coluna = f'{campo}_normalizado'
+            registros = registros.annotate(**{coluna: Lower(campo)})
+        existentes = dict(
+            registros.filter(**{f'{coluna}__in': {v for v in valores if v}}).values_list(coluna, 'id')
+        )
+        vistos = {}
+        for indice, valor in enumerate(valores):
+            if not valor:
+                continue
+            dono = existentes.get(valor)
+            proprio = ids[indice] if ids else None
+            if (dono is not None and dono != proprio) or valor in vistos:
+                erros[indice].setdefault(campo, []).append(mensagem)
+            vistos[valor] = indice
+
+
+def criar_em_lote(serializer_class, itens):
+    model = serializer_class.Meta.model
+    serializer = serializer_class(data=itens, many=True)
+    _sem_unique_validator(serializer.child)
+    valido = serializer.is_valid()
+    erros = list(serializer.errors) if not valido else [{} for _ in itens]
+    erros = [dict(erro) for erro in erros]
+    _conferir_unicos(model, itens, erros)
+
+    if any(erros):
+        return None, erros
+
+    with transaction.atomic():
+        objetos = model.objects.bulk_create(
+            [model(**dados) for dados in serializer.validated_data], batch_size=LOTE
+        )
+        sincronizar(model, ids=[objeto.pk for objeto in objetos])
+
+    return serializer_class(objetos, many=True).data, None
+
+
+def atualizar_em_lote(serializer_class, itens):
+    model = serializer_class.Meta.model
+    erros = [{} for _ in itens]
+    ids = []
+    campo_id = serializers.IntegerField()
+    for indice, item in enumerate(itens):
+        try:
+            ids.append(campo_id.run_validation(item.get('id', serializers.empty) if isinstance(item, dict) else None))
+        except serializers.ValidationError as e:
+            ids.append(None)
+            erros[indice]['id'] = e.detail
+    instancias = model.objects.in_bulk([pk for pk in ids if pk is not None])
+
+    validos = []
+    for indice, (pk, item) in enumerate(zip(ids, itens)):
+        if pk is None:
+            continue
+        instancia = instancias.get(pk)
+        if instancia is None:
+            erros[indice]['id'] = ["Registro não encontrado."]
+            continue
+        serializer = _sem_unique_validator(serializer_class(instancia, data=item, partial=True))
+        if serializer.is_valid():
+            validos.append((instancia, serializer.validated_data))
+        else:
+            erros[indice].update(serializer.errors)
+    _conferir_unicos(model, itens, erros, ids=ids)
+
+    if any(erros):
+        return None, erros
+
+    campos = set()
+    for instancia, dados in validos:
+        for campo, valor in dados.items():
+            setattr(instancia, campo, valor)
+            campos.add(campo)
+
+    objetos = [instancia for instancia, _ in validos]
+    with transaction.atomic():
+        if campos:
+            model.objects.bulk_update(objetos, list(campos), batch_size=LOTE)
+        sincronizar(model, ids=[objeto.pk for objeto in objetos])
+
+    return serializer_class(objetos, many=True).data, None
+
+
+def excluir_em_lote(model, ids):
+    """
+    Exclui os registros de `ids` e devolve quantos saíram. Levanta
+    ProtectedError/RestrictedError se algum estiver em uso.
+    """
+    with transaction.atomic(), signals.em_lote():
+        excluidos, por_model = model.objects.filter(id__in=ids).delete()
+        if por_model.pop(model._meta.label, 0):
+            sincronizar(model, removidos=ids)
+        # Exclusões em cascata (hoje todas as referências são RESTRICT)
+        cascata = [apps.get_model(rotulo) for rotulo, quantidade in por_model.items() if quantidade]
+        if cascata:
+            versions.tocar(*cascata)
+    return excluidos
+
+
+class LoteMixin:
+    """
+    Adiciona `/<recurso>/bulk/` às viewsets: POST cria, PATCH atualiza
+    (cada item com `id`) e DELETE exclui (`{"ids": [...]}`).
+    """
+
+    @action(detail=False, methods=['post', 'patch', 'delete'], url_path='bulk')
+    def bulk(self, request):
+        if request.method == 'DELETE':
+            return self._excluir_em_lote(request)
+
+        itens = request.data
+        if not isinstance(itens, list) or not itens:
+            return Response({"error": "Envie uma lista de registros."}, status=status.HTTP_400_BAD_REQUEST)
+        if len(itens) > MAX_ITENS:
+            return Response({"error": f"Envie no máximo {MAX_ITENS} registros por vez."}, status=status.HTTP_400_BAD_REQUEST)
+
+        try:
+            if request.method == 'POST':
+                data, erros = criar_em_lote(self.serializer_class, itens)
+            else:
+                data, erros = atualizar_em_lote(self.serializer_class, itens)
+        except IntegrityError:
+            # Outro processo gravou um valor único entre a conferência e o insert
+            return Response({"error": "Conflito com registros gravados ao mesmo tempo; nada foi salvo."}, status=status.HTTP_409_CONFLICT)
+
+        if request.method == 'POST':
+            if erros:
+                return Response(erros, status=status.HTTP_400_BAD_REQUEST)
+            return Response({"message": f"{len(data)} registro(s) criado(s) com sucesso!", "data": data}, status=status.HTTP_201_CREATED)
+
+        if erros:
+            return Response(erros, status=status.HTTP_400_BAD_REQUEST)
+        return Response({"message": f"{len(data)} registro(s) atualizado(s) com sucesso!", "data": data}, status=status.HTTP_200_OK)
+
+    def _excluir_em_lote(self, request):
+        ids = request.data.get('ids') if isinstance(request.data, dict) else None
+        campo = serializers.ListField(child=serializers.IntegerField(), min_length=1, max_length=MAX_ITENS)
+        try:
+            ids = campo.run_validation(ids)
+        except serializers.ValidationError as e:
+            return Response({"ids": e.detail}, status=status.HTTP_400_BAD_REQUEST)
+
+        try:
+            excluidos = excluir_em_lote(self.serializer_class.Meta.model, ids)
+        except (ProtectedError, RestrictedError):
+            return Response({"error": "Há registros em uso por outros cadastros; nada foi excluído."}, status=status.HTTP_409_CONFLICT)
+
+        return Response({"message": f"{excluidos} registro(s) excluído(s) com sucesso!"}, status=status.HTTP_200_OK)
@@ -0,0 +1,99 @@
+"""
+Cache em memória (por processo) das tabelas de referência Curso e Empresa.
+
+As leituras passam pelo cache: `get(pk)` guarda até `max_itens` registros
+em LRU e `todos()` guarda a tabela inteira enquanto ela couber nesse
+limite. Escritas no próprio processo limpam o cache pelos signals; nos
+outros workers a troca de versão em VersaoTabela (cadastro.versions) é
+percebida em no máximo `intervalo` segundos.
+
+As instâncias devolvidas são compartilhadas entre requisições: use-as
+apenas para leitura.
+"""
+import threading
+import time
+from collections import OrderedDict
+from cadastro.models import Curso, Empresa, VersaoTabela
+
+
+class Catalogo:
+
+    def __init__(self, model, max_itens=5000, intervalo=1.0, ordenacao='nome'):
+        self.model = model
+        self.max_itens = max_itens
+        self.intervalo = intervalo
+        self.ordenacao = ordenacao
+        self._lock = threading.Lock()
+        self._itens = OrderedDict()
+        self._todos = None
+        self._versao = None
+        self._verificado_em = 0.0
+
+    def __deepcopy__(self, memo):
+        # Os fields do DRF são copiados com deepcopy; o catálogo é único por processo
+        return self
+
+    def _versao_atual(self):
+        versao = VersaoTabela.objects.filter(tabela=self.model._meta.label_lower).values_list('versao', flat=True).first()
+        return versao or 0
+
+    def _validar(self):
+        agora = time.monotonic()
+        if agora - self._verificado_em < self.intervalo:
+            return
+        versao = self._versao_atual()
+        with self._lock:
+            if versao != self._versao:
+                self._itens.clear()
+                self._todos = None
+                self._versao = versao
+            self._verificado_em = agora
+
+    def _guardar(self, objeto):
+        self._itens[objeto.pk] = objeto
+        self._itens.move_to_end(objeto.pk)
+        while len(self._itens) > self.max_itens:
+            self._itens.popitem(last=False)
+
+    def get(self, pk):
+        self._validar()
+        with self._lock:
+            objeto = self._itens.get(pk)
+            if objeto is not None:
+                self._itens.move_to_end(pk)
+                return objeto
+
+        objeto = self.model.objects.filter(pk=pk).first()
+        if objeto is not None:
+            with self._lock:
+                self._guardar(objeto)
+        return objeto
+
+    def todos(self):
+        self._validar()
+        with self._lock:
+            if self._todos is not None:
+                return self._todos
+
+        objetos = list(self.model.objects.order_by(self.ordenacao, 'id')[:self.max_itens + 1])
+        if len(objetos) > self.max_itens:
+            # Tabela maior que o limite: não guarda o snapshot
+            return list(self.model.objects.order_by(self.ordenacao, 'id'))
+
+        with self._lock:
+            self._todos = objetos
+            for objeto in objetos:
+                self._guardar(objeto)
+        return objetos
+
+    def invalidar(self):
+        with self._lock:
+            self._itens.clear()
+            self._todos = None
+            self._verificado_em = 0.0
+
+
+CURSOS = Catalogo(Curso)
+EMPRESAS = Catalogo(Empresa)
+
+CATALOGOS = {Curso: CURSOS, Empresa: EMPRESAS}
@@ -0,0 +1,186 @@
+"""
+Check-in por QR code com gravação em segundo plano (write-behind).
+
+O QR code de cada aula carrega um token assinado (HMAC com a SECRET_KEY)
+com o id da aula, da turma e a data, então a leitura é validada sem
+consultar o banco. A presença vai para uma fila em memória do processo
+e uma thread grava a fila a cada `INTERVALO` segundos com um único
+upsert em lote, em vez de um INSERT por leitura disputando o lock de
+escrita do SQLite.
+
+A fila vive na memória do processo: o que estiver pendente é gravado ao
+encerrar o processo (atexit), mas uma queda abrupta perde no máximo o
+último intervalo.
+
+Se a gravação falhar, os pares cuja aula ou matrícula não existe mais
+(excluída depois da leitura) são descartados e o resto volta para a
+fila, no máximo MAX_TENTATIVAS vezes: um par ruim não trava os demais
+nem faz a fila crescer sem limite.
+"""
+import atexit
+import logging
+import threading
+import time
+from django.core import signing
+from django.db import close_old_connections
+from django.utils import timezone
+from cadastro.models import Aula, Matricula
+from cadastro import frequencia
+
+logger = logging.getLogger(__name__)
+
+SALT = 'conflu.checkin'
+INTERVALO = 0.3
+CACHE_MATRICULAS = 60.0
+MAX_RECUSAS = 10_000
+MAX_TENTATIVAS = 5
+
+
+def token_aula(aula):
+    dados = {'a': aula.pk, 't': aula.turma_id_id, 'd': aula.data.isoformat()}
+    return signing.Signer(salt=SALT).sign_object(dados)
+
+
+def ler_token(token):
+    """Devolve (aula_id, turma_id, data ISO); levanta signing.BadSignature se inválido."""
+    dados = signing.Signer(salt=SALT).unsign_object(token)
+    return dados['a'], dados['t'], dados['d']
+
+
+class MatriculasPorTurma:
+    """
+    Ids de matrícula de cada turma, recarregados quando expiram ou não contêm o id.
+
+    As recusas também ficam em cache até o fim do dia (o token só vale no dia
+    da aula): sem isso, cada leitura com uma matrícula de outra turma ou
+    inexistente recarregaria a turma do banco. Uma matrícula nova que caia num
+    id recusado passa a valer assim que a turma for recarregada por outra
+    leitura, porque o conjunto carregado é consultado antes das recusas.
+    """
+
+    def __init__(self, validade=CACHE_MATRICULAS, max_recusas=MAX_RECUSAS):
+        self.validade = validade
+        self.max_recusas = max_recusas
+        self._turmas = {}
+        self._recusas = set()
+        self._dia = None
+        self._lock = threading.Lock()
+
+    def _carregar(self, turma_id):
+        ids = frozenset(Matricula.objects.filter(turma_id=turma_id).values_list('id', flat=True))
+        with self._lock:
+            self._turmas[turma_id] = (time.monotonic(), ids)
+        return ids
+
+    def _recusar(self, turma_id, matricula_id, dia):
+        with self._lock:
+            # Tokens de outro dia já são recusados antes; um teto segura ids inventados em massa
+            if dia != self._dia or len(self._recusas) >= self.max_recusas:
+                self._recusas, self._dia = set(), dia
+            self._recusas.add((turma_id, matricula_id))
+
+    def contem(self, turma_id, matricula_id, dia=None):
+        carregado_em, ids = self._turmas.get(turma_id, (0.0, frozenset()))
+        if matricula_id in ids:
+            if time.monotonic() - carregado_em < self.validade:
+                return True
+        elif dia == self._dia and (turma_id, matricula_id) in self._recusas:
+            return False
+        if matricula_id in self._carregar(turma_id):
+            return True
+        self._recusar(turma_id, matricula_id, dia)
+        return False
+
+
+class FilaCheckin:
+
+    def __init__(self, intervalo=INTERVALO):
+        self.intervalo = intervalo
+        self._pendentes = set()
+        self._falhas = {}
+        self._lock = threading.Lock()
+        self._thread = None
+
+    def adicionar(self, aula_id, matricula_id):
+        with self._lock:
+            self._pendentes.add((aula_id, matricula_id))
+            if self._thread is None or not self._thread.is_alive():
+                self._thread = threading.Thread(target=self._loop, name='checkin-flush', daemon=True)
+                self._thread.start()
+
+    def _loop(self):
+        while True:
+            time.sleep(self.intervalo)
+            self.esvaziar()
+            # A thread não passa pelo ciclo de request: fecha conexões velhas aqui
+            close_old_connections()
+
+    def esvaziar(self):
+        with self._lock:
+            pendentes, self._pendentes = self._pendentes, set()
+        if not pendentes:
+            return 0
+        try:
+            gravados = frequencia.registrar_presencas(sorted(pendentes))
+        except Exception:
+            logger.exception("Falha ao gravar %s check-in(s)", len(pendentes))
+            self._reenfileirar(pendentes)
+            return 0
+        with self._lock:
+            for par in pendentes:
+                self._falhas.pop(par, None)
+        return gravados
+
+    def _reenfileirar(self, pendentes):
+        try:
+            validos = _existentes(pendentes)
+        except Exception:
+            # Banco inacessível: não dá para separar os pares ruins agora
+            validos = pendentes
+        if pendentes - validos:
+            logger.warning("Check-ins descartados (aula ou matrícula excluída): %s", sorted(pendentes - validos))
+
+        with self._lock:
+            for par in pendentes - validos:
+                self._falhas.pop(par, None)
+            desistidos = []
+            for par in validos:
+                self._falhas[par] = self._falhas.get(par, 0) + 1
+                if self._falhas[par] >= MAX_TENTATIVAS:
+                    del self._falhas[par]
+                    desistidos.append(par)
+                else:
+                    self._pendentes.add(par)
+        if desistidos:
+            logger.error("Check-ins descartados após %s tentativas: %s", MAX_TENTATIVAS, sorted(desistidos))
+
+
+def _existentes(pares):
+    """Pares (aula_id, matricula_id) cuja aula e matrícula ainda existem."""
+    ids_aulas = set(Aula.objects.filter(pk__in={aula for aula, _ in pares}).values_list('id', flat=True))
+    ids_matriculas = set(Matricula.objects.filter(pk__in={matricula for _, matricula in pares}).values_list('id', flat=True))
+    return {(aula, matricula) for aula, matricula in pares if aula in ids_aulas and matricula in ids_matriculas}
+
+
+matriculas = MatriculasPorTurma()
+fila = FilaCheckin()
+atexit.register(fila.esvaziar)
+
+
+def registrar(token, matricula_id):
+    """
+    Valida a leitura e coloca a presença na fila. Devolve uma mensagem de
+    erro ou None quando aceito.
+    """
+    try:
+        aula_id, turma_id, data = ler_token(token)
+    except (signing.BadSignature, KeyError, TypeError, ValueError):
+        return "QR code inválido."
+
+    if data != timezone.localdate().isoformat():
+        return "Este QR code não é da aula de hoje."
+    if turma_id is None or not matriculas.contem(turma_id, matricula_id, data):
+        return "Matrícula não pertence à turma desta aula."
+
+    fila.adicionar(aula_id, matricula_id)
+    return None
@@ -0,0 +1,52 @@
+"""
+Resumo da página inicial do dashboard em uma única resposta.
+
+Cada entidade custa duas consultas: um aggregate com o total e os
+cadastrados nos últimos 30 dias (Count com filter), e os N mais recentes
+pelo índice de created_at, só com as colunas exibidas. Turmas ativas e
+pagamentos pendentes seguem o mesmo padrão.
+"""
+from datetime import timedelta
+from django.db.models import Count, Q, Sum
+from django.utils import timezone
+from cadastro.models import Aluno, Curso, Empresa, Pagamento, Turma
+
+RECENTES = 5
+MAX_RECENTES = 50
+DIAS_RECENTES = 30
+
+# O status é texto livre; o schema documenta "pendente" em minúsculas
+STATUS_PENDENTE = ['pendente', 'Pendente']
+
+
+def _entidade(queryset, campos, limite, desde=None, ordenacao=('-created_at', '-id'), chave='ultimos'):
+    totais = {'total': Count('id')}
+    if desde is not None:
+        totais['recentes'] = Count('id', filter=Q(created_at__gte=desde))
+    dados = queryset.aggregate(**totais)
+    dados[chave] = list(queryset.order_by(*ordenacao).values(*campos)[:limite])
+    return dados
+
+
+def resumo(limite=RECENTES):
+    agora = timezone.now()
+    hoje = timezone.localdate()
+    desde = agora - timedelta(days=DIAS_RECENTES)
+
+    ativas = Turma.objects.filter(data_inicio__lte=hoje, data_fim__gte=hoje)
+    pendentes = Pagamento.objects.filter(status__in=STATUS_PENDENTE)
+
+    return {
+        'alunos': _entidade(Aluno.objects.all(), ['id', 'nome', 'email', 'created_at'], limite, desde),
+        'cursos': _entidade(Curso.objects.all(), ['id', 'nome', 'valor', 'created_at'], limite, desde),
+        # Empresa não tem created_at: as mais recentes são as de maior id
+        'empresas': _entidade(Empresa.objects.all(), ['id', 'nome', 'cnpj'], limite, ordenacao=('-id',)),
+        'turmas_ativas': _entidade(
+            ativas,
+            ['id', 'curso_id', 'curso_id__nome', 'localidade', 'data_inicio', 'data_fim'],
+            limite,
+            ordenacao=('data_fim', 'id'),
+            chave='itens',
+        ),
+        'pagamentos_pendentes': pendentes.aggregate(total=Count('id'), valor=Sum('curso_id__valor')),
+    }
@@ -0,0 +1,91 @@
+"""
+Exportação das tabelas do cadastro em streaming (NDJSON ou CSV).
+
+As linhas saem de `values_list(...).iterator(chunk_size=...)`, sem montar
+instâncias de model nem a lista inteira em memória: o primeiro byte sai
+assim que o primeiro lote é lido e o consumo de memória não depende do
+tamanho da tabela.
+
+Sob ASGI o Django só transmite aos poucos um iterador async (um iterador
+síncrono seria lido inteiro com `sync_to_async(list)` antes do primeiro
+byte); para esse caso `aexportar` entrega um lote de CHUNK_SIZE linhas
+por vez, lido numa thread.
+"""
+import csv
+import json
+from itertools import islice
+from asgiref.sync import sync_to_async
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db import router
+from cadastro.models import Aluno, Matricula, Pagamento
+
+CHUNK_SIZE = 2000
+
+TABELAS = {
+    'alunos': (Aluno, ['id', 'nome', 'cpf', 'email', 'empresa_id', 'telefone', 'data_nascimento', 'created_at']),
+    'matriculas': (Matricula, ['id', 'aluno_id', 'turma_id', 'fonte', 'data_matricula']),
+    'pagamentos': (Pagamento, ['id', 'aluno_id', 'curso_id', 'status', 'tipo_pagamento', 'created_at']),
+}
+
+FORMATOS = {
+    'ndjson': 'application/x-ndjson',
+    'csv': 'text/csv; charset=utf-8',
+}
+
+
+class _Eco:
+    """Buffer do csv.writer que só devolve a linha escrita."""
+    def write(self, valor):
+        return valor
+
+
+def _consulta(tabela):
+    model, campos = TABELAS[tabela]
+    # O banco é escolhido agora, dentro da view: a consulta só roda quando
+    # o servidor começa a consumir a resposta, fora do contexto da réplica.
+    banco = router.db_for_read(model)
+    return campos, model.objects.using(banco).order_by('id').values_list(*campos)
+
+
+def _formatar(campos, formato):
+    """Devolve o cabeçalho e a função que transforma cada registro em linha."""
+    if formato == 'csv':
+        writer = csv.writer(_Eco())
+        return writer.writerow(campos), writer.writerow
+    encoder = DjangoJSONEncoder(ensure_ascii=False)
+    return None, lambda registro: encoder.encode(dict(zip(campos, registro))) + '\n'
+
+
+def exportar(tabela, formato):
+    campos, registros = _consulta(tabela)
+    cabecalho, linha = _formatar(campos, formato)
+    registros = registros.iterator(chunk_size=CHUNK_SIZE)
+
+    def gerar():
+        if cabecalho:
+            yield cabecalho
+        for registro in registros:
+            yield linha(registro)
+
+    return gerar()
+
+
+def aexportar(tabela, formato):
+    campos, registros = _consulta(tabela)
+    cabecalho, linha = _formatar(campos, formato)
+    # O iterador síncrono só abre o cursor no primeiro next(), que roda na
+    # thread do sync_to_async; aqui não se usa aiterator() porque, com
+    # values_list, ele executa a consulta ainda no event loop.
+    registros = registros.iterator(chunk_size=CHUNK_SIZE)
+
+    @sync_to_async
+    def proximo_lote():
+        return list(islice(registros, CHUNK_SIZE))
+
+    async def gerar():
+        if cabecalho:
+            yield cabecalho
+        while lote := await proximo_lote():
+            yield ''.join(map(linha, lote))
+
+    return gerar()
@@ -0,0 +1,78 @@
+from rest_framework import serializers
+
+
+class Prefixo:
+    """
+    Busca por prefixo feita como intervalo (`campo >= p AND campo < p + U+FFFF`),
+    para que o SQLite use o índice B-tree da coluna em vez de um LIKE.
+    """
+    def __init__(self, campo):
+        self.campo = campo
+
+    def lookups(self, valor):
+        return {f'{self.campo}__gte': valor, f'{self.campo}__lt': valor + '\uffff'}
+
+
+# Filtros aceitos na query string: parâmetro -> (lookup, campo usado para validar o valor)
+ALUNO_FILTROS = {
+    'empresa_id': ('empresa_id', serializers.IntegerField()),
+    'cpf': ('cpf', serializers.CharField()),
+    'email': ('email', serializers.CharField()),
+    'nome': (Prefixo('nome'), serializers.CharField()),
+    'created_at_inicio': ('created_at__gte', serializers.DateTimeField()),
+    'created_at_fim': ('created_at__lte', serializers.DateTimeField()),
+}
+
+CURSO_FILTROS = {
+    'nome': (Prefixo('nome'), serializers.CharField()),
+    'valor_min': ('valor__gte', serializers.DecimalField(max_digits=10, decimal_places=2)),
+    'valor_max': ('valor__lte', serializers.DecimalField(max_digits=10, decimal_places=2)),
+    'created_at_inicio': ('created_at__gte', serializers.DateTimeField()),
+    'created_at_fim': ('created_at__lte', serializers.DateTimeField()),
+}
+
+EMPRESA_FILTROS = {
+    'cnpj': ('cnpj', serializers.CharField()),
+    'nome': (Prefixo('nome'), serializers.CharField()),
+}
+
+
+AULA_FILTROS = {
+    'turma_id': ('turma_id', serializers.IntegerField()),
+    'data_inicio': ('data__gte', serializers.DateField()),
+    'data_fim': ('data__lte', serializers.DateField()),
+}
+
+PAGAMENTO_FILTROS = {
+    'status': ('status', serializers.CharField()),
+    'tipo_pagamento': ('tipo_pagamento', serializers.CharField()),
+    'curso_id': ('curso_id', serializers.IntegerField()),
+    'created_at_inicio': ('created_at__gte', serializers.DateTimeField()),
+    'created_at_fim': ('created_at__lte', serializers.DateTimeField()),
+}
+
+def aplicar_filtros(queryset, params, filtros):
+    """
+    Aplica ao queryset os filtros presentes em `params` (request.query_params).
+    Valores inválidos levantam ValidationError, que o DRF devolve como 400.
+    """
+    condicoes = {}
+    erros = {}
+    for param, (lookup, campo) in filtros.items():
+        bruto = params.get(param)
+        if bruto in (None, ''):
+            continue
+        try:
+            valor = campo.run_validation(bruto)
+        except serializers.ValidationError as e:
+            erros[param] = e.detail
+            continue
+        if isinstance(lookup, Prefixo):
+            condicoes.update(lookup.lookups(valor))
+        else:
+            condicoes[lookup] = valor
+
+    if erros:
+        raise serializers.ValidationError(erros)
+
+    return queryset.filter(**condicoes)
@@ -0,0 +1,63 @@
+"""
+Agregações financeiras dos pagamentos para o dashboard.
+
+A receita de um pagamento é o valor do curso pago. Cada agrupamento
+(curso, status, tipo de pagamento e mês) é um único GROUP BY com
+`Sum('curso_id__valor')`, então o banco devolve poucas linhas já
+somadas em vez de todos os pagamentos. Filtros por status e período
+usam o índice (status, created_at).
+"""
+from decimal import Decimal
+from django.db.models import Count, Sum
+from django.db.models.functions import TruncMonth
+from cadastro.models import Pagamento
+
+RECEITA = Sum('curso_id__valor')
+
+
+def _agrupar(pagamentos, *campos):
+    return (
+        pagamentos.order_by()
+        .values(*campos)
+        .annotate(receita=RECEITA, pagamentos=Count('id'))
+        .order_by(*campos)
+    )
+
+
+def _linha(registro, **extras):
+    return dict(
+        extras,
+        receita=registro['receita'] or Decimal('0.00'),
+        pagamentos=registro['pagamentos'],
+    )
+
+
+def resumo(pagamentos=None):
+    """
+    Receita e quantidade de pagamentos no total e agrupadas por curso,
+    status, tipo de pagamento e mês. `pagamentos` permite restringir o
+    queryset (filtros da query string).
+    """
+    if pagamentos is None:
+        pagamentos = Pagamento.objects.all()
+
+    total = pagamentos.aggregate(receita=RECEITA, pagamentos=Count('id'))
+    return {
+        'total': _linha(total),
+        'por_curso': [
+            _linha(r, curso_id=r['curso_id'], curso=r['curso_id__nome'])
+            for r in _agrupar(pagamentos, 'curso_id', 'curso_id__nome')
+        ],
+        'por_status': [
+            _linha(r, status=r['status'])
+            for r in _agrupar(pagamentos, 'status')
+        ],
+        'por_tipo_pagamento': [
+            _linha(r, tipo_pagamento=r['tipo_pagamento'])
+            for r in _agrupar(pagamentos, 'tipo_pagamento')
+        ],
+        'por_mes': [
+            _linha(r, mes=r['mes'].strftime('%Y-%m'))
+            for r in _agrupar(pagamentos.annotate(mes=TruncMonth('created_at')), 'mes')
+        ],
+    }
@@ -0,0 +1,63 @@
+"""
+Registro de frequência em lote.
+
+Toda gravação de frequência passa por `registrar`: um único
+`bulk_create(update_conflicts=True)` sobre a constraint única
+(aula_id, matricula_id), então reenviar a mesma chamada atualiza os
+registros existentes em vez de duplicá-los. O resumo por matrícula
+(cadastro.resumo) é recalculado na mesma transação.
+"""
+from django.db import transaction
+from cadastro.models import Frequencia
+from cadastro import resumo, versions
+
+LOTE = 500
+
+
+def registrar(aula_id, marcacoes):
+    """
+    Grava (insere ou atualiza) a frequência de uma aula.
+    `marcacoes` é uma lista de dicts com matricula_id, presente e observacao.
+    """
+    objetos = [
+        Frequencia(
+            aula_id_id=aula_id,
+            matricula_id_id=marcacao['matricula_id'],
+            presente=marcacao['presente'],
+            observacao=marcacao.get('observacao'),
+        )
+        for marcacao in marcacoes
+    ]
+    with transaction.atomic():
+        Frequencia.objects.bulk_create(
+            objetos,
+            batch_size=LOTE,
+            update_conflicts=True,
+            unique_fields=['aula_id', 'matricula_id'],
+            update_fields=['presente', 'observacao'],
+        )
+        resumo.atualizar(objeto.matricula_id_id for objeto in objetos)
+        versions.tocar(Frequencia)
+    return len(objetos)
+
+
+def registrar_presencas(pares):
+    """
+    Marca presença para vários pares (aula_id, matricula_id) de uma vez,
+    preservando a observação já registrada. Usado pelo check-in por QR code.
+    """
+    objetos = [
+        Frequencia(aula_id_id=aula_id, matricula_id_id=matricula_id, presente=True)
+        for aula_id, matricula_id in pares
+    ]
+    with transaction.atomic():
+        Frequencia.objects.bulk_create(
+            objetos,
+            batch_size=LOTE,
+            update_conflicts=True,
+            unique_fields=['aula_id', 'matricula_id'],
+            update_fields=['presente'],
+        )
+        resumo.atualizar(matricula_id for _, matricula_id in pares)
+        versions.tocar(Frequencia)
+    return len(objetos)
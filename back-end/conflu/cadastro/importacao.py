@@ -0,0 +1,263 @@
+"""
+Importação de planilhas (CSV ou XLSX) de alunos com a empresa de cada um.
+
+O arquivo é lido linha a linha e gravado em lotes de `LOTE` linhas: a
+memória usada depende do tamanho do lote, não do arquivo. As empresas
+são resolvidas por um mapa CNPJ -> id carregado uma vez (e completado
+com as empresas criadas durante a importação); os emails já cadastrados
+são conferidos com uma consulta por lote.
+
+Colunas reconhecidas (cabeçalho sem diferença de maiúsculas/acentos):
+nome, email, cpf, telefone, data_nascimento, cnpj e empresa (nome da
+empresa, usado quando o CNPJ ainda não existe).
+
+CSVs em UTF-8 ou cp1252 (o padrão do Excel no Windows). A codificação é
+escolhida antes de gravar qualquer lote, e arquivos ilegíveis viram
+ArquivoInvalido (400 na view).
+"""
+import codecs
+import csv
+import io
+import unicodedata
+import zipfile
+from datetime import datetime
+from django.core.exceptions import ValidationError
+from django.core.validators import validate_email
+from django.db import transaction
+from django.db.models.functions import Lower
+from cadastro.models import Aluno, Empresa
+from cadastro.bulk import sincronizar
+from cadastro.validators import normalizar_cnpj, normalizar_cpf, normalizar_email
+
+LOTE = 1000
+BLOCO_LEITURA = 64 * 1024
+CODIFICACOES = ('utf-8-sig', 'cp1252')
+MAX_ERROS = 1000
+
+COLUNAS = {'nome', 'email', 'cpf', 'telefone', 'data_nascimento', 'cnpj', 'empresa'}
+
+# Tamanho máximo de cada coluna texto, tirado dos models (o SQLite não confere)
+TAMANHOS = {
+    'nome': Aluno._meta.get_field('nome').max_length,
+    'email': Aluno._meta.get_field('email').max_length,
+    'telefone': Aluno._meta.get_field('telefone').max_length,
+    'empresa': Empresa._meta.get_field('nome').max_length,
+}
+
+
+class ArquivoInvalido(Exception):
+    pass
+
+
+def _coluna(nome):
+    nome = unicodedata.normalize('NFKD', str(nome or '')).encode('ascii', 'ignore').decode()
+    return nome.strip().lower().replace(' ', '_')
+
+
+def _texto(valor):
+    if valor is None:
+        return ''
+    if isinstance(valor, float) and valor.is_integer():
+        # Números lidos do XLSX (CPF, CNPJ, telefone) vêm como float
+        valor = int(valor)
+    return str(valor).strip()
+
+
+def _codificacao(arquivo):
+    """Primeira codificação de CODIFICACOES que decodifica o arquivo inteiro."""
+    if not arquivo.seekable():
+        return CODIFICACOES[0]
+    for codificacao in CODIFICACOES:
+        arquivo.seek(0)
+        decodificador = codecs.getincrementaldecoder(codificacao)()
+        try:
+            while bloco := arquivo.read(BLOCO_LEITURA):
+                decodificador.decode(bloco)
+            decodificador.decode(b'', final=True)
+        except UnicodeDecodeError:
+            continue
+        arquivo.seek(0)
+        return codificacao
+    raise ArquivoInvalido("Não foi possível ler o CSV: salve-o em UTF-8.")
+
+
+def _ler_csv(arquivo):
+    texto = io.TextIOWrapper(arquivo, encoding=_codificacao(arquivo), newline='')
+    try:
+        amostra = texto.readline()
+        dialeto = csv.Sniffer().sniff(amostra, delimiters=',;\t') if amostra else csv.excel
+        cabecalho = next(csv.reader([amostra], dialeto), [])
+        yield [_coluna(nome) for nome in cabecalho]
+        yield from csv.reader(texto, dialeto)
+    except (UnicodeDecodeError, csv.Error) as e:
+        raise ArquivoInvalido(f"CSV inválido: {e}") from e
+
+
+def _ler_xlsx(arquivo):
+    from openpyxl import load_workbook
+    from openpyxl.utils.exceptions import InvalidFileException
+
+    try:
+        planilha = load_workbook(arquivo, read_only=True, data_only=True).active
+    except (zipfile.BadZipFile, InvalidFileException, KeyError) as e:
+        raise ArquivoInvalido("Arquivo .xlsx inválido ou corrompido.") from e
+    linhas = planilha.iter_rows(values_only=True)
+    yield [_coluna(nome) for nome in next(linhas, ())]
+    yield from linhas
+
+
+def ler_planilha(arquivo, nome_arquivo):
+    """Gera um dict por linha de dados, com as colunas normalizadas."""
+    if nome_arquivo.lower().endswith('.xlsx'):
+        linhas = _ler_xlsx(arquivo)
+    elif nome_arquivo.lower().endswith(('.csv', '.txt')):
+        linhas = _ler_csv(arquivo)
+    else:
+        raise ArquivoInvalido("Envie um arquivo .csv ou .xlsx.")
+
+    cabecalho = next(linhas)
+    if not {'nome', 'email'} <= set(cabecalho):
+        raise ArquivoInvalido("A planilha precisa das colunas 'nome' e 'email'.")
+
+    for valores in linhas:
+        if not any(valor not in (None, '') for valor in valores):
+            continue
+        yield {
+            coluna: _texto(valor)
+            for coluna, valor in zip(cabecalho, valores)
+            if coluna in COLUNAS
+        }
+
+
+def _data(valor):
+    if not valor:
+        return None
+    for formato in ('%d/%m/%Y', '%Y-%m-%d', '%Y-%m-%d %H:%M:%S'):
+        try:
+            return datetime.strptime(valor, formato).date()
+        except ValueError:
+            continue
+    raise ValueError
+
+
+class Importacao:
+
+    def __init__(self, progresso=None):
+        self.progresso = progresso
+        self.linhas = 0
+        self.importados = 0
+        self.empresas_criadas = 0
+        self.erros = []
+        self._empresas = dict(Empresa.objects.exclude(cnpj=None).values_list('cnpj', 'id'))
+
+    def _erro(self, linha, mensagem):
+        if len(self.erros) < MAX_ERROS:
+            self.erros.append({"linha": linha, "erro": mensagem})
+
+    def _validar(self, numero, registro):
+        nome = registro.get('nome', '')
+        email = normalizar_email(registro.get('email'))
+        if not nome:
+            return self._erro(numero, "Nome obrigatório.")
+        for coluna, tamanho in TAMANHOS.items():
+            valor = email if coluna == 'email' else registro.get(coluna, '')
+            if len(valor) > tamanho:
+                return self._erro(numero, f"Coluna {coluna} com mais de {tamanho} caracteres.")
+        try:
+            validate_email(email)
+        except ValidationError:
+            return self._erro(numero, f"Email inválido: {email or '(vazio)'}.")
+
+        cpf = None
+        if registro.get('cpf'):
+            cpf = normalizar_cpf(registro['cpf'])
+            if cpf is None:
+                return self._erro(numero, f"CPF inválido: {registro['cpf']}.")
+
+        cnpj = None
+        if registro.get('cnpj'):
+            cnpj = normalizar_cnpj(registro['cnpj'])
+            if cnpj is None:
+                return self._erro(numero, f"CNPJ inválido: {registro['cnpj']}.")
+
+        try:
+            data_nascimento = _data(registro.get('data_nascimento'))
+        except ValueError:
+            return self._erro(numero, f"Data de nascimento inválida: {registro['data_nascimento']}.")
+
+        return {
+            'nome': nome,
+            'email': email,
+            'cpf': cpf,
+            'telefone': registro.get('telefone') or None,
+            'data_nascimento': data_nascimento,
+            'cnpj': cnpj,
+            'empresa': registro.get('empresa', ''),
+        }
+
+    def _gravar(self, lote):
+        # lote: [(número da linha, dados validados)]
+        # Os emails do lote já vêm em minúsculas; os cadastrados podem não estar
+        existentes = set(
+            Aluno.objects.annotate(email_minusculo=Lower('email'))
+            .filter(email_minusculo__in=[dados['email'] for _, dados in lote])
+            .values_list('email_minusculo', flat=True)
+        )
+        alunos = []
+        novas_empresas = {}
+        for numero, dados in lote:
+            if dados['email'] in existentes:
+                self._erro(numero, f"Email já cadastrado: {dados['email']}.")
+                continue
+            existentes.add(dados['email'])
+            cnpj = dados.pop('cnpj')
+            nome_empresa = dados.pop('empresa')
+            if cnpj and cnpj not in self._empresas:
+                novas_empresas.setdefault(cnpj, nome_empresa or cnpj)
+            alunos.append((cnpj, Aluno(**dados)))
+
+        with transaction.atomic():
+            if novas_empresas:
+                criadas = Empresa.objects.bulk_create(
+                    [Empresa(nome=nome, cnpj=cnpj) for cnpj, nome in novas_empresas.items()]
+                )
+                self._empresas.update((empresa.cnpj, empresa.pk) for empresa in criadas)
+                self.empresas_criadas += len(criadas)
+                sincronizar(Empresa, ids=[empresa.pk for empresa in criadas])
+
+            for cnpj, aluno in alunos:
+                aluno.empresa_id_id = self._empresas.get(cnpj)
+            criados = Aluno.objects.bulk_create([aluno for _, aluno in alunos])
+            sincronizar(Aluno, ids=[aluno.pk for aluno in criados])
+
+        self.importados += len(criados)
+
+    def executar(self, registros):
+        lote = []
+        for numero, registro in enumerate(registros, start=2):  # linha 1 é o cabeçalho
+            self.linhas += 1
+            dados = self._validar(numero, registro)
+            if dados:
+                lote.append((numero, dados))
+            if len(lote) >= LOTE:
+                self._gravar(lote)
+                lote = []
+                if self.progresso:
+                    self.progresso(self)
+        if lote:
+            self._gravar(lote)
+        if self.progresso:
+            self.progresso(self)
+        return self.resumo()
+
+    def resumo(self):
+        return {
+            "linhas": self.linhas,
+            "importados": self.importados,
+            "empresas_criadas": self.empresas_criadas,
+            "erros": self.erros,
+        }
+
+
+def importar_planilha(arquivo, nome_arquivo, progresso=None):
+    return Importacao(progresso).executar(ler_planilha(arquivo, nome_arquivo))
@@ -0,0 +1,30 @@
+import logging
+import time
+from django.core.management.base import BaseCommand
+from cadastro import replica
+
+logger = logging.getLogger(__name__)
+
+
+class Command(BaseCommand):
+    help = 'Atualiza a réplica somente leitura usada por relatórios e exportações (backup online do SQLite)'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--intervalo', type=int, help='Repete a cópia a cada N segundos, até ser interrompido')
+
+    def handle(self, *args, **kwargs):
+        intervalo = kwargs['intervalo']
+        while True:
+            try:
+                duracao = replica.atualizar()
+            except Exception:
+                if not intervalo:
+                    raise
+                # Em modo contínuo uma falha (disco cheio, banco travado...)
+                # não pode parar as próximas cópias
+                logger.exception("Falha ao atualizar a réplica; nova tentativa em %ss", intervalo)
+            else:
+                self.stdout.write(self.style.SUCCESS(f"✅ Réplica atualizada em {duracao:.2f}s."))
+            if not intervalo:
+                return
+            time.sleep(intervalo)
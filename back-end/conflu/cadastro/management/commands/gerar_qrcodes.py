@@ -0,0 +1,20 @@
+import os
+from django.core.management.base import BaseCommand
+from cadastro.models import Aula
+from cadastro.qrcodes import gerar_qrcodes
+
+
+class Command(BaseCommand):
+    help = 'Gera os QR codes das aulas (de uma turma ou de todas) em paralelo'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--turma', type=int, help='Gera apenas as aulas desta turma')
+        parser.add_argument('--processos', type=int, default=os.cpu_count(), help='Número de processos (padrão: núcleos da máquina)')
+
+    def handle(self, *args, **kwargs):
+        aulas = Aula.objects.only('id', 'turma_id', 'data', 'qr_code_path').order_by('id')
+        if kwargs['turma']:
+            aulas = aulas.filter(turma_id=kwargs['turma'])
+
+        renderizados = gerar_qrcodes(list(aulas), processos=kwargs['processos'])
+        self.stdout.write(self.style.SUCCESS(f"✅ {renderizados} QR code(s) renderizado(s)."))
@@ -0,0 +1,31 @@
+from django.core.management.base import BaseCommand, CommandError
+from cadastro.importacao import ArquivoInvalido, importar_planilha
+
+
+class Command(BaseCommand):
+    help = 'Importa alunos (e suas empresas) de uma planilha CSV ou XLSX'
+
+    def add_arguments(self, parser):
+        parser.add_argument('arquivo', help='Caminho da planilha (.csv ou .xlsx)')
+
+    def progresso(self, importacao):
+        self.stdout.write(
+            f"{importacao.linhas} linhas lidas, {importacao.importados} importadas, "
+            f"{len(importacao.erros)} erros"
+        )
+
+    def handle(self, *args, **kwargs):
+        caminho = kwargs['arquivo']
+        try:
+            with open(caminho, 'rb') as arquivo:
+                resumo = importar_planilha(arquivo, caminho, progresso=self.progresso)
+        except (OSError, ArquivoInvalido) as e:
+            raise CommandError(str(e))
+
+        for erro in resumo['erros']:
+            self.stderr.write(f"Linha {erro['linha']}: {erro['erro']}")
+
+        self.stdout.write(self.style.SUCCESS(
+            f"✅ {resumo['importados']} aluno(s) importado(s), "
+            f"{resumo['empresas_criadas']} empresa(s) criada(s)."
+        ))
@@ -0,0 +1,10 @@
+from django.core.management.base import BaseCommand
+from cadastro import resumo
+
+
+class Command(BaseCommand):
+    help = 'Recalcula o resumo de frequência (presenças, total de aulas e percentual) de todas as matrículas'
+
+    def handle(self, *args, **kwargs):
+        total = resumo.reconstruir()
+        self.stdout.write(self.style.SUCCESS(f"✅ Resumo de frequência recalculado para {total} matrícula(s)."))
@@ -0,0 +1,14 @@
+from django.core.management.base import BaseCommand
+from cadastro import search
+
+
+class Command(BaseCommand):
+    help = 'Recria o índice de busca (FTS5) de alunos, empresas e cursos'
+
+    def handle(self, *args, **kwargs):
+        if not search.disponivel():
+            self.stderr.write("Índice de busca disponível apenas com SQLite.")
+            return
+
+        search.reconstruir_indice()
+        self.stdout.write(self.style.SUCCESS("✅ Índice de busca reconstruído."))
@@ -0,0 +1,94 @@
+import os
+import time
+from pathlib import Path
+from django.apps import apps
+from django.core.management import call_command
+from django.core.management.base import BaseCommand
+from django.db import connection
+from django.db.migrations.recorder import MigrationRecorder
+
+
+def migracoes_pendentes():
+    """
+    Compara os arquivos de migration de cada app com a tabela
+    django_migrations, sem importar os módulos de migration (é isso que
+    deixa o `migrate` lento mesmo quando não há nada a aplicar).
+    """
+    recorder = MigrationRecorder(connection)
+    if not recorder.has_table():
+        return True
+
+    aplicadas = recorder.applied_migrations()
+    for app_config in apps.get_app_configs():
+        pasta = Path(app_config.path) / 'migrations'
+        if not pasta.is_dir():
+            continue
+        for arquivo in pasta.glob('[0-9]*.py'):
+            if (app_config.label, arquivo.stem) not in aplicadas:
+                return True
+    return False
+
+
+def servir_wsgi(host, port, workers, threads):
+    """
+    API síncrona (DRF) no gunicorn com workers gthread: cada worker atende
+    `threads` requisições ao mesmo tempo. Sob ASGI as views síncronas
+    rodariam numa única thread por worker, uma requisição de cada vez.
+    """
+    from gunicorn.app.base import BaseApplication
+
+    class Servidor(BaseApplication):
+        def load_config(self):
+            self.cfg.set('bind', f'{host}:{port}')
+            self.cfg.set('workers', workers)
+            self.cfg.set('worker_class', 'gthread')
+            self.cfg.set('threads', threads)
+            self.cfg.set('accesslog', '-')
+
+        def load(self):
+            from conflu_ai.wsgi import application
+            return application
+
+    Servidor().run()
+
+
+def servir_asgi(host, port, workers):
+    """Só para as leituras async de /api/async/ (ver cadastro.views_async)."""
+    import uvicorn
+
+    uvicorn.run(
+        'conflu_ai.asgi:application',
+        host=host,
+        port=port,
+        workers=workers,
+        lifespan='off',
+    )
+
+
+class Command(BaseCommand):
+    help = 'Sobe o servidor de produção (gunicorn/WSGI, ou uvicorn/ASGI com --asgi), aplicando as migrations só se houver pendentes'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--host', default='0.0.0.0')
+        parser.add_argument('--port', type=int, default=int(os.getenv('CONFLU_PORT') or 4000))
+        parser.add_argument('--workers', type=int, default=int(os.getenv('WEB_WORKERS') or 2))
+        parser.add_argument('--threads', type=int, default=int(os.getenv('WEB_THREADS') or 8), help='Threads por worker (WSGI)')
+        parser.add_argument('--asgi', action='store_true', help='Serve pelo uvicorn (ASGI), para as views async')
+        parser.add_argument('--sem-migrate', action='store_true', help='Não verifica migrations pendentes')
+
+    def handle(self, *args, **kwargs):
+        if not kwargs['sem_migrate']:
+            inicio = time.perf_counter()
+            if migracoes_pendentes():
+                self.stdout.write("📌 Há migrations pendentes, aplicando...")
+                call_command('migrate', interactive=False)
+            else:
+                self.stdout.write(f"✅ Banco em dia ({(time.perf_counter() - inicio) * 1000:.0f} ms), migrate ignorado.")
+
+        # O processo que só verifica o banco não precisa manter a conexão
+        connection.close()
+
+        if kwargs['asgi']:
+            servir_asgi(kwargs['host'], kwargs['port'], kwargs['workers'])
+        else:
+            servir_wsgi(kwargs['host'], kwargs['port'], kwargs['workers'], kwargs['threads'])
@@ -0,0 +1,45 @@
+# Generated by Django 5.2.7 on 2026-10-18 18:23
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('cadastro', '0011_pagamento_tipo_pagamento'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='aluno',
+            index=models.Index(fields=['cpf'], name='aluno_cpf_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='aluno',
+            index=models.Index(fields=['nome'], name='aluno_nome_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='aluno',
+            index=models.Index(fields=['created_at'], name='aluno_created_at_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='curso',
+            index=models.Index(fields=['nome'], name='curso_nome_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='curso',
+            index=models.Index(fields=['valor'], name='curso_valor_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='curso',
+            index=models.Index(fields=['created_at'], name='curso_created_at_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='empresa',
+            index=models.Index(fields=['cnpj'], name='empresa_cnpj_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='empresa',
+            index=models.Index(fields=['nome'], name='empresa_nome_idx'),
+        ),
+    ]
@@ -0,0 +1,39 @@
+from django.db import migrations
+
+TIPOS = [
+    (0, 'aluno', 'cadastro_aluno', "nome", "coalesce(email, '') || ' ' || coalesce(cpf, '')"),
+    (1, 'empresa', 'cadastro_empresa', "nome", "coalesce(cnpj, '')"),
+    (2, 'curso', 'cadastro_curso', "nome", "coalesce(descricao, '')"),
+]
+
+
+def criar_indice(apps, schema_editor):
+    if schema_editor.connection.vendor != 'sqlite':
+        return
+    schema_editor.execute(
+        "CREATE VIRTUAL TABLE IF NOT EXISTS cadastro_busca USING fts5("
+        "tipo UNINDEXED, objeto_id UNINDEXED, titulo, conteudo, "
+        "tokenize = 'unicode61 remove_diacritics 2', prefix = '2 3')"
+    )
+    for codigo, tipo, origem, titulo, conteudo in TIPOS:
+        schema_editor.execute(
+            f"INSERT INTO cadastro_busca (rowid, tipo, objeto_id, titulo, conteudo) "
+            f"SELECT id * {len(TIPOS)} + {codigo}, '{tipo}', id, {titulo}, {conteudo} FROM {origem}"
+        )
+
+
+def remover_indice(apps, schema_editor):
+    if schema_editor.connection.vendor != 'sqlite':
+        return
+    schema_editor.execute("DROP TABLE IF EXISTS cadastro_busca")
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('cadastro', '0012_indices_filtros'),
+    ]
+
+    operations = [
+        migrations.RunPython(criar_indice, remover_indice),
+    ]
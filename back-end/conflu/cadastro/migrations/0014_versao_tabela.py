@@ -0,0 +1,21 @@
+# Generated by Django 5.2.7 on 2026-10-18 18:26
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('cadastro', '0013_indice_busca'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='VersaoTabela',
+            fields=[
+                ('tabela', models.CharField(max_length=50, primary_key=True, serialize=False)),
+                ('versao', models.PositiveBigIntegerField(default=0)),
+                ('atualizado_em', models.DateTimeField(auto_now=True)),
+            ],
+        ),
+    ]
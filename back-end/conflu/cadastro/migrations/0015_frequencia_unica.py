@@ -0,0 +1,30 @@
+# Generated by Django 5.2.7 on 2026-10-18 18:31
+
+from django.db import migrations, models
+from django.db.models import Max
+
+
+def remover_duplicadas(apps, schema_editor):
+    # Mantém só o registro mais recente de cada (aula, matrícula) antes da constraint
+    Frequencia = apps.get_model('cadastro', 'Frequencia')
+    manter = (
+        Frequencia.objects.values('aula_id', 'matricula_id')
+        .annotate(ultimo=Max('id'))
+        .values_list('ultimo', flat=True)
+    )
+    Frequencia.objects.exclude(id__in=manter).delete()
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('cadastro', '0014_versao_tabela'),
+    ]
+
+    operations = [
+        migrations.RunPython(remover_duplicadas, migrations.RunPython.noop),
+        migrations.AddConstraint(
+            model_name='frequencia',
+            constraint=models.UniqueConstraint(fields=('aula_id', 'matricula_id'), name='frequencia_aula_matricula_unica'),
+        ),
+    ]
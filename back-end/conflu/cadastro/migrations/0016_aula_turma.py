@@ -0,0 +1,28 @@
+# Generated by Django 5.2.7 on 2026-10-18 18:32
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('cadastro', '0015_frequencia_unica'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='aula',
+            name='turma_id',
+            field=models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.CASCADE, to='cadastro.turma'),
+        ),
+        migrations.AlterField(
+            model_name='aula',
+            name='qr_code_path',
+            field=models.TextField(blank=True, default=''),
+        ),
+        migrations.AddIndex(
+            model_name='aula',
+            index=models.Index(fields=['turma_id', 'data'], name='aula_turma_data_idx'),
+        ),
+    ]
@@ -0,0 +1,52 @@
+# Generated by Django 5.2.7 on 2026-10-18 18:36
+
+import django.db.models.deletion
+from decimal import Decimal
+from django.db import migrations, models
+from django.db.models import Count, Q
+
+
+def preencher_resumo(apps, schema_editor):
+    # Calcula o resumo das matrículas já existentes
+    Aula = apps.get_model('cadastro', 'Aula')
+    Matricula = apps.get_model('cadastro', 'Matricula')
+    ResumoFrequencia = apps.get_model('cadastro', 'ResumoFrequencia')
+    aulas_por_turma = dict(
+        Aula.objects.exclude(turma_id=None).values_list('turma_id').annotate(total=Count('id')).order_by()
+    )
+    linhas = Matricula.objects.annotate(
+        presencas=Count('frequencia', filter=Q(frequencia__presente=True)),
+    ).values_list('id', 'turma_id', 'presencas')
+    ResumoFrequencia.objects.bulk_create([
+        ResumoFrequencia(
+            matricula_id_id=matricula_id,
+            presencas=presencas,
+            total_aulas=aulas_por_turma.get(turma_id, 0),
+            percentual=(
+                (Decimal(100) * presencas / aulas_por_turma[turma_id]).quantize(Decimal('0.01'))
+                if aulas_por_turma.get(turma_id) else Decimal('0.00')
+            ),
+        )
+        for matricula_id, turma_id, presencas in linhas
+    ], batch_size=500)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('cadastro', '0016_aula_turma'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ResumoFrequencia',
+            fields=[
+                ('matricula_id', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, primary_key=True, related_name='resumo_frequencia', serialize=False, to='cadastro.matricula')),
+                ('presencas', models.PositiveIntegerField(default=0)),
+                ('total_aulas', models.PositiveIntegerField(default=0)),
+                ('percentual', models.DecimalField(decimal_places=2, default=0, max_digits=5)),
+                ('atualizado_em', models.DateTimeField(auto_now=True)),
+            ],
+        ),
+        migrations.RunPython(preencher_resumo, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,21 @@
+# Generated by Django 5.2.7 on 2026-10-18 18:37
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('cadastro', '0017_resumo_frequencia'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='pagamento',
+            index=models.Index(fields=['status', 'created_at'], name='pagamento_status_created_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='pagamento',
+            index=models.Index(fields=['created_at'], name='pagamento_created_at_idx'),
+        ),
+    ]
@@ -0,0 +1,76 @@
+# Generated by Django 5.2.7 on 2026-10-18 18:39
+
+from decimal import Decimal
+from django.db import migrations, models
+from django.db.models import Count, Min, Q
+
+
+def unificar_matriculas(apps, schema_editor):
+    # Antes da constraint, cada (aluno, turma) repetido fica só com a
+    # matrícula mais antiga; as frequências das repetidas passam para ela
+    # quando a aula ainda não tem registro, e o resumo é recalculado.
+    Aula = apps.get_model('cadastro', 'Aula')
+    Frequencia = apps.get_model('cadastro', 'Frequencia')
+    Matricula = apps.get_model('cadastro', 'Matricula')
+    ResumoFrequencia = apps.get_model('cadastro', 'ResumoFrequencia')
+
+    repetidas = (
+        Matricula.objects.values('aluno_id', 'turma_id')
+        .annotate(manter=Min('id'), quantidade=Count('id'))
+        .filter(quantidade__gt=1)
+    )
+    mantidas = []
+    for grupo in repetidas:
+        manter = grupo['manter']
+        outras = list(
+            Matricula.objects.filter(aluno_id=grupo['aluno_id'], turma_id=grupo['turma_id'])
+            .exclude(id=manter)
+            .values_list('id', flat=True)
+        )
+        ja_registradas = set(Frequencia.objects.filter(matricula_id=manter).values_list('aula_id', flat=True))
+        for frequencia in Frequencia.objects.filter(matricula_id__in=outras).order_by('-id'):
+            if frequencia.aula_id_id not in ja_registradas:
+                ja_registradas.add(frequencia.aula_id_id)
+                frequencia.matricula_id_id = manter
+                frequencia.save(update_fields=['matricula_id'])
+        Matricula.objects.filter(id__in=outras).delete()
+        mantidas.append(manter)
+
+    for matricula in Matricula.objects.filter(id__in=mantidas).annotate(
+        presencas=Count('frequencia', filter=Q(frequencia__presente=True)),
+    ):
+        total_aulas = Aula.objects.filter(turma_id=matricula.turma_id_id).count()
+        ResumoFrequencia.objects.update_or_create(
+            matricula_id_id=matricula.id,
+            defaults={
+                'presencas': matricula.presencas,
+                'total_aulas': total_aulas,
+                'percentual': (
+                    (Decimal(100) * matricula.presencas / total_aulas).quantize(Decimal('0.01'))
+                    if total_aulas else Decimal('0.00')
+                ),
+            },
+        )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('cadastro', '0018_indices_pagamento'),
+    ]
+
+    operations = [
+        migrations.RunPython(unificar_matriculas, migrations.RunPython.noop),
+        migrations.AddIndex(
+            model_name='pagamento',
+            index=models.Index(fields=['aluno_id', 'curso_id'], name='pagamento_aluno_curso_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='turma',
+            index=models.Index(fields=['curso_id', 'data_inicio'], name='turma_curso_inicio_idx'),
+        ),
+        migrations.AddConstraint(
+            model_name='matricula',
+            constraint=models.UniqueConstraint(fields=('aluno_id', 'turma_id'), name='matricula_aluno_turma_unica'),
+        ),
+    ]
@@ -9,7 +9,13 @@ class Empresa(models.Model):
     tipo_inscricao = models.CharField(max_length=13, null=True, blank=True)
     endereco = models.CharField(max_length=100, null=True, blank=True)
     optante_simp_nacional = models.BooleanField(default=False, null=True, blank=True)
-    
+
+    class Meta:
+        indexes = [
+            models.Index(fields=['cnpj'], name='empresa_cnpj_idx'),
+            models.Index(fields=['nome'], name='empresa_nome_idx'),
+        ]
+
     def __str__(self):
         return f"{self.nome} ({self.id})"
 
@@ -23,6 +29,13 @@ class Aluno(models.Model):
     data_nascimento = models.DateField(null=True, blank=True)
     created_at = models.DateTimeField(auto_now_add=True)
 
+    class Meta:
+        indexes = [
+            models.Index(fields=['cpf'], name='aluno_cpf_idx'),
+            models.Index(fields=['nome'], name='aluno_nome_idx'),
+            models.Index(fields=['created_at'], name='aluno_created_at_idx'),
+        ]
+
     def __str__(self):
         return f"{self.nome} ({self.email})"
 
@@ -34,6 +47,13 @@ class Curso(models.Model):
     quant_dias = models.IntegerField(null=False, blank=False)
     created_at = models.DateTimeField(auto_now_add=True)
 
+    class Meta:
+        indexes = [
+            models.Index(fields=['nome'], name='curso_nome_idx'),
+            models.Index(fields=['valor'], name='curso_valor_idx'),
+            models.Index(fields=['created_at'], name='curso_created_at_idx'),
+        ]
+
     def __str__(self):
         return f"{self.nome} ({self.id})"
 
@@ -45,14 +65,25 @@ class Turma(models.Model):
     data_fim = models.DateField(null=False, blank=False)
     created_at = models.DateTimeField(auto_now_add=True)
 
+    class Meta:
+        indexes = [
+            models.Index(fields=['curso_id', 'data_inicio'], name='turma_curso_inicio_idx'),
+        ]
+
     def __str__(self):
         return f"Turma - {self.id} / Curso - {self.curso_id.nome}"
 
 class Aula(models.Model):
     id = models.AutoField(primary_key=True)
-    qr_code_path = models.TextField(blank=False, null=False)
+    turma_id = models.ForeignKey(Turma, null=True, blank=True, on_delete=models.CASCADE)
+    qr_code_path = models.TextField(blank=True, null=False, default='')
     data = models.DateField(null=False, blank=False)
 
+    class Meta:
+        indexes = [
+            models.Index(fields=['turma_id', 'data'], name='aula_turma_data_idx'),
+        ]
+
     def __str__(self):
         return f"Aula ({self.id})"
 
@@ -64,6 +95,13 @@ class Pagamento(models.Model):
     tipo_pagamento = models.CharField(max_length=50, null=False, blank=False, default='Pix')
     created_at = models.DateTimeField(auto_now_add=True)
 
+    class Meta:
+        indexes = [
+            models.Index(fields=['aluno_id', 'curso_id'], name='pagamento_aluno_curso_idx'),
+            models.Index(fields=['status', 'created_at'], name='pagamento_status_created_idx'),
+            models.Index(fields=['created_at'], name='pagamento_created_at_idx'),
+        ]
+
     def __str__(self):
         return f"Pagamento - {self.id} / Status ({self.status})"
 
@@ -74,6 +112,11 @@ class Matricula(models.Model):
     fonte = models.CharField(max_length=100, null=False, blank=False)
     data_matricula = models.DateField(null=False, blank=False)
 
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=['aluno_id', 'turma_id'], name='matricula_aluno_turma_unica'),
+        ]
+
     def __str__(self):
         return f"Matricula - {self.id} / Turma - ({self.turma_id}) / Aluno(a) - {self.aluno_id.nome}"
 
@@ -84,6 +127,31 @@ class Frequencia(models.Model):
     presente = models.BooleanField(default=False, null=True, blank=True)
     observacao = models.TextField(null=True, blank=True)
 
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=['aula_id', 'matricula_id'], name='frequencia_aula_matricula_unica'),
+        ]
+
     def __str__(self):
         condicao = "presente" if self.presente else "ausente"
-        return f"{self.matricula_id.aluno_id.nome} está {condicao}"
\ No newline at end of file
+        return f"{self.matricula_id.aluno_id.nome} está {condicao}"
+
+class ResumoFrequencia(models.Model):
+    # Totais de frequência por matrícula, mantidos por cadastro.resumo
+    matricula_id = models.OneToOneField(Matricula, primary_key=True, on_delete=models.CASCADE, related_name='resumo_frequencia')
+    presencas = models.PositiveIntegerField(default=0)
+    total_aulas = models.PositiveIntegerField(default=0)
+    percentual = models.DecimalField(max_digits=5, decimal_places=2, default=0)
+    atualizado_em = models.DateTimeField(auto_now=True)
+
+    def __str__(self):
+        return f"Matricula - {self.matricula_id_id}: {self.presencas}/{self.total_aulas} ({self.percentual}%)"
+
+class VersaoTabela(models.Model):
+    # Carimbo de versão por tabela, incrementado a cada escrita (ver cadastro.versions)
+    tabela = models.CharField(max_length=50, primary_key=True)
+    versao = models.PositiveBigIntegerField(default=0)
+    atualizado_em = models.DateTimeField(auto_now=True)
+
+    def __str__(self):
+        return f"{self.tabela} (v{self.versao})"
@@ -0,0 +1,66 @@
+from rest_framework.exceptions import NotFound, ValidationError
+from rest_framework.pagination import Cursor, CursorPagination
+
+
+class CadastroCursorPagination(CursorPagination):
+    """
+    Paginação por cursor (keyset) para as listagens do cadastro.
+
+    A ordenação padrão é pelo id, que é único e crescente junto com o created_at,
+    então cada página é um `WHERE id < cursor ORDER BY id DESC LIMIT n`
+    usando a chave primária: a página 1000 custa o mesmo que a primeira.
+    Os links `next`/`previous` carregam o cursor opaco em `?cursor=`.
+
+    `?ordering=campo` (ou `-campo`) troca a chave do cursor por um dos
+    `ordering_fields` da view, sempre desempatando pelo id.
+    """
+    page_size = 50
+    page_size_query_param = 'limit'
+    max_page_size = 500
+    ordering = '-id'
+    ordering_param = 'ordering'
+
+    def get_ordering(self, request, queryset, view):
+        campo = request.query_params.get(self.ordering_param)
+        if not campo:
+            return (self.ordering,)
+
+        if campo.lstrip('-') not in getattr(view, 'ordering_fields', ()):
+            raise ValidationError({self.ordering_param: f"Ordenação inválida: {campo}."})
+
+        desempate = '-id' if campo.startswith('-') else 'id'
+        return (campo, desempate)
+
+
+class CadastroCursorPaginationAsync(CadastroCursorPagination):
+    """
+    Variante para as views async (cadastro.views_async): lê a página com
+    `aiterator()`. Aceita só a ordenação padrão e só avança (`previous` é
+    sempre null); nessa ordem os cursores são os mesmos da paginação
+    síncrona, então um `next` de uma serve na outra.
+    """
+
+    async def apaginate_queryset(self, queryset, request):
+        if request.query_params.get(self.ordering_param):
+            raise ValidationError({self.ordering_param: "Ordenação não suportada nesta rota."})
+
+        self.request = request
+        self.base_url = request.build_absolute_uri()
+        self.page_size = self.get_page_size(request)
+        self.cursor = self.decode_cursor(request)
+        if self.cursor and (self.cursor.reverse or self.cursor.offset):
+            raise NotFound(self.invalid_cursor_message)
+        if self.cursor and self.cursor.position is not None:
+            queryset = queryset.filter(id__lt=self.cursor.position)
+
+        limite = self.page_size + 1
+        pagina = [objeto async for objeto in queryset.order_by(self.ordering)[:limite].aiterator(chunk_size=limite)]
+        self.has_next = len(pagina) > self.page_size
+        self.page = pagina[:self.page_size]
+        return self.page
+
+    def get_paginated_data(self, data):
+        proximo = None
+        if self.has_next:
+            proximo = self.encode_cursor(Cursor(offset=0, reverse=False, position=str(self.page[-1].id)))
+        return {'next': proximo, 'previous': None, 'results': data}
@@ -0,0 +1,113 @@
+"""
+QR codes das aulas, gravados em disco endereçados pelo conteúdo.
+
+O nome de cada imagem é o sha256 do conteúdo codificado (mais os
+parâmetros de renderização). O conteúdo é o token assinado da aula
+(cadastro.checkin), único por aula, então duas aulas nunca compartilham
+imagem; o hash serve para que rodar `gerar_qrcodes` de novo não
+renderize o que já existe, e para que uma aula com data ou turma
+alterada (ou uma troca de SECRET_KEY) ganhe um arquivo novo em vez de
+sobrescrever o antigo. Como o conteúdo de um arquivo nunca muda, ele é
+servido com cache de um ano.
+
+Este módulo não importa os models no topo para que `renderizar` possa
+rodar em processos filhos do ProcessPoolExecutor mesmo com o método
+spawn (Windows/macOS), sem configurar o Django. A biblioteca qrcode
+(e o Pillow) só é importada na primeira renderização.
+"""
+import hashlib
+import io
+import os
+import re
+import tempfile
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+from django.conf import settings
+
+TAMANHO_MODULO = 10
+BORDA = 2
+VERSAO_RENDER = f"v2-{TAMANHO_MODULO}-{BORDA}"
+
+CHAVE_VALIDA = re.compile(r'^[0-9a-f]{64}$')
+
+
+def diretorio():
+    return Path(settings.QRCODE_DIR)
+
+
+def payload_aula(aula):
+    # Token assinado do check-in (cadastro.checkin); importado aqui pelo mesmo
+    # motivo dos models: manter o módulo leve para os processos filhos
+    from cadastro.checkin import token_aula
+    return token_aula(aula)
+
+
+def chave(payload):
+    return hashlib.sha256(f"{VERSAO_RENDER}|{payload}".encode()).hexdigest()
+
+
+def caminho_relativo(chave):
+    return f"{chave[:2]}/{chave}.png"
+
+
+def caminho(chave):
+    return diretorio() / caminho_relativo(chave)
+
+
+def renderizar(payload):
+    # Import tardio: qrcode/Pillow só carregam em quem renderiza
+    import qrcode
+
+    imagem = qrcode.make(payload, box_size=TAMANHO_MODULO, border=BORDA)
+    buffer = io.BytesIO()
+    imagem.save(buffer, format='PNG', optimize=True)
+    return buffer.getvalue()
+
+
+def _salvar(chave, conteudo):
+    destino = caminho(chave)
+    destino.parent.mkdir(parents=True, exist_ok=True)
+    # Grava em arquivo temporário e renomeia: leitores nunca veem um PNG pela metade
+    # (nome único por chamada: threads e processos podem gravar a mesma chave ao mesmo tempo)
+    with tempfile.NamedTemporaryFile(dir=destino.parent, suffix='.tmp', delete=False) as temporario:
+        temporario.write(conteudo)
+    # mkstemp cria com 0600; as imagens precisam ser legíveis pelos outros containers
+    os.chmod(temporario.name, 0o644)
+    os.replace(temporario.name, destino)
+
+
+def gerar_qrcodes(aulas, processos=None):
+    """
+    Garante o QR code de cada aula e atualiza `qr_code_path`. Só as imagens
+    que ainda não existem em disco são renderizadas; com `processos` > 1 elas são
+    divididas entre processos.
+    """
+    from cadastro.models import Aula
+    from cadastro import versions
+
+    pendentes = {}
+    alteradas = []
+    for aula in aulas:
+        payload = payload_aula(aula)
+        k = chave(payload)
+        if not caminho(k).exists():
+            pendentes.setdefault(k, payload)
+        if aula.qr_code_path != caminho_relativo(k):
+            aula.qr_code_path = caminho_relativo(k)
+            alteradas.append(aula)
+
+    chaves, payloads = list(pendentes), list(pendentes.values())
+    if processos and processos > 1 and len(payloads) > 1:
+        with ProcessPoolExecutor(max_workers=processos) as pool:
+            imagens = pool.map(renderizar, payloads, chunksize=max(1, len(payloads) // (processos * 4)))
+            for k, conteudo in zip(chaves, imagens):
+                _salvar(k, conteudo)
+    else:
+        for k, payload in zip(chaves, payloads):
+            _salvar(k, renderizar(payload))
+
+    if alteradas:
+        Aula.objects.bulk_update(alteradas, ['qr_code_path'], batch_size=500)
+        versions.tocar(Aula)
+
+    return len(pendentes)
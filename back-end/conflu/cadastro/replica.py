@@ -0,0 +1,87 @@
+"""
+Réplica somente leitura do banco para relatórios e exportações.
+
+A réplica é uma cópia do db.sqlite3 feita com a API de backup online do
+SQLite (`atualizar`, chamada pelo comando atualizar_replica). A cópia é
+gravada num arquivo temporário e trocada com os.replace, então quem já
+está lendo continua no snapshot anterior e conexões novas abrem o novo.
+
+As views marcadas com `usar_replica` leem pelo alias 'replica' através
+do ReplicaRouter; todo o resto, e qualquer escrita, fica no 'default'.
+Enquanto a réplica não existir, as leituras continuam no 'default'.
+"""
+import os
+import sqlite3
+import time
+from contextvars import ContextVar
+from functools import wraps
+from django.conf import settings
+
+ALIAS = 'replica'
+PAGINAS_POR_PASSO = 1024
+
+_ativa = ContextVar('usar_replica', default=False)
+
+
+def disponivel():
+    return ALIAS in settings.DATABASES and os.path.exists(settings.REPLICA_PATH)
+
+
+class ReplicaRouter:
+    def db_for_read(self, model, **hints):
+        if _ativa.get() and disponivel():
+            return ALIAS
+        return None
+
+    def db_for_write(self, model, **hints):
+        return 'default'
+
+    def allow_relation(self, obj1, obj2, **hints):
+        # Réplica e default têm os mesmos dados
+        return True
+
+    def allow_migrate(self, db, app_label, model_name=None, **hints):
+        return db != ALIAS
+
+
+def usar_replica(view_func):
+    """
+    Decorator para métodos de leitura das viewsets. Deve ficar acima de
+    `condicional`, para que o ETag venha das versões da própria réplica.
+    """
+    @wraps(view_func)
+    def wrapper(self, request, *args, **kwargs):
+        token = _ativa.set(True)
+        try:
+            return view_func(self, request, *args, **kwargs)
+        finally:
+            _ativa.reset(token)
+
+    return wrapper
+
+
+def atualizar(origem=None, destino=None):
+    """
+    Copia o banco `origem` (padrão: NAME do 'default') para `destino`
+    (padrão: settings.REPLICA_PATH). Devolve o tempo gasto em segundos.
+    """
+    origem = str(origem or settings.DATABASES['default']['NAME'])
+    destino = str(destino or settings.REPLICA_PATH)
+    temporario = f"{destino}.tmp"
+    inicio = time.perf_counter()
+
+    fonte = sqlite3.connect(origem)
+    copia = sqlite3.connect(temporario)
+    try:
+        # Em passos, para não segurar o lock de leitura da origem de uma vez
+        fonte.backup(copia, pages=PAGINAS_POR_PASSO)
+        # A réplica é aberta com mode=ro&immutable=1, o que exige journal
+        # sem WAL (o modo WAL é copiado junto com o cabeçalho do banco)
+        copia.execute('PRAGMA journal_mode=DELETE')
+        copia.commit()
+    finally:
+        copia.close()
+        fonte.close()
+
+    os.replace(temporario, destino)
+    return time.perf_counter() - inicio
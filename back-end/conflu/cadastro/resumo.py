@@ -0,0 +1,88 @@
+"""
+Resumo de frequência por matrícula (presenças, total de aulas e
+percentual), para que relatórios de turma e a elegibilidade de
+certificado leiam uma linha pronta em vez de agregar a Frequencia.
+
+Os caminhos de escrita chamam `atualizar` com as matrículas afetadas
+(frequencia.registrar, registrar_presencas) ou `atualizar_turma` quando
+o número de aulas muda (agenda.gerar_aulas); cada chamada recalcula só
+aquelas matrículas com uma consulta agregada e um upsert.
+`reconstruir` refaz a tabela inteira (comando rebuild_resumo_frequencia).
+Toda gravação incrementa a versão de ResumoFrequencia (cadastro.versions),
+inclusive as disparadas pelos signals, para invalidar os ETags do relatório.
+"""
+from decimal import Decimal
+from django.db import transaction
+from django.db.models import Count, F, OuterRef, Q, Subquery
+from django.db.models.functions import Coalesce
+from cadastro import versions
+from cadastro.models import Aula, Matricula, ResumoFrequencia
+
+# Limite de variáveis por consulta do SQLite
+LOTE = 500
+
+
+def percentual(presencas, total_aulas):
+    if not total_aulas:
+        return Decimal('0.00')
+    return (Decimal(100) * presencas / total_aulas).quantize(Decimal('0.01'))
+
+
+def _calcular(matriculas):
+    aulas_da_turma = (
+        Aula.objects.filter(turma_id=OuterRef('turma_id'))
+        .order_by()
+        .values('turma_id')
+        .annotate(total=Count('id'))
+        .values('total')
+    )
+    # Só presenças em aulas da própria turma, o mesmo conjunto de total_aulas:
+    # uma aula avulsa (sem turma) não pode levar o percentual acima de 100
+    linhas = matriculas.order_by().annotate(
+        presencas=Count('frequencia', filter=Q(frequencia__presente=True, frequencia__aula_id__turma_id=F('turma_id'))),
+        total_aulas=Coalesce(Subquery(aulas_da_turma), 0),
+    ).values_list('id', 'presencas', 'total_aulas')
+    return [
+        ResumoFrequencia(
+            matricula_id_id=matricula_id,
+            presencas=presencas,
+            total_aulas=total_aulas,
+            percentual=percentual(presencas, total_aulas),
+        )
+        for matricula_id, presencas, total_aulas in linhas
+    ]
+
+
+def _gravar(resumos):
+    ResumoFrequencia.objects.bulk_create(
+        resumos,
+        batch_size=LOTE,
+        update_conflicts=True,
+        unique_fields=['matricula_id'],
+        update_fields=['presencas', 'total_aulas', 'percentual', 'atualizado_em'],
+    )
+
+
+def atualizar(matricula_ids):
+    """Recalcula o resumo das matrículas informadas."""
+    ids = sorted(set(matricula_ids))
+    for inicio in range(0, len(ids), LOTE):
+        _gravar(_calcular(Matricula.objects.filter(id__in=ids[inicio:inicio + LOTE])))
+    if ids:
+        versions.tocar(ResumoFrequencia)
+    return len(ids)
+
+
+def atualizar_turma(turma_id):
+    """Recalcula o resumo de todas as matrículas de uma turma."""
+    return atualizar(Matricula.objects.filter(turma_id=turma_id).values_list('id', flat=True))
+
+
+def reconstruir():
+    """Apaga e recalcula o resumo de todas as matrículas."""
+    with transaction.atomic():
+        ResumoFrequencia.objects.all().delete()
+        resumos = _calcular(Matricula.objects.all())
+        _gravar(resumos)
+        versions.tocar(ResumoFrequencia)
+    return len(resumos)
@@ -0,0 +1,130 @@
+"""
+Índice de busca textual (SQLite FTS5) sobre alunos, empresas e cursos.
+
+Cada registro vira uma linha da tabela virtual `cadastro_busca`, com
+rowid = id * 3 + código do tipo, então atualizar ou remover um registro
+é um acesso direto pelo rowid. Os signals em `cadastro.signals` mantêm o
+índice em dia e `manage.py rebuild_search_index` o recria do zero.
+"""
+from django.db import connection
+
+TABELA = 'cadastro_busca'
+
+# Resultados por busca (?limit=): padrão e máximo
+LIMITE = 20
+MAX_LIMITE = 100
+
+# tipo -> (código usado no rowid, tabela de origem, expressão do título, expressão do conteúdo)
+TIPOS = {
+    'aluno': (0, 'cadastro_aluno', "nome", "coalesce(email, '') || ' ' || coalesce(cpf, '')"),
+    'empresa': (1, 'cadastro_empresa', "nome", "coalesce(cnpj, '')"),
+    'curso': (2, 'cadastro_curso', "nome", "coalesce(descricao, '')"),
+}
+
+
+def disponivel():
+    return connection.vendor == 'sqlite'
+
+
+def _rowid(tipo, objeto_id):
+    return objeto_id * len(TIPOS) + TIPOS[tipo][0]
+
+
+def _textos(tipo, instance):
+    if tipo == 'aluno':
+        return instance.nome, f"{instance.email or ''} {instance.cpf or ''}"
+    if tipo == 'empresa':
+        return instance.nome, instance.cnpj or ''
+    return instance.nome, instance.descricao or ''
+
+
+def indexar(tipo, instance):
+    if not disponivel():
+        return
+    titulo, conteudo = _textos(tipo, instance)
+    rowid = _rowid(tipo, instance.pk)
+    with connection.cursor() as cursor:
+        cursor.execute(f"DELETE FROM {TABELA} WHERE rowid = %s", [rowid])
+        cursor.execute(
+            f"INSERT INTO {TABELA} (rowid, tipo, objeto_id, titulo, conteudo) VALUES (%s, %s, %s, %s, %s)",
+            [rowid, tipo, instance.pk, titulo, conteudo],
+        )
+
+
+def remover(tipo, *objeto_ids):
+    if not disponivel() or not objeto_ids:
+        return
+    rowids = [_rowid(tipo, objeto_id) for objeto_id in objeto_ids]
+    with connection.cursor() as cursor:
+        cursor.execute(f"DELETE FROM {TABELA} WHERE rowid IN ({', '.join(['%s'] * len(rowids))})", rowids)
+
+
+def reindexar_tipo(tipo, ids=None):
+    """
+    Regrava no índice os registros de um tipo (todos, ou só `ids`) com um
+    único INSERT ... SELECT. Usado pelo rebuild e pelas escritas em lote,
+    que não disparam signals.
+    """
+    if not disponivel():
+        return
+    codigo, origem, titulo, conteudo = TIPOS[tipo]
+    n = len(TIPOS)
+    filtro, params = '', []
+    if ids is not None:
+        ids = list(ids)
+        if not ids:
+            return
+        filtro = f" WHERE id IN ({', '.join(['%s'] * len(ids))})"
+        params = ids
+
+    with connection.cursor() as cursor:
+        cursor.execute(
+            f"DELETE FROM {TABELA} WHERE rowid IN (SELECT id * {n} + {codigo} FROM {origem}{filtro})",
+            params,
+        )
+        cursor.execute(
+            f"INSERT INTO {TABELA} (rowid, tipo, objeto_id, titulo, conteudo) "
+            f"SELECT id * {n} + {codigo}, '{tipo}', id, {titulo}, {conteudo} FROM {origem}{filtro}",
+            params,
+        )
+
+
+def reconstruir_indice():
+    if not disponivel():
+        return
+    with connection.cursor() as cursor:
+        cursor.execute(f"DELETE FROM {TABELA}")
+    for tipo in TIPOS:
+        reindexar_tipo(tipo)
+    with connection.cursor() as cursor:
+        cursor.execute(f"INSERT INTO {TABELA} ({TABELA}) VALUES ('optimize')")
+
+
+def _montar_consulta(q):
+    # Cada termo vira uma frase com prefixo ("termo"*); aspas são escapadas
+    # para que a entrada do usuário nunca seja lida como sintaxe do FTS5.
+    termos = [t.replace('"', '""') for t in q.split()]
+    return ' '.join(f'"{t}"*' for t in termos if t)
+
+
+def buscar(q, tipos=None, limite=LIMITE):
+    consulta = _montar_consulta(q)
+    if not consulta or not disponivel():
+        return []
+
+    filtro, params = '', [consulta]
+    if tipos:
+        filtro = f" AND tipo IN ({', '.join(['%s'] * len(tipos))})"
+        params += list(tipos)
+    params.append(limite)
+
+    with connection.cursor() as cursor:
+        cursor.execute(
+            f"SELECT tipo, objeto_id, titulo, conteudo, bm25({TABELA}, 0, 0, 10.0, 1.0) AS rank "
+            f"FROM {TABELA} WHERE {TABELA} MATCH %s{filtro} ORDER BY rank LIMIT %s",
+            params,
+        )
+        return [
+            {"tipo": tipo, "id": objeto_id, "titulo": titulo, "detalhe": conteudo, "rank": rank}
+            for tipo, objeto_id, titulo, conteudo, rank in cursor.fetchall()
+        ]
@@ -1,7 +1,114 @@
+from django.urls import reverse
 from rest_framework import serializers
+from rest_framework.validators import UniqueValidator
 from cadastro.models import *
+from cadastro.catalogo import CURSOS, EMPRESAS
+from cadastro.validators import normalizar_email
+
+
+class ExpandirMixin:
+    """
+    Suporte a `?expand=nome,...` e `?fields=campo,...` nas views do cadastro.
+
+    Cada serializer declara em `expansoes()` as relações que podem vir
+    aninhadas como {nome: (source, serializer, many)}. A view chama
+    `ler_contexto` uma vez, passa o resultado para `otimizar_queryset`
+    (select_related/prefetch_related e `.only()` com as colunas pedidas)
+    e usa o mesmo dicionário como context do serializer.
+    """
+
+    @classmethod
+    def expansoes(cls):
+        return {}
+
+    @classmethod
+    def _ler_lista(cls, params, nome, validos):
+        valores = [valor for valor in params.get(nome, '').split(',') if valor]
+        invalidos = [valor for valor in valores if valor not in validos]
+        if invalidos:
+            raise serializers.ValidationError({nome: f"Valor inválido: {', '.join(invalidos)}."})
+        return valores
+
+    @classmethod
+    def ler_contexto(cls, params):
+        expansoes = cls.expansoes()
+        expand = cls._ler_lista(params, 'expand', expansoes)
+        fields = cls._ler_lista(params, 'fields', cls.Meta.fields)
+
+        colunas = None
+        if fields:
+            # Além dos campos pedidos, o SQL precisa da pk, das FKs usadas no
+            # select_related e da chave de ordenação do cursor (`?ordering=`).
+            colunas = set(fields) | {'id'}
+            colunas |= {expansoes[nome][0] for nome in expand if not expansoes[nome][2]}
+            ordering = params.get('ordering', '').lstrip('-')
+            if ordering in cls.Meta.fields:
+                colunas.add(ordering)
+
+        return {'expand': expand, 'fields': fields, 'colunas': colunas}
+
+    @classmethod
+    def otimizar_queryset(cls, queryset, contexto):
+        expansoes = cls.expansoes()
+        for nome in contexto['expand']:
+            source, _, many = expansoes[nome]
+            queryset = queryset.prefetch_related(source) if many else queryset.select_related(source)
+        if contexto['colunas']:
+            queryset = queryset.only(*contexto['colunas'])
+        return queryset
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        fields = self.context.get('fields')
+        if fields:
+            for nome in set(self.fields) - set(fields):
+                self.fields.pop(nome)
+
+        expansoes = self.expansoes()
+        for nome in self.context.get('expand', ()):
+            source, serializer_class, many = expansoes[nome]
+            self.fields[nome] = serializer_class(source=source, many=many, read_only=True)
+
+
+class CatalogoRelatedField(serializers.PrimaryKeyRelatedField):
+    """
+    FK para Curso/Empresa resolvida pelo cache do catálogo em vez de uma
+    consulta por validação.
+    """
+
+    def __init__(self, catalogo, **kwargs):
+        self.catalogo = catalogo
+        kwargs.setdefault('queryset', catalogo.model.objects.all())
+        super().__init__(**kwargs)
+
+    def to_internal_value(self, data):
+        if isinstance(data, bool):
+            self.fail('incorrect_type', data_type=type(data).__name__)
+        try:
+            pk = int(data)
+        except (TypeError, ValueError):
+            self.fail('incorrect_type', data_type=type(data).__name__)
+
+        objeto = self.catalogo.get(pk)
+        if objeto is None:
+            self.fail('does_not_exist', pk_value=data)
+        return objeto
+
+
+class EmailNormalizadoField(serializers.CharField):
+    """Email em minúsculas (validators.normalizar_email) antes dos validators."""
+
+    def to_internal_value(self, data):
+        return normalizar_email(super().to_internal_value(data))
+
+
+class AlunoSerializer(ExpandirMixin, serializers.ModelSerializer):
+    empresa_id = CatalogoRelatedField(EMPRESAS, required=False, allow_null=True)
+    email = EmailNormalizadoField(
+        max_length=Aluno._meta.get_field('email').max_length,
+        validators=[UniqueValidator(Aluno.objects.all(), message="Já existe um aluno com este email.", lookup='iexact')],
+    )
 
-class AlunoSerializer(serializers.ModelSerializer):
     class Meta:
         model = Aluno
         fields = [
@@ -16,7 +123,11 @@ class AlunoSerializer(serializers.ModelSerializer):
         ]
         read_only_fields = ['id', 'created_at']
 
-class CursoSerializer(serializers.ModelSerializer):
+    @classmethod
+    def expansoes(cls):
+        return {'empresa': ('empresa_id', EmpresaSerializer, False)}
+
+class CursoSerializer(ExpandirMixin, serializers.ModelSerializer):
     class Meta:
         model = Curso
         fields = [
@@ -29,7 +140,11 @@ class CursoSerializer(serializers.ModelSerializer):
         ]
         read_only_fields = ['id', 'created_at']
 
-class EmpresaSerializer(serializers.ModelSerializer):
+    @classmethod
+    def expansoes(cls):
+        return {'turmas': ('turma_set', TurmaSerializer, True)}
+
+class EmpresaSerializer(ExpandirMixin, serializers.ModelSerializer):
     class Meta:
         model = Empresa
         fields = [
@@ -42,7 +157,13 @@ class EmpresaSerializer(serializers.ModelSerializer):
         ]
         read_only_fields = ['id']
 
-class TurmaSerializer(serializers.ModelSerializer):
+    @classmethod
+    def expansoes(cls):
+        return {'alunos': ('aluno_set', AlunoSerializer, True)}
+
+class TurmaSerializer(ExpandirMixin, serializers.ModelSerializer):
+    curso_id = CatalogoRelatedField(CURSOS)
+
     class Meta:
         model = Turma
         fields = [
@@ -53,4 +174,75 @@ class TurmaSerializer(serializers.ModelSerializer):
             'data_fim', 
             'created_at'
         ]
-        read_only_fields = ['id', 'created_at']
\ No newline at end of file
+        read_only_fields = ['id', 'created_at']
+
+    @classmethod
+    def expansoes(cls):
+        return {
+            'curso': ('curso_id', CursoSerializer, False),
+            'aulas': ('aula_set', AulaSerializer, True),
+        }
+
+    def validate(self, attrs):
+        inicio = attrs.get('data_inicio', getattr(self.instance, 'data_inicio', None))
+        fim = attrs.get('data_fim', getattr(self.instance, 'data_fim', None))
+        if inicio and fim and fim < inicio:
+            raise serializers.ValidationError({'data_fim': "A data de fim deve ser posterior à data de início."})
+        return attrs
+
+class AulaSerializer(serializers.ModelSerializer):
+    qr_code_url = serializers.SerializerMethodField()
+
+    class Meta:
+        model = Aula
+        fields = [
+            'id',
+            'turma_id',
+            'data',
+            'qr_code_path',
+            'qr_code_url'
+        ]
+        read_only_fields = ['id', 'qr_code_path']
+
+    def get_qr_code_url(self, aula):
+        if not aula.qr_code_path:
+            return None
+        chave = aula.qr_code_path.rsplit('/', 1)[-1].removesuffix('.png')
+        return reverse('qrcodes-detail', args=[chave])
+
+class FrequenciaSerializer(serializers.ModelSerializer):
+    class Meta:
+        model = Frequencia
+        fields = [
+            'id',
+            'aula_id',
+            'matricula_id',
+            'presente',
+            'observacao'
+        ]
+        read_only_fields = ['id']
+
+class ResumoFrequenciaSerializer(serializers.ModelSerializer):
+    aluno_id = serializers.IntegerField(source='matricula_id.aluno_id_id', read_only=True)
+    aluno_nome = serializers.CharField(source='matricula_id.aluno_id.nome', read_only=True)
+
+    class Meta:
+        model = ResumoFrequencia
+        fields = [
+            'matricula_id',
+            'aluno_id',
+            'aluno_nome',
+            'presencas',
+            'total_aulas',
+            'percentual',
+            'atualizado_em'
+        ]
+
+class MarcarFrequenciaSerializer(serializers.Serializer):
+    matricula_id = serializers.IntegerField()
+    presente = serializers.BooleanField()
+    observacao = serializers.CharField(required=False, allow_blank=True, allow_null=True)
+
+class CheckinSerializer(serializers.Serializer):
+    token = serializers.CharField()
+    matricula_id = serializers.IntegerField()
@@ -0,0 +1,85 @@
+from contextlib import contextmanager
+from contextvars import ContextVar
+from django.db import transaction
+from django.db.models.signals import post_save, post_delete
+from django.dispatch import receiver
+from cadastro.models import *
+from cadastro import resumo, search, versions
+from cadastro.catalogo import CATALOGOS
+
+TIPOS_BUSCA = {Aluno: 'aluno', Empresa: 'empresa', Curso: 'curso'}
+
+_em_lote = ContextVar('cadastro_em_lote', default=False)
+
+
+@contextmanager
+def em_lote():
+    """
+    Exclusões em lote (cadastro.bulk) sincronizam busca, versão e catálogo
+    uma vez para o lote inteiro; enquanto isso os receivers por objeto
+    abaixo não fazem nada.
+    """
+    token = _em_lote.set(True)
+    try:
+        yield
+    finally:
+        _em_lote.reset(token)
+
+
+@receiver(post_save, sender=Aluno)
+@receiver(post_save, sender=Empresa)
+@receiver(post_save, sender=Curso)
+def indexar_busca(sender, instance, **kwargs):
+    search.indexar(TIPOS_BUSCA[sender], instance)
+
+
+@receiver(post_delete, sender=Aluno)
+@receiver(post_delete, sender=Empresa)
+@receiver(post_delete, sender=Curso)
+def remover_busca(sender, instance, **kwargs):
+    if _em_lote.get():
+        return
+    search.remover(TIPOS_BUSCA[sender], instance.pk)
+
+
+@receiver(post_save)
+@receiver(post_delete)
+def tocar_versao(sender, **kwargs):
+    if _em_lote.get():
+        return
+    if sender._meta.app_label == 'cadastro' and sender is not VersaoTabela:
+        versions.tocar(sender)
+
+
+@receiver(post_save, sender=Curso)
+@receiver(post_save, sender=Empresa)
+@receiver(post_delete, sender=Curso)
+@receiver(post_delete, sender=Empresa)
+def invalidar_catalogo(sender, **kwargs):
+    if _em_lote.get():
+        return
+    CATALOGOS[sender].invalidar()
+
+
+# Escritas avulsas (admin, shell); os caminhos em lote chamam
+# cadastro.resumo diretamente. O recálculo fica para o commit porque, numa
+# exclusão em cascata, a matrícula ainda existe quando estes sinais disparam.
+@receiver(post_save, sender=Frequencia)
+@receiver(post_delete, sender=Frequencia)
+def atualizar_resumo_frequencia(sender, instance, **kwargs):
+    matricula_id = instance.matricula_id_id
+    transaction.on_commit(lambda: resumo.atualizar([matricula_id]))
+
+
+@receiver(post_save, sender=Matricula)
+def criar_resumo_matricula(sender, instance, created, **kwargs):
+    if created:
+        transaction.on_commit(lambda: resumo.atualizar([instance.pk]))
+
+
+@receiver(post_save, sender=Aula)
+@receiver(post_delete, sender=Aula)
+def atualizar_resumo_turma(sender, instance, created=True, **kwargs):
+    turma_id = instance.turma_id_id
+    if created and turma_id:
+        transaction.on_commit(lambda: resumo.atualizar_turma(turma_id))
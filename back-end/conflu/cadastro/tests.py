@@ -1,3 +1,932 @@
-from django.test import TestCase
+import csv
+import json
+import tempfile
+import threading
+import time
+import warnings
+from concurrent.futures import ThreadPoolExecutor
+from datetime import timedelta
+from decimal import Decimal
+from unittest import mock
+from django.core import signing
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.core.management import call_command
+from django.db import connection, transaction
+from django.db.migrations.recorder import MigrationRecorder
+from django.test import RequestFactory, SimpleTestCase, TestCase, TransactionTestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+from rest_framework.response import Response
+from cadastro import checkin, dashboard, export, financeiro, frequencia, qrcodes, replica, resumo, search
+from cadastro.management.commands import serve
+from cadastro.models import *
 
-# Create your tests here.
+# Sem réplica nem QR codes no diretório do projeto durante os testes
+TESTES = override_settings(REPLICA_PATH='/nao/existe/replica.sqlite3', QRCODE_DIR=tempfile.mkdtemp())
+
+
+def criar_turma(alunos=2, data=None, prefixo='aluno'):
+    data = data or timezone.localdate()
+    curso = Curso.objects.create(nome='Curso', valor=100, quant_dias=1)
+    turma = Turma.objects.create(curso_id=curso, localidade='Sala 1', data_inicio=data, data_fim=data + timedelta(days=1))
+    aula = Aula.objects.create(turma_id=turma, data=data)
+    matriculas = [
+        Matricula.objects.create(
+            aluno_id=Aluno.objects.create(nome=f'Aluno {i}', email=f'{prefixo}{i}@teste'),
+            turma_id=turma, fonte='teste', data_matricula=data,
+        )
+        for i in range(alunos)
+    ]
+    return turma, aula, matriculas
+
+
+@TESTES
+class TokenCheckinTests(TestCase):
+
+    def setUp(self):
+        self.turma, self.aula, self.matriculas = criar_turma()
+        # Cache novo por teste: os ids se repetem entre testes
+        cache = mock.patch.object(checkin, 'matriculas', checkin.MatriculasPorTurma())
+        cache.start()
+        self.addCleanup(cache.stop)
+
+    def test_token_ida_e_volta(self):
+        token = checkin.token_aula(self.aula)
+        self.assertEqual(checkin.ler_token(token), (self.aula.pk, self.turma.pk, self.aula.data.isoformat()))
+
+    def test_token_adulterado(self):
+        token = checkin.token_aula(self.aula)
+        with self.assertRaises(signing.BadSignature):
+            checkin.ler_token(token[:-1] + ('A' if token[-1] != 'A' else 'B'))
+
+    def test_registrar(self):
+        token = checkin.token_aula(self.aula)
+        with mock.patch.object(checkin.fila, 'adicionar') as adicionar:
+            self.assertIsNone(checkin.registrar(token, self.matriculas[0].pk))
+            adicionar.assert_called_once_with(self.aula.pk, self.matriculas[0].pk)
+
+            self.assertEqual(checkin.registrar('lixo', self.matriculas[0].pk), "QR code inválido.")
+            self.assertEqual(checkin.registrar(token, 999999), "Matrícula não pertence à turma desta aula.")
+
+            ontem = Aula.objects.create(turma_id=self.turma, data=self.aula.data - timedelta(days=1))
+            amanha = Aula.objects.create(turma_id=self.turma, data=self.aula.data + timedelta(days=1))
+            for aula in (ontem, amanha):
+                self.assertEqual(checkin.registrar(checkin.token_aula(aula), self.matriculas[0].pk), "Este QR code não é da aula de hoje.")
+            adicionar.assert_called_once()
+
+    def test_recusa_fica_em_cache(self):
+        token = checkin.token_aula(self.aula)
+        outra = criar_turma(alunos=1, prefixo='outro')[2][0]
+        with mock.patch.object(checkin.fila, 'adicionar') as adicionar:
+            for matricula_id in (outra.pk, 999999):
+                self.assertEqual(checkin.registrar(token, matricula_id), "Matrícula não pertence à turma desta aula.")
+            with self.assertNumQueries(0):
+                for matricula_id in (outra.pk, 999999):
+                    self.assertEqual(checkin.registrar(token, matricula_id), "Matrícula não pertence à turma desta aula.")
+            adicionar.assert_not_called()
+
+            # Matrícula movida para a turma: vale quando a turma é recarregada
+            Matricula.objects.filter(pk=outra.pk).update(turma_id=self.turma)
+            with mock.patch('time.monotonic', return_value=time.monotonic() + checkin.CACHE_MATRICULAS + 1):
+                self.assertIsNone(checkin.registrar(token, self.matriculas[0].pk))
+                self.assertIsNone(checkin.registrar(token, outra.pk))
+
+    def test_recusas_de_outro_dia_sao_descartadas(self):
+        cache = checkin.MatriculasPorTurma()
+        self.assertFalse(cache.contem(self.turma.pk, 999999, '2024-01-01'))
+        self.assertFalse(cache.contem(self.turma.pk, 999998, '2024-01-02'))
+        self.assertEqual(cache._recusas, {(self.turma.pk, 999998)})
+
+    def test_endpoint(self):
+        token = checkin.token_aula(self.aula)
+        with mock.patch.object(checkin.fila, 'adicionar'):
+            resposta = self.client.post('/api/checkin/', {'token': token, 'matricula_id': self.matriculas[0].pk}, content_type='application/json')
+            self.assertEqual(resposta.status_code, 202)
+            resposta = self.client.post('/api/checkin/', {'token': 'lixo', 'matricula_id': self.matriculas[0].pk}, content_type='application/json')
+            self.assertEqual(resposta.status_code, 400)
+
+    def test_endpoint_aceito_grava_no_esvaziar(self):
+        fila = checkin.FilaCheckin()
+        # Sem a thread de gravação: o esvaziar roda aqui, na transação do teste
+        with mock.patch.object(checkin, 'fila', fila), mock.patch.object(fila, '_loop'):
+            resposta = self.client.post('/api/checkin/', {'token': checkin.token_aula(self.aula), 'matricula_id': self.matriculas[0].pk}, content_type='application/json')
+        self.assertEqual(resposta.status_code, 202)
+        self.assertEqual(resposta.json(), {"message": "Presença registrada!"})
+        self.assertFalse(Frequencia.objects.exists())
+
+        self.assertEqual(fila.esvaziar(), 1)
+        self.assertTrue(Frequencia.objects.filter(aula_id=self.aula, matricula_id=self.matriculas[0], presente=True).exists())
+
+    def test_endpoint_token_de_outro_dia(self):
+        ontem = Aula.objects.create(turma_id=self.turma, data=self.aula.data - timedelta(days=1))
+        with mock.patch.object(checkin.fila, 'adicionar') as adicionar:
+            resposta = self.client.post('/api/checkin/', {'token': checkin.token_aula(ontem), 'matricula_id': self.matriculas[0].pk}, content_type='application/json')
+        self.assertEqual(resposta.status_code, 400)
+        self.assertEqual(resposta.json(), {"error": "Este QR code não é da aula de hoje."})
+        adicionar.assert_not_called()
+
+
+# Transacional: a FK do SQLite só é verificada no commit, que TestCase nunca faz
+@TESTES
+class FilaCheckinTests(TransactionTestCase):
+
+    def setUp(self):
+        self.turma, self.aula, self.matriculas = criar_turma()
+        self.fila = checkin.FilaCheckin()
+
+    def test_esvaziar_grava_presencas(self):
+        for matricula in self.matriculas:
+            self.fila.adicionar(self.aula.pk, matricula.pk)
+        self.assertEqual(self.fila.esvaziar(), 2)
+        self.assertEqual(Frequencia.objects.filter(aula_id=self.aula, presente=True).count(), 2)
+        self.assertEqual(ResumoFrequencia.objects.get(pk=self.matriculas[0].pk).presencas, 1)
+
+    def test_par_excluido_nao_trava_a_fila(self):
+        self.fila.adicionar(self.aula.pk, self.matriculas[0].pk)
+        self.fila.adicionar(self.aula.pk, 999999)
+
+        with self.assertLogs('cadastro.checkin', level='WARNING'):
+            self.assertEqual(self.fila.esvaziar(), 0)
+        self.assertEqual(self.fila._pendentes, {(self.aula.pk, self.matriculas[0].pk)})
+
+        self.assertEqual(self.fila.esvaziar(), 1)
+        self.assertTrue(Frequencia.objects.filter(aula_id=self.aula, matricula_id=self.matriculas[0]).exists())
+        self.assertEqual(self.fila._pendentes, set())
+        self.assertEqual(self.fila._falhas, {})
+
+    def test_falha_reenfileira(self):
+        self.fila.adicionar(self.aula.pk, self.matriculas[0].pk)
+        with mock.patch('cadastro.frequencia.registrar_presencas', side_effect=RuntimeError('falha')), \
+                self.assertLogs('cadastro.checkin', level='ERROR'):
+            self.assertEqual(self.fila.esvaziar(), 0)
+        self.assertEqual(self.fila._pendentes, {(self.aula.pk, self.matriculas[0].pk)})
+        self.assertEqual(self.fila._falhas, {(self.aula.pk, self.matriculas[0].pk): 1})
+
+        self.assertEqual(self.fila.esvaziar(), 1)
+        self.assertTrue(Frequencia.objects.filter(aula_id=self.aula, matricula_id=self.matriculas[0]).exists())
+        self.assertEqual(self.fila._falhas, {})
+
+    def test_desiste_depois_de_max_tentativas(self):
+        self.fila.adicionar(self.aula.pk, self.matriculas[0].pk)
+        with mock.patch('cadastro.frequencia.registrar_presencas', side_effect=RuntimeError('falha')), \
+                self.assertLogs('cadastro.checkin', level='ERROR') as logs:
+            for _ in range(checkin.MAX_TENTATIVAS):
+                self.assertEqual(self.fila.esvaziar(), 0)
+        self.assertEqual(self.fila._pendentes, set())
+        self.assertEqual(self.fila._falhas, {})
+        self.assertIn('após', logs.output[-1])
+
+
+@TESTES
+class CriarTurmaTests(TestCase):
+    url = '/api/turmas/'
+
+    def setUp(self):
+        self.curso = Curso.objects.create(nome='Curso', valor=100, quant_dias=3)
+
+    def criar(self, inicio, fim):
+        # 2024-01-05 é uma sexta-feira
+        return self.client.post(self.url, {
+            'curso_id': self.curso.pk, 'localidade': 'Sala 1', 'data_inicio': inicio, 'data_fim': fim,
+        }, content_type='application/json')
+
+    def test_cronograma_pula_fim_de_semana(self):
+        resposta = self.criar('2024-01-05', '2024-01-12')
+        self.assertEqual(resposta.status_code, 201)
+        datas = [aula['data'] for aula in resposta.json()['data']['aulas']]
+        self.assertEqual(datas, ['2024-01-05', '2024-01-08', '2024-01-09'])
+        turma = Turma.objects.get()
+        self.assertEqual(
+            [str(d) for d in Aula.objects.filter(turma_id=turma).order_by('data').values_list('data', flat=True)], datas
+        )
+        self.assertTrue(all(aula['qr_code_path'] for aula in resposta.json()['data']['aulas']))
+
+    def test_periodo_com_dias_uteis_insuficientes(self):
+        resposta = self.criar('2024-01-05', '2024-01-08')
+        self.assertEqual(resposta.status_code, 400)
+        self.assertEqual(resposta.json()['error'], "O período tem 2 dia(s) útil(eis), mas o curso exige 3 aula(s).")
+        self.assertFalse(Turma.objects.exists())
+
+    def test_fim_antes_do_inicio(self):
+        resposta = self.criar('2024-01-12', '2024-01-05')
+        self.assertEqual(resposta.status_code, 400)
+        self.assertIn('data_fim', resposta.json())
+        self.assertFalse(Turma.objects.exists())
+
+    def test_falha_nos_qrcodes_nao_desfaz_a_turma(self):
+        with mock.patch('cadastro.qrcodes.gerar_qrcodes', side_effect=OSError('disco cheio')), \
+                self.assertLogs('cadastro.views', level='ERROR'):
+            resposta = self.criar('2024-01-05', '2024-01-12')
+        self.assertEqual(resposta.status_code, 201)
+        self.assertEqual([aula['qr_code_path'] for aula in resposta.json()['data']['aulas']], ['', '', ''])
+        self.assertEqual(Turma.objects.count(), 1)
+        self.assertEqual(Aula.objects.count(), 3)
+
+
+class QrCodeTests(TestCase):
+
+    def setUp(self):
+        pasta = tempfile.TemporaryDirectory()
+        self.addCleanup(pasta.cleanup)
+        configuracao = override_settings(QRCODE_DIR=pasta.name)
+        configuracao.enable()
+        self.addCleanup(configuracao.disable)
+
+    def test_gravacoes_simultaneas_da_mesma_chave(self):
+        chave = qrcodes.chave('payload')
+        with ThreadPoolExecutor(8) as executor:
+            list(executor.map(lambda i: qrcodes._salvar(chave, b'png' * 1000), range(32)))
+        destino = qrcodes.caminho(chave)
+        self.assertEqual(destino.read_bytes(), b'png' * 1000)
+        self.assertEqual(list(destino.parent.iterdir()), [destino])
+
+    def test_segunda_geracao_nao_renderiza_de_novo(self):
+        _, aula, _ = criar_turma(alunos=0)
+        self.assertEqual(qrcodes.gerar_qrcodes([aula]), 1)
+        aula.refresh_from_db()
+        self.assertTrue(qrcodes.diretorio().joinpath(aula.qr_code_path).exists())
+        with mock.patch.object(qrcodes, 'renderizar') as renderizar:
+            self.assertEqual(qrcodes.gerar_qrcodes([aula]), 0)
+        renderizar.assert_not_called()
+
+
+@TESTES
+class VersaoETagTests(TestCase):
+    url = '/api/alunos/'
+
+    def setUp(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            Aluno.objects.create(nome='Ana', email='ana@teste.com')
+
+    def versao(self, model=Aluno):
+        return VersaoTabela.objects.filter(tabela=model._meta.label_lower).values_list('versao', flat=True).first() or 0
+
+    def test_304_com_uma_consulta(self):
+        resposta = self.client.get(self.url)
+        self.assertEqual(resposta.status_code, 200)
+        with self.assertNumQueries(1):
+            resposta = self.client.get(self.url, HTTP_IF_NONE_MATCH=resposta['ETag'])
+        self.assertEqual(resposta.status_code, 304)
+        # Outra URL (filtros, ?fields=) tem outro ETag
+        self.assertNotEqual(self.client.get(self.url, {'fields': 'nome'})['ETag'], resposta['ETag'])
+
+    def test_escrita_muda_o_etag(self):
+        etag = self.client.get(self.url)['ETag']
+        with self.captureOnCommitCallbacks(execute=True):
+            resposta = self.client.post(self.url, {'nome': 'Bia', 'email': 'bia@teste.com'}, content_type='application/json')
+        self.assertEqual(resposta.status_code, 201)
+        resposta = self.client.get(self.url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(resposta.status_code, 200)
+        self.assertNotEqual(resposta['ETag'], etag)
+        self.assertEqual(len(resposta.json()['results']), 2)
+
+    def test_uma_versao_por_transacao(self):
+        versao = self.versao()
+        with self.captureOnCommitCallbacks(execute=True):
+            with transaction.atomic():
+                for i in range(5):
+                    Aluno.objects.create(nome=f'Aluno {i}', email=f'aluno{i}@teste.com')
+                # Nada é escrito em VersaoTabela antes do commit
+                self.assertEqual(self.versao(), versao)
+        self.assertEqual(self.versao(), versao + 1)
+
+    def test_rollback_nao_incrementa(self):
+        versao = self.versao()
+        with self.captureOnCommitCallbacks(execute=True):
+            with transaction.atomic():
+                try:
+                    with transaction.atomic():
+                        Aluno.objects.create(nome='Desfeito', email='desfeito@teste.com')
+                        raise RuntimeError
+                except RuntimeError:
+                    pass
+                self.assertEqual(self.versao(Empresa), 0)
+                Empresa.objects.create(nome='Acme')
+        self.assertEqual(self.versao(), versao)
+        self.assertEqual(self.versao(Empresa), 1)
+
+
+@TESTES
+class FrequenciaAulaTests(TestCase):
+
+    def setUp(self):
+        self.turma, self.aula, self.matriculas = criar_turma(alunos=3)
+        self.url = f'/api/aulas/{self.aula.pk}/frequencia/'
+
+    def marcar(self, marcacoes):
+        return self.client.post(self.url, marcacoes, content_type='application/json')
+
+    def test_reenvio_atualiza_sem_duplicar(self):
+        marcacoes = [{'matricula_id': m.pk, 'presente': True} for m in self.matriculas]
+        self.assertEqual(self.marcar(marcacoes).status_code, 200)
+
+        marcacoes[0] = {'matricula_id': self.matriculas[0].pk, 'presente': False, 'observacao': 'Atestado'}
+        self.assertEqual(self.marcar(marcacoes).status_code, 200)
+        self.assertEqual(self.marcar(marcacoes).status_code, 200)
+
+        registros = self.client.get(self.url).json()
+        self.assertEqual(len(registros), 3)
+        self.assertEqual(Frequencia.objects.count(), 3)
+        self.assertEqual((registros[0]['presente'], registros[0]['observacao']), (False, 'Atestado'))
+        self.assertTrue(all(registro['presente'] for registro in registros[1:]))
+        self.assertEqual(ResumoFrequencia.objects.get(pk=self.matriculas[1].pk).presencas, 1)
+
+    def test_matricula_de_outra_turma(self):
+        _, _, outras = criar_turma(alunos=1, prefixo='outro')
+        resposta = self.marcar([
+            {'matricula_id': self.matriculas[0].pk, 'presente': True},
+            {'matricula_id': outras[0].pk, 'presente': True},
+        ])
+        self.assertEqual(resposta.status_code, 400)
+        self.assertIn(str(outras[0].pk), resposta.json()['error'])
+        self.assertFalse(Frequencia.objects.exists())
+
+    def test_matricula_repetida(self):
+        resposta = self.marcar([{'matricula_id': self.matriculas[0].pk, 'presente': True}] * 2)
+        self.assertEqual(resposta.status_code, 400)
+        self.assertFalse(Frequencia.objects.exists())
+
+
+@TESTES
+class ResumoFrequenciaTests(TestCase):
+
+    def test_presenca_em_aula_sem_turma_nao_conta(self):
+        _, aula, matriculas = criar_turma(alunos=1)
+        avulsa = Aula.objects.create(data=aula.data)
+        frequencia.registrar_presencas([(aula.pk, matriculas[0].pk), (avulsa.pk, matriculas[0].pk)])
+
+        for _ in range(2):
+            linha = ResumoFrequencia.objects.get(pk=matriculas[0].pk)
+            self.assertEqual((linha.presencas, linha.total_aulas, linha.percentual), (1, 1, Decimal('100.00')))
+            resumo.reconstruir()
+
+
+@TESTES
+class FrequenciaTurmaETagTests(TestCase):
+
+    def setUp(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            self.turma, self.aula, self.matriculas = criar_turma()
+        self.url = f'/api/turmas/{self.turma.pk}/frequencia/'
+
+    def etag(self):
+        resposta = self.client.get(self.url)
+        self.assertEqual(resposta.status_code, 200)
+        self.assertEqual(self.client.get(self.url, HTTP_IF_NONE_MATCH=resposta['ETag']).status_code, 304)
+        return resposta['ETag']
+
+    def assertInvalidado(self, etag):
+        resposta = self.client.get(self.url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(resposta.status_code, 200)
+        return resposta.json()
+
+    def test_nova_matricula(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            aluno = Aluno.objects.create(nome='Zé Novo', email='novo@teste')
+        etag = self.etag()
+        with self.captureOnCommitCallbacks(execute=True):
+            Matricula.objects.create(aluno_id=aluno, turma_id=self.turma, fonte='teste', data_matricula=self.aula.data)
+        self.assertEqual(len(self.assertInvalidado(etag)), 3)
+
+    def test_frequencia_avulsa(self):
+        etag = self.etag()
+        with self.captureOnCommitCallbacks(execute=True):
+            Frequencia.objects.create(aula_id=self.aula, matricula_id=self.matriculas[0], presente=True)
+        dados = self.assertInvalidado(etag)
+        self.assertEqual(sum(item['presencas'] for item in dados), 1)
+
+        etag = self.etag()
+        with self.captureOnCommitCallbacks(execute=True):
+            Frequencia.objects.all().delete()
+        dados = self.assertInvalidado(etag)
+        self.assertEqual(sum(item['presencas'] for item in dados), 0)
+
+    def test_aula_nova_e_excluida(self):
+        etag = self.etag()
+        with self.captureOnCommitCallbacks(execute=True):
+            outra = Aula.objects.create(turma_id=self.turma, data=self.aula.data + timedelta(days=1))
+        self.assertTrue(all(item['total_aulas'] == 2 for item in self.assertInvalidado(etag)))
+
+        etag = self.etag()
+        with self.captureOnCommitCallbacks(execute=True):
+            outra.delete()
+        self.assertTrue(all(item['total_aulas'] == 1 for item in self.assertInvalidado(etag)))
+
+
+@TESTES
+class ListagemCursorTests(TestCase):
+    """Contrato usado por front-end/lib/api-client.ts (useInfiniteQuery)."""
+
+    def setUp(self):
+        for i in range(3):
+            Aluno.objects.create(nome=f'Aluno {i}', email=f'aluno{i}@teste.com')
+
+    def test_primeira_pagina_sem_cursor(self):
+        resposta = self.client.get('/api/alunos/', {'limit': 2})
+        self.assertEqual(resposta.status_code, 200)
+        pagina = resposta.json()
+        self.assertEqual(len(pagina['results']), 2)
+        self.assertIn('cursor=', pagina['next'])
+
+        seguinte = self.client.get(pagina['next'])
+        self.assertEqual(seguinte.status_code, 200)
+        self.assertEqual(len(seguinte.json()['results']), 1)
+        self.assertIsNone(seguinte.json()['next'])
+
+    def test_cursor_sem_valor_nao_e_enviado(self):
+        # O cliente omite parâmetros undefined; se mandasse o texto, a lista não carregaria
+        self.assertEqual(self.client.get('/api/alunos/', {'cursor': 'undefined'}).status_code, 404)
+        for recurso in ('alunos', 'cursos', 'empresas'):
+            self.assertEqual(self.client.get(f'/api/{recurso}/').status_code, 200, recurso)
+
+
+@TESTES
+class ExpandTests(TestCase):
+
+    def setUp(self):
+        empresas = [Empresa.objects.create(nome=f'Empresa {i}') for i in range(2)]
+        for i in range(6):
+            Aluno.objects.create(nome=f'Aluno {i}', email=f'aluno{i}@teste.com', empresa_id=empresas[i % 2])
+        curso = Curso.objects.create(nome='Curso', valor=100, quant_dias=1)
+        hoje = timezone.localdate()
+        for i in range(3):
+            Turma.objects.create(curso_id=curso, localidade=f'Sala {i}', data_inicio=hoje, data_fim=hoje)
+
+    def test_fk_expandida_no_mesmo_select(self):
+        # Versões (ETag) + a página com JOIN, independente do número de alunos
+        with self.assertNumQueries(2):
+            resposta = self.client.get('/api/alunos/', {'expand': 'empresa'})
+        alunos = resposta.json()['results']
+        self.assertEqual(len(alunos), 6)
+        self.assertTrue(all(aluno['empresa']['id'] == aluno['empresa_id'] for aluno in alunos))
+
+    def test_reverso_expandido_com_um_prefetch(self):
+        with self.assertNumQueries(3):
+            resposta = self.client.get('/api/cursos/', {'expand': 'turmas'})
+        self.assertEqual(len(resposta.json()['results'][0]['turmas']), 3)
+
+        with self.assertNumQueries(3):
+            resposta = self.client.get('/api/empresas/', {'expand': 'alunos'})
+        self.assertEqual(sorted(len(empresa['alunos']) for empresa in resposta.json()['results']), [3, 3])
+
+    def test_expansao_invalida(self):
+        resposta = self.client.get('/api/alunos/', {'expand': 'turmas'})
+        self.assertEqual(resposta.status_code, 400)
+        self.assertIn('expand', resposta.json())
+
+
+@TESTES
+class FieldsTests(TestCase):
+
+    def setUp(self):
+        self.empresa = Empresa.objects.create(nome='Acme')
+        for i in range(3):
+            Aluno.objects.create(nome=f'Aluno {i}', email=f'aluno{i}@teste.com', empresa_id=self.empresa)
+
+    def colunas(self, params):
+        with CaptureQueriesContext(connection) as consultas:
+            resposta = self.client.get('/api/alunos/', params)
+        self.assertEqual(resposta.status_code, 200)
+        sql = next(c['sql'] for c in consultas.captured_queries if 'FROM "cadastro_aluno"' in c['sql'])
+        selecionadas = sql.split(' FROM ')[0]
+        return resposta.json(), {
+            campo.column for campo in Aluno._meta.concrete_fields if f'"cadastro_aluno"."{campo.column}"' in selecionadas
+        }
+
+    def test_so_as_colunas_pedidas(self):
+        pagina, colunas = self.colunas({'fields': 'nome,email'})
+        self.assertEqual(colunas, {'id', 'nome', 'email'})
+        self.assertTrue(all(set(aluno) == {'nome', 'email'} for aluno in pagina['results']))
+
+    def test_chave_do_cursor_sempre_selecionada(self):
+        pagina, colunas = self.colunas({'fields': 'nome', 'ordering': '-email', 'limit': 2})
+        self.assertEqual(colunas, {'id', 'nome', 'email'})
+        self.assertEqual(pagina['results'], [{'nome': 'Aluno 2'}, {'nome': 'Aluno 1'}])
+        # O cursor da próxima página é montado a partir do email
+        seguinte = self.client.get(pagina['next']).json()
+        self.assertEqual(seguinte['results'], [{'nome': 'Aluno 0'}])
+
+    def test_fk_expandida_entra_nas_colunas(self):
+        pagina, colunas = self.colunas({'fields': 'nome', 'expand': 'empresa'})
+        self.assertEqual(colunas, {'id', 'nome', 'empresa_id_id'})
+        self.assertEqual(pagina['results'][0]['empresa']['nome'], 'Acme')
+
+    def test_campo_invalido(self):
+        resposta = self.client.get('/api/alunos/', {'fields': 'nome,senha'})
+        self.assertEqual(resposta.status_code, 400)
+        self.assertIn('fields', resposta.json())
+
+
+@TESTES
+class ExportTests(TestCase):
+
+    def setUp(self):
+        self.empresa = Empresa.objects.create(nome='Acme', cnpj='12345678000199')
+        self.alunos = [
+            Aluno.objects.create(nome='José, o "Zé"', email='jose@teste.com', empresa_id=self.empresa),
+            Aluno.objects.create(nome='Ana', email='ana@teste.com'),
+        ]
+
+    def test_ndjson_wsgi(self):
+        resposta = self.client.get('/api/export/alunos/')
+        self.assertEqual(resposta.status_code, 200)
+        self.assertTrue(resposta.streaming)
+        self.assertFalse(resposta.is_async)
+        self.assertEqual(resposta['Content-Type'], 'application/x-ndjson')
+        linhas = [json.loads(linha) for linha in b''.join(resposta.streaming_content).decode().splitlines()]
+        self.assertEqual([linha['id'] for linha in linhas], [aluno.pk for aluno in self.alunos])
+        self.assertEqual(linhas[0]['nome'], 'José, o "Zé"')
+        self.assertEqual(linhas[0]['empresa_id'], self.empresa.pk)
+        self.assertIsNone(linhas[1]['empresa_id'])
+
+    async def test_csv_asgi_transmite_aos_poucos(self):
+        # Um iterador síncrono sob ASGI seria lido inteiro antes do envio, com aviso
+        with warnings.catch_warnings(), mock.patch.object(export, 'CHUNK_SIZE', 1):
+            warnings.simplefilter('error')
+            resposta = await self.async_client.get('/api/export/alunos/', {'formato': 'csv'})
+            self.assertEqual(resposta.status_code, 200)
+            self.assertTrue(resposta.is_async)
+            partes = [parte async for parte in resposta.streaming_content]
+        # Cabeçalho e um lote por vez, não o arquivo num bloco só
+        self.assertEqual(len(partes), 3)
+        linhas = list(csv.reader(b''.join(partes).decode().splitlines()))
+        self.assertEqual(linhas[0], export.TABELAS['alunos'][1])
+        self.assertEqual(linhas[1][:2], [str(self.alunos[0].pk), 'José, o "Zé"'])
+        self.assertEqual(resposta['Content-Disposition'], 'attachment; filename="alunos.csv"')
+
+    def test_tabela_e_formato_invalidos(self):
+        self.assertEqual(self.client.get('/api/export/turmas/').status_code, 404)
+        self.assertEqual(self.client.get('/api/export/alunos/', {'formato': 'xml'}).status_code, 400)
+
+
+@TESTES
+class ImportacaoTests(TestCase):
+    url = '/api/alunos/importar/'
+
+    def importar(self, nome, conteudo):
+        return self.client.post(self.url, {'arquivo': SimpleUploadedFile(nome, conteudo)})
+
+    def test_csv_utf8(self):
+        resposta = self.importar('alunos.csv', 'nome;email\nJosé;jose@teste.com\n'.encode())
+        self.assertEqual(resposta.status_code, 200)
+        self.assertEqual(Aluno.objects.get(email='jose@teste.com').nome, 'José')
+
+    def test_csv_cp1252(self):
+        resposta = self.importar('alunos.csv', 'nome;email\nJoão Conceição;joao@teste.com\n'.encode('cp1252'))
+        self.assertEqual(resposta.status_code, 200)
+        self.assertEqual(Aluno.objects.get(email='joao@teste.com').nome, 'João Conceição')
+
+    def test_arquivos_ilegiveis(self):
+        # 0x81 não existe em UTF-8 nem em cp1252
+        resposta = self.importar('alunos.csv', b'nome;email\nJo\x81o;joao@teste.com\n')
+        self.assertEqual(resposta.status_code, 400)
+        resposta = self.importar('alunos.xlsx', b'isto nao e um zip')
+        self.assertEqual(resposta.status_code, 400)
+        self.assertFalse(Aluno.objects.exists())
+
+    def test_email_existente_sem_diferenca_de_maiusculas(self):
+        Aluno.objects.create(nome='Ana', email='Ana.Silva@Teste.com')
+        resposta = self.importar('alunos.csv', b'nome,email\nAna,ana.silva@teste.com\nAna,ANA.SILVA@TESTE.COM\n')
+        self.assertEqual(resposta.status_code, 200)
+        self.assertEqual(resposta.json()['data']['importados'], 0)
+        erros = resposta.json()['data']['erros']
+        self.assertEqual([erro['erro'] for erro in erros], ["Email já cadastrado: ana.silva@teste.com."] * 2)
+        self.assertEqual(Aluno.objects.count(), 1)
+
+    def test_tamanhos_por_linha(self):
+        conteudo = 'nome;email;telefone\n{};longo@teste.com;\nAna;{}@teste.com;\nBia;bia@teste.com;{}\nCaio;caio@teste.com;\n'.format(
+            'N' * 101, 'e' * 70, '9' * 16,
+        )
+        resposta = self.importar('alunos.csv', conteudo.encode())
+        self.assertEqual(resposta.status_code, 200)
+        dados = resposta.json()['data']
+        self.assertEqual(dados['importados'], 1)
+        self.assertEqual([(erro['linha'], erro['erro']) for erro in dados['erros']], [
+            (2, "Coluna nome com mais de 100 caracteres."),
+            (3, "Coluna email com mais de 70 caracteres."),
+            (4, "Coluna telefone com mais de 15 caracteres."),
+        ])
+        self.assertEqual(list(Aluno.objects.values_list('email', flat=True)), ['caio@teste.com'])
+
+
+@TESTES
+class EmailNormalizadoTests(TestCase):
+
+    def test_cadastro_avulso_em_minusculas(self):
+        resposta = self.client.post('/api/alunos/', {'nome': 'Ana', 'email': ' Ana.Silva@Teste.COM '}, content_type='application/json')
+        self.assertEqual(resposta.status_code, 201)
+        self.assertEqual(resposta.json()['data']['email'], 'ana.silva@teste.com')
+
+        resposta = self.client.post('/api/alunos/', {'nome': 'Ana 2', 'email': 'ANA.SILVA@teste.com'}, content_type='application/json')
+        self.assertEqual(resposta.status_code, 400)
+        self.assertEqual(resposta.json()['email'], ["Já existe um aluno com este email."])
+
+        outro = Aluno.objects.create(nome='Bia', email='bia@teste.com')
+        resposta = self.client.patch(f'/api/alunos/{outro.pk}/', {'email': 'Ana.Silva@teste.com'}, content_type='application/json')
+        self.assertEqual(resposta.status_code, 400)
+
+    def test_cadastro_antigo_com_maiusculas(self):
+        # Registros gravados antes da normalização também contam
+        Aluno.objects.create(nome='Ana', email='Ana.Silva@Teste.com')
+        resposta = self.client.post('/api/alunos/', {'nome': 'Ana', 'email': 'ana.silva@teste.com'}, content_type='application/json')
+        self.assertEqual(resposta.status_code, 400)
+
+    def test_lote(self):
+        Aluno.objects.create(nome='Ana', email='ana@teste.com')
+        resposta = self.client.post('/api/alunos/bulk/', [
+            {'nome': 'Ana', 'email': 'ANA@teste.com'},
+            {'nome': 'Bia', 'email': 'Bia@Teste.com'},
+            {'nome': 'Bia 2', 'email': 'bia@teste.com'},
+        ], content_type='application/json')
+        self.assertEqual(resposta.status_code, 400)
+        erros = resposta.json()
+        self.assertIn('email', erros[0])
+        self.assertEqual(erros[1], {})
+        self.assertIn('email', erros[2])
+
+        resposta = self.client.post('/api/alunos/bulk/', [{'nome': 'Bia', 'email': 'Bia@Teste.com'}], content_type='application/json')
+        self.assertEqual(resposta.status_code, 201)
+        self.assertTrue(Aluno.objects.filter(email='bia@teste.com').exists())
+
+
+@TESTES
+class BuscaTests(TestCase):
+
+    def setUp(self):
+        for i in range(3):
+            Aluno.objects.create(nome=f'Maria {i}', email=f'maria{i}@teste.com')
+
+    def test_limite(self):
+        resposta = self.client.get('/api/search/', {'q': 'maria', 'limit': 2})
+        self.assertEqual(resposta.status_code, 200)
+        self.assertEqual(len(resposta.json()['results']), 2)
+        self.assertEqual(len(self.client.get('/api/search/', {'q': 'maria'}).json()['results']), 3)
+
+    def test_limite_invalido(self):
+        for limite in ('-1', '0', '101', 'abc'):
+            resposta = self.client.get('/api/search/', {'q': 'maria', 'limit': limite})
+            self.assertEqual(resposta.status_code, 400, limite)
+            self.assertIn('limit', resposta.json())
+
+
+@TESTES
+class BulkTests(TestCase):
+    url = '/api/alunos/bulk/'
+
+    def versao(self):
+        return VersaoTabela.objects.filter(tabela='cadastro.aluno').values_list('versao', flat=True).first() or 0
+
+    def enviar(self, metodo, dados):
+        return getattr(self.client, metodo)(self.url, dados, content_type='application/json')
+
+    def test_criar_valida_o_lote_inteiro(self):
+        Aluno.objects.create(nome='Ana', email='ana@teste.com')
+        resposta = self.enviar('post', [
+            {'nome': 'Bia', 'email': 'bia@teste.com'},
+            {'nome': 'Ana de novo', 'email': 'ana@teste.com'},
+            {'nome': 'Bia de novo', 'email': 'bia@teste.com'},
+            {'nome': 'Sem email'},
+        ])
+        self.assertEqual(resposta.status_code, 400)
+        erros = resposta.json()
+        self.assertEqual(len(erros), 4)
+        self.assertEqual(erros[0], {})
+        self.assertIn('email', erros[1])
+        self.assertIn('email', erros[2])
+        self.assertIn('email', erros[3])
+        self.assertEqual(Aluno.objects.count(), 1)
+
+    def test_criar(self):
+        resposta = self.enviar('post', [{'nome': 'Bia', 'email': 'bia@teste.com'}, {'nome': 'Caio', 'email': 'caio@teste.com'}])
+        self.assertEqual(resposta.status_code, 201)
+        self.assertEqual(len(resposta.json()['data']), 2)
+        self.assertEqual(Aluno.objects.count(), 2)
+
+    def test_atualizar_id_desconhecido(self):
+        aluno = Aluno.objects.create(nome='Ana', email='ana@teste.com')
+        resposta = self.enviar('patch', [{'id': aluno.pk, 'nome': 'Ana Maria'}, {'id': 999999, 'nome': 'Ninguém'}])
+        self.assertEqual(resposta.status_code, 400)
+        self.assertEqual(resposta.json()[1], {'id': ["Registro não encontrado."]})
+
+        resposta = self.enviar('patch', [{'id': 'abc', 'nome': 'X'}, {'nome': 'Sem id'}, {'id': True}, {'id': str(aluno.pk), 'nome': 'Ana Maria'}])
+        self.assertEqual(resposta.status_code, 400)
+        erros = resposta.json()
+        self.assertEqual(erros[0]['id'], ["Um número inteiro válido é exigido."])
+        self.assertEqual(erros[1]['id'], ["Este campo é obrigatório."])
+        self.assertIn('id', erros[2])
+        self.assertEqual(erros[3], {})
+        aluno.refresh_from_db()
+        self.assertEqual(aluno.nome, 'Ana')
+
+    def test_excluir_uma_vez_por_lote(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            ids = [Aluno.objects.create(nome=f'Maria {i}', email=f'maria{i}@teste.com').pk for i in range(3)]
+        self.assertEqual(len(search.buscar('maria')), 3)
+        versao = self.versao()
+        with mock.patch('cadastro.bulk.search.remover', wraps=search.remover) as remover, \
+                self.captureOnCommitCallbacks(execute=True):
+            resposta = self.enviar('delete', {'ids': ids})
+        self.assertEqual(resposta.status_code, 200)
+        # Uma remoção do índice para o lote, não uma por aluno (signals)
+        remover.assert_called_once()
+        self.assertFalse(Aluno.objects.exists())
+        self.assertEqual(search.buscar('maria'), [])
+        self.assertGreater(self.versao(), versao)
+
+    def test_excluir_registro_em_uso(self):
+        turma, aula, matriculas = criar_turma(alunos=1)
+        livre = Aluno.objects.create(nome='Livre', email='livre@teste.com')
+        resposta = self.enviar('delete', {'ids': [livre.pk, matriculas[0].aluno_id_id]})
+        self.assertEqual(resposta.status_code, 409)
+        self.assertEqual(Aluno.objects.count(), 2)
+
+    def test_excluir_ids_invalidos(self):
+        for dados in ({}, {'ids': []}, {'ids': ['x']}):
+            self.assertEqual(self.enviar('delete', dados).status_code, 400, dados)
+
+
+@TESTES
+class FinanceiroTests(TestCase):
+    url = '/api/financeiro/'
+
+    def setUp(self):
+        basico = Curso.objects.create(nome='Básico', valor=100, quant_dias=1)
+        avancado = Curso.objects.create(nome='Avançado', valor=250, quant_dias=1)
+        aluno = Aluno.objects.create(nome='Aluno', email='aluno@teste')
+        for curso, situacao, tipo, criado in [
+            (basico, 'pago', 'Pix', '2024-01-10T12:00:00Z'),
+            (basico, 'pago', 'Boleto', '2024-02-10T12:00:00Z'),
+            (avancado, 'pendente', 'Pix', '2024-02-15T12:00:00Z'),
+        ]:
+            pagamento = Pagamento.objects.create(aluno_id=aluno, curso_id=curso, status=situacao, tipo_pagamento=tipo)
+            # created_at é auto_now_add: só um update grava a data do cenário
+            Pagamento.objects.filter(pk=pagamento.pk).update(created_at=criado)
+        self.basico, self.avancado = basico, avancado
+
+    def test_totais_por_agrupamento(self):
+        dados = financeiro.resumo()
+        self.assertEqual(dados['total'], {'receita': Decimal('450'), 'pagamentos': 3})
+        self.assertEqual(
+            [(r['curso_id'], r['curso'], r['receita'], r['pagamentos']) for r in dados['por_curso']],
+            [(self.basico.pk, 'Básico', Decimal('200'), 2), (self.avancado.pk, 'Avançado', Decimal('250'), 1)],
+        )
+        self.assertEqual(
+            [(r['status'], r['receita'], r['pagamentos']) for r in dados['por_status']],
+            [('pago', Decimal('200'), 2), ('pendente', Decimal('250'), 1)],
+        )
+        self.assertEqual(
+            [(r['tipo_pagamento'], r['receita'], r['pagamentos']) for r in dados['por_tipo_pagamento']],
+            [('Boleto', Decimal('100'), 1), ('Pix', Decimal('350'), 2)],
+        )
+        self.assertEqual(
+            [(r['mes'], r['receita'], r['pagamentos']) for r in dados['por_mes']],
+            [('2024-01', Decimal('100'), 1), ('2024-02', Decimal('350'), 2)],
+        )
+
+    def test_sem_pagamentos(self):
+        dados = financeiro.resumo(Pagamento.objects.none())
+        self.assertEqual(dados['total'], {'receita': Decimal('0.00'), 'pagamentos': 0})
+        self.assertEqual(dados['por_curso'], [])
+
+    def test_endpoint_com_filtros(self):
+        resposta = self.client.get(self.url, {'status': 'pago', 'created_at_inicio': '2024-02-01T00:00:00Z'})
+        self.assertEqual(resposta.status_code, 200)
+        dados = resposta.json()
+        self.assertEqual(dados['total']['pagamentos'], 1)
+        self.assertEqual(Decimal(dados['total']['receita']), Decimal('100'))
+        self.assertEqual([r['tipo_pagamento'] for r in dados['por_tipo_pagamento']], ['Boleto'])
+
+        resposta = self.client.get(self.url, {'curso_id': 'abc'})
+        self.assertEqual(resposta.status_code, 400)
+
+
+@TESTES
+class DashboardTests(TestCase):
+    url = '/api/dashboard/summary/'
+
+    def test_limite(self):
+        curso = Curso.objects.create(nome='Curso', valor=100, quant_dias=1)
+        for i in range(dashboard.RECENTES + 1):
+            Aluno.objects.create(nome=f'Aluno {i}', email=f'aluno{i}@teste')
+
+        dados = self.client.get(self.url).json()
+        self.assertEqual(len(dados['alunos']['ultimos']), dashboard.RECENTES)
+        self.assertEqual(dados['alunos']['total'], dashboard.RECENTES + 1)
+        self.assertEqual(dados['cursos']['ultimos'][0]['id'], curso.pk)
+
+        self.assertEqual(len(self.client.get(self.url, {'limite': 1}).json()['alunos']['ultimos']), 1)
+        self.assertEqual(self.client.get(self.url, {'limite': dashboard.MAX_RECENTES}).status_code, 200)
+        for limite in (0, -1, dashboard.MAX_RECENTES + 1, 'abc'):
+            resposta = self.client.get(self.url, {'limite': limite})
+            self.assertEqual(resposta.status_code, 400, limite)
+            self.assertIn('limite', resposta.json())
+
+    def test_turmas_ativas(self):
+        hoje = timezone.localdate()
+        curso = Curso.objects.create(nome='Curso', valor=100, quant_dias=1)
+
+        def turma(inicio, fim):
+            return Turma.objects.create(curso_id=curso, localidade='Sala', data_inicio=hoje + timedelta(days=inicio), data_fim=hoje + timedelta(days=fim)).pk
+
+        terminando = turma(-3, 0)
+        comecando = turma(0, 3)
+        em_andamento = turma(-1, 1)
+        turma(-5, -1)
+        turma(1, 5)
+
+        ativas = self.client.get(self.url).json()['turmas_ativas']
+        self.assertEqual(ativas['total'], 3)
+        # Ordenadas pelas que terminam primeiro
+        self.assertEqual([item['id'] for item in ativas['itens']], [terminando, em_andamento, comecando])
+        self.assertEqual(ativas['itens'][0]['curso_id__nome'], 'Curso')
+
+
+class AtualizarReplicaTests(TestCase):
+
+    def test_falha_nao_interrompe_o_laco(self):
+        # A terceira chamada encerra o laço infinito do teste
+        atualizar = mock.patch.object(replica, 'atualizar', side_effect=[OSError('disco cheio'), 0.5, KeyboardInterrupt])
+        with atualizar as copia, mock.patch('time.sleep') as sleep, \
+                self.assertLogs('cadastro.management.commands.atualizar_replica', level='ERROR'):
+            with self.assertRaises(KeyboardInterrupt):
+                call_command('atualizar_replica', intervalo=60, stdout=mock.Mock())
+        self.assertEqual(copia.call_count, 3)
+        self.assertEqual(sleep.call_count, 2)
+
+    def test_execucao_unica_propaga_o_erro(self):
+        with mock.patch.object(replica, 'atualizar', side_effect=OSError('disco cheio')):
+            with self.assertRaises(OSError):
+                call_command('atualizar_replica')
+
+
+class ServidorWsgiTests(SimpleTestCase):
+
+    def test_requisicoes_simultaneas_nao_esperam_umas_pelas_outras(self):
+        # Como o gunicorn gthread: duas threads chamando a aplicação WSGI.
+        # Cada view só termina quando a outra também chegou na barreira; se
+        # o servidor atendesse uma por vez, a barreira estouraria o timeout.
+        from conflu_ai.wsgi import application
+
+        barreira = threading.Barrier(2, timeout=5)
+
+        def listar(viewset, request):
+            barreira.wait()
+            return Response({})
+
+        def requisitar(_):
+            environ = RequestFactory().get('/api/alunos/').environ
+            status = []
+            corpo = b''.join(application(environ, lambda s, h: status.append(s)))
+            return status[0], corpo
+
+        with mock.patch('cadastro.views.AlunoViewSet.list', listar):
+            with ThreadPoolExecutor(2) as executor:
+                respostas = list(executor.map(requisitar, range(2)))
+        self.assertEqual([status for status, _ in respostas], ['200 OK', '200 OK'])
+
+
+class ServeTests(TestCase):
+
+    def setUp(self):
+        # O comando fecha a conexão antes de subir o servidor; aqui ela é a do teste
+        fechar = mock.patch.object(serve.connection, 'close')
+        fechar.start()
+        self.addCleanup(fechar.stop)
+
+    def servir(self, *args):
+        with mock.patch.object(serve, 'servir_wsgi') as wsgi, mock.patch.object(serve, 'servir_asgi') as asgi, \
+                mock.patch.object(serve, 'call_command') as migrate:
+            call_command('serve', *args, stdout=mock.Mock())
+        return wsgi, asgi, migrate
+
+    def test_migracoes_pendentes(self):
+        self.assertFalse(serve.migracoes_pendentes())
+        MigrationRecorder.Migration.objects.filter(app='cadastro').order_by('-id').first().delete()
+        self.assertTrue(serve.migracoes_pendentes())
+
+    def test_banco_em_dia_nao_migra(self):
+        wsgi, asgi, migrate = self.servir('--port', '5000', '--workers', '3', '--threads', '4')
+        migrate.assert_not_called()
+        wsgi.assert_called_once_with('0.0.0.0', 5000, 3, 4)
+        asgi.assert_not_called()
+
+    def test_migra_antes_de_servir(self):
+        with mock.patch.object(serve, 'migracoes_pendentes', return_value=True):
+            wsgi, _, migrate = self.servir()
+        migrate.assert_called_once_with('migrate', interactive=False)
+        wsgi.assert_called_once()
+
+    def test_migrate_com_erro_nao_sobe_o_servidor(self):
+        with mock.patch.object(serve, 'migracoes_pendentes', return_value=True), \
+                mock.patch.object(serve, 'servir_wsgi') as wsgi, \
+                mock.patch.object(serve, 'call_command', side_effect=RuntimeError('migration quebrada')):
+            with self.assertRaises(RuntimeError):
+                call_command('serve', stdout=mock.Mock())
+        wsgi.assert_not_called()
+
+    def test_asgi_sem_migrate(self):
+        with mock.patch.object(serve, 'migracoes_pendentes') as pendentes:
+            wsgi, asgi, _ = self.servir('--asgi', '--sem-migrate', '--port', '5001', '--workers', '1')
+        pendentes.assert_not_called()
+        wsgi.assert_not_called()
+        asgi.assert_called_once_with('0.0.0.0', 5001, 1)
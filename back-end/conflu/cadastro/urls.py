@@ -1,6 +1,6 @@
 from django.urls import path, include
 from rest_framework import routers
-from cadastro import views
+from cadastro import views, views_async
 
 router = routers.DefaultRouter()
 
@@ -8,7 +8,30 @@ router = routers.DefaultRouter()
 router.register('alunos', views.AlunoViewSet, basename='alunos')
 router.register('cursos', views.CursoViewSet, basename='cursos')
 router.register('empresas', views.EmpresaViewSet, basename='empresas')
+router.register('turmas', views.TurmaViewSet, basename='turmas')
+router.register('aulas', views.AulaViewSet, basename='aulas')
+router.register('qrcodes', views.QrCodeViewSet, basename='qrcodes')
+router.register('checkin', views.CheckinViewSet, basename='checkin')
+router.register('search', views.BuscaViewSet, basename='search')
+router.register('export', views.ExportViewSet, basename='export')
+router.register('financeiro', views.FinanceiroViewSet, basename='financeiro')
+router.register('dashboard', views.DashboardViewSet, basename='dashboard')
+
+# Leituras async (ASGI), ver cadastro.views_async
+recursos_async = {
+    'alunos': views_async.AlunoAsync,
+    'cursos': views_async.CursoAsync,
+    'empresas': views_async.EmpresaAsync,
+    'turmas': views_async.TurmaAsync,
+    'aulas': views_async.AulaAsync,
+}
 
 urlpatterns = [
-    path('', include(router.urls))
-]
\ No newline at end of file
+    path('', include(router.urls)),
+]
+
+for nome, view in recursos_async.items():
+    urlpatterns += [
+        path(f'async/{nome}/', view.as_view(), name=f'{nome}-async-list'),
+        path(f'async/{nome}/<int:pk>/', view.as_view(), name=f'{nome}-async-detail'),
+    ]
\ No newline at end of file
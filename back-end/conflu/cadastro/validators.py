@@ -0,0 +1,61 @@
+import re
+from functools import lru_cache
+
+_NAO_DIGITOS = re.compile(r'\D')
+
+
+def somente_digitos(valor):
+    return _NAO_DIGITOS.sub('', str(valor or ''))
+
+
+def normalizar_email(valor):
+    """
+    Emails são gravados sem espaços e em minúsculas, venham do formulário,
+    da API em lote ou da importação, para que a unicidade não dependa de
+    maiúsculas.
+    """
+    return str(valor or '').strip().lower()
+
+
+def _digito(numeros, pesos):
+    resto = sum(int(n) * p for n, p in zip(numeros, pesos)) % 11
+    return '0' if resto < 2 else str(11 - resto)
+
+
+def cpf_valido(cpf):
+    if len(cpf) != 11 or not cpf.isdigit() or cpf == cpf[0] * 11:
+        return False
+    primeiro = _digito(cpf[:9], range(10, 1, -1))
+    segundo = _digito(cpf[:10], range(11, 1, -1))
+    return cpf[9:] == primeiro + segundo
+
+
+def cnpj_valido(cnpj):
+    if len(cnpj) != 14 or not cnpj.isdigit() or cnpj == cnpj[0] * 14:
+        return False
+    pesos = [5, 4, 3, 2, 9, 8, 7, 6, 5, 4, 3, 2]
+    primeiro = _digito(cnpj[:12], pesos)
+    segundo = _digito(cnpj[:13], [6] + pesos)
+    return cnpj[12:] == primeiro + segundo
+
+
+def normalizar_cpf(valor):
+    """Devolve o CPF só com dígitos (completando zeros à esquerda) ou None se inválido."""
+    cpf = somente_digitos(valor)
+    if not cpf:
+        return None
+    cpf = cpf.zfill(11)
+    return cpf if cpf_valido(cpf) else None
+
+
+@lru_cache(maxsize=4096)
+def normalizar_cnpj(valor):
+    """
+    Devolve o CNPJ só com dígitos (completando zeros à esquerda) ou None se inválido.
+    Memorizado: numa planilha de funcionários o mesmo CNPJ se repete em muitas linhas.
+    """
+    cnpj = somente_digitos(valor)
+    if not cnpj:
+        return None
+    cnpj = cnpj.zfill(14)
+    return cnpj if cnpj_valido(cnpj) else None
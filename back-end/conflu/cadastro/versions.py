@@ -0,0 +1,140 @@
+"""
+Versões por tabela para GET condicional (ETag / Last-Modified).
+
+Cada escrita em um model do cadastro marca a tabela como alterada (via
+signals, ou chamando `tocar` depois de escritas em lote). As views de
+leitura calculam o ETag a partir dessas versões e da URL, então uma
+requisição com If-None-Match ainda válido recebe 304 com uma única
+consulta à tabela de versões, sem ler as linhas do cadastro.
+
+Dentro de uma transação as tabelas marcadas são acumuladas e a versão de
+cada uma sobe uma única vez, no commit (`transaction.on_commit`): salvar
+mil linhas não vira mil UPDATEs na mesma linha de VersaoTabela, que no
+SQLite é um ponto de disputa entre todos os escritores. Se a transação
+for desfeita, nada é incrementado.
+"""
+import hashlib
+from functools import wraps
+from asgiref.sync import iscoroutinefunction
+from django.db import transaction
+from django.db.models import F
+from django.utils import timezone
+from django.utils.cache import patch_cache_control
+from django.utils.decorators import method_decorator
+from django.views.decorators.http import condition
+from cadastro.models import VersaoTabela
+
+
+def _rotulo(model):
+    return model._meta.label_lower
+
+
+class _Pendentes:
+    """Tabelas alteradas na transação atual de uma conexão."""
+
+    def __init__(self):
+        self.rotulos = set()
+        self.aplicado = False
+
+    def aplicar(self):
+        self.aplicado = True
+        _incrementar(self.rotulos)
+
+    def agendado(self, conexao):
+        return not self.aplicado and any(func == self.aplicar for _, func, _ in conexao.run_on_commit)
+
+
+def _incrementar(rotulos):
+    agora = timezone.now()
+    with transaction.atomic():
+        atualizadas = VersaoTabela.objects.filter(tabela__in=rotulos).update(
+            versao=F('versao') + 1, atualizado_em=agora
+        )
+        if atualizadas < len(rotulos):
+            VersaoTabela.objects.bulk_create(
+                [VersaoTabela(tabela=rotulo, versao=1) for rotulo in rotulos], ignore_conflicts=True
+            )
+
+
+def tocar(*models):
+    rotulos = {_rotulo(model) for model in models}
+    conexao = transaction.get_connection()
+    if not conexao.in_atomic_block:
+        _incrementar(rotulos)
+        return
+
+    # Um callback por transação; se ele foi descartado (rollback de um
+    # savepoint), o próximo `tocar` agenda outro
+    pendentes = getattr(conexao, 'versoes_pendentes', None)
+    if pendentes is None or not pendentes.agendado(conexao):
+        pendentes = conexao.versoes_pendentes = _Pendentes()
+        transaction.on_commit(pendentes.aplicar, robust=True)
+    pendentes.rotulos |= rotulos
+
+
+def _consulta(rotulos):
+    return VersaoTabela.objects.filter(tabela__in=rotulos).values_list('tabela', 'versao', 'atualizado_em')
+
+
+def _guardar(request, rotulos, linhas):
+    versoes = dict.fromkeys(rotulos, (0, None))
+    versoes.update((tabela, (versao, atualizado_em)) for tabela, versao, atualizado_em in linhas)
+    request._versoes_cadastro = versoes
+    return versoes
+
+
+def _estado(request, models):
+    # etag_func e last_modified_func são chamadas em sequência; guarda o
+    # resultado na request para ler a tabela de versões uma vez só.
+    if not hasattr(request, '_versoes_cadastro'):
+        rotulos = [_rotulo(model) for model in models]
+        _guardar(request, rotulos, _consulta(rotulos))
+    return request._versoes_cadastro
+
+
+async def _carregar(request, models):
+    # Views async: lê as versões antes do `condition`, que chama etag_func
+    # de forma síncrona e então só encontra o resultado já guardado.
+    rotulos = [_rotulo(model) for model in models]
+    _guardar(request, rotulos, [linha async for linha in _consulta(rotulos)])
+
+
+def condicional(*models):
+    """
+    Decorator para métodos de leitura das viewsets. O ETag combina as
+    versões de `models` (o model da view e os que podem vir em ?expand=)
+    com a URL completa, então filtros, cursor e ?fields= geram ETags
+    diferentes.
+    """
+    def etag(request, *args, **kwargs):
+        versoes = _estado(request, models)
+        chave = ';'.join(f"{tabela}:{versao}" for tabela, (versao, _) in sorted(versoes.items()))
+        return hashlib.sha1(f"{chave}|{request.get_full_path()}".encode()).hexdigest()
+
+    def ultima_modificacao(request, *args, **kwargs):
+        datas = [data for _, data in _estado(request, models).values() if data]
+        return max(datas) if datas else None
+
+    def decorator(view_func):
+        view_func = condition(etag_func=etag, last_modified_func=ultima_modificacao)(view_func)
+
+        if iscoroutinefunction(view_func):
+            @wraps(view_func)
+            async def wrapper(request, *args, **kwargs):
+                await _carregar(request, models)
+                response = await view_func(request, *args, **kwargs)
+                patch_cache_control(response, private=True, no_cache=True)
+                return response
+
+            return wrapper
+
+        @wraps(view_func)
+        def wrapper(request, *args, **kwargs):
+            response = view_func(request, *args, **kwargs)
+            # O navegador guarda a resposta mas sempre revalida com If-None-Match
+            patch_cache_control(response, private=True, no_cache=True)
+            return response
+
+        return wrapper
+
+    return method_decorator(decorator)
@@ -1,37 +1,61 @@
+import logging
+from django.core.handlers.asgi import ASGIRequest
+from django.db import transaction
+from django.http import FileResponse, HttpResponseNotModified, StreamingHttpResponse
 from django.shortcuts import get_object_or_404
 from rest_framework.response import Response
-from rest_framework import viewsets, status
+from rest_framework import serializers, viewsets, status
+from rest_framework.decorators import action
 from cadastro.models import *
 from cadastro.serializers import *
+from cadastro.filters import *
+from cadastro.pagination import CadastroCursorPagination
+from cadastro import agenda, checkin, dashboard, export, financeiro, frequencia, qrcodes, search
+from cadastro.catalogo import CURSOS, EMPRESAS
+from cadastro.versions import condicional
+from cadastro.replica import usar_replica
+from cadastro.bulk import LoteMixin
+from cadastro.importacao import ArquivoInvalido, importar_planilha
+
+logger = logging.getLogger(__name__)
 
 # Create your views here.
-class AlunoViewSet(viewsets.ViewSet):
+class AlunoViewSet(LoteMixin, viewsets.ViewSet):
     queryset = Aluno.objects.all()
     serializer_class = AlunoSerializer
+    ordering_fields = ['nome', 'email', 'created_at']
 
+    @condicional(Aluno, Empresa)
     def list(self, request):
-        try:
-            if request.method == "GET":
-                alunos = Aluno.objects.all()
-                data = [{
-                    "id": aluno.id,
-                    "nome": aluno.nome,
-                    "cpf": aluno.cpf,
-                    "email": aluno.email,
-                    "empresa_id": aluno.empresa_id,
-                    "telefone": aluno.telefone,
-                    "data_nascimento": aluno.data_nascimento
-                } for aluno in alunos]
-                return Response(data)
-        except Exception as e:
-            return Response({'error': e}, status=status.HTTP_400_BAD_REQUEST)
+        paginator = CadastroCursorPagination()
+        contexto = AlunoSerializer.ler_contexto(request.query_params)
+        alunos = AlunoSerializer.otimizar_queryset(Aluno.objects.all(), contexto)
+        alunos = aplicar_filtros(alunos, request.query_params, ALUNO_FILTROS)
+        alunos = paginator.paginate_queryset(alunos, request, view=self)
+        serializer = AlunoSerializer(alunos, many=True, context=contexto)
+        return paginator.get_paginated_response(serializer.data)
         
+    @condicional(Aluno, Empresa)
     def retrieve(self, request, pk=None):
-        aluno = get_object_or_404(self.queryset, pk=pk)
-        serializer = AlunoSerializer(aluno)
+        contexto = AlunoSerializer.ler_contexto(request.query_params)
+        aluno = get_object_or_404(AlunoSerializer.otimizar_queryset(self.queryset, contexto), pk=pk)
+        serializer = AlunoSerializer(aluno, context=contexto)
         return Response(serializer.data)
 
 
+    @action(detail=False, methods=['post'])
+    def importar(self, request):
+        arquivo = request.FILES.get('arquivo')
+        if not arquivo:
+            return Response({"error": "Envie a planilha no campo 'arquivo'."}, status=status.HTTP_400_BAD_REQUEST)
+
+        try:
+            resumo = importar_planilha(arquivo.file, arquivo.name)
+        except ArquivoInvalido as e:
+            return Response({"error": str(e)}, status=status.HTTP_400_BAD_REQUEST)
+
+        return Response({"message": f"{resumo['importados']} aluno(s) importado(s).", "data": resumo}, status=status.HTTP_200_OK)
+
     def create(self, request):
         serializer = AlunoSerializer(data=request.data)
         if serializer.is_valid():
@@ -63,28 +87,33 @@ class AlunoViewSet(viewsets.ViewSet):
         aluno.delete()
         return Response({"message": "Aluno deletado com sucesso!"}, status=status.HTTP_204_NO_CONTENT)
 
-class CursoViewSet(viewsets.ViewSet):
+class CursoViewSet(LoteMixin, viewsets.ViewSet):
     queryset = Curso.objects.all()
     serializer_class = CursoSerializer
+    ordering_fields = ['nome', 'valor', 'created_at']
 
+    @condicional(Curso, Turma)
     def list(self, request):
-        try:
-            if request.method == "GET":
-                cursos = Curso.objects.all()
-                data = [{
-                    "id": curso.id,
-                    "nome": curso.nome,
-                    "valor": curso.valor,
-                    "descricao": curso.descricao,
-                    "quant_dias": curso.quant_dias,
-                } for curso in cursos]
-                return Response(data)
-        except Exception as e:
-            return Response({'error': e}, status=status.HTTP_400_BAD_REQUEST)
+        paginator = CadastroCursorPagination()
+        contexto = CursoSerializer.ler_contexto(request.query_params)
+        cursos = CursoSerializer.otimizar_queryset(Curso.objects.all(), contexto)
+        cursos = aplicar_filtros(cursos, request.query_params, CURSO_FILTROS)
+        cursos = paginator.paginate_queryset(cursos, request, view=self)
+        serializer = CursoSerializer(cursos, many=True, context=contexto)
+        return paginator.get_paginated_response(serializer.data)
         
+    @condicional(Curso, Turma)
     def retrieve(self, request, pk=None):
-        curso = get_object_or_404(self.queryset, pk=pk)
-        serializer = CursoSerializer(curso)
+        contexto = CursoSerializer.ler_contexto(request.query_params)
+        curso = get_object_or_404(CursoSerializer.otimizar_queryset(self.queryset, contexto), pk=pk)
+        serializer = CursoSerializer(curso, context=contexto)
+        return Response(serializer.data)
+
+    @action(detail=False)
+    @condicional(Curso)
+    def catalogo(self, request):
+        # Tabela inteira, servida do cache em memória (selects do front-end)
+        serializer = CursoSerializer(CURSOS.todos(), many=True)
         return Response(serializer.data)
 
     def create(self, request):
@@ -118,29 +147,33 @@ class CursoViewSet(viewsets.ViewSet):
         curso.delete()
         return Response({"message": "Curso deletado com sucesso!"}, status=status.HTTP_204_NO_CONTENT)
     
-class EmpresaViewSet(viewsets.ViewSet):
+class EmpresaViewSet(LoteMixin, viewsets.ViewSet):
     queryset = Empresa.objects.all()
     serializer_class = EmpresaSerializer
+    ordering_fields = ['nome']
 
+    @condicional(Empresa, Aluno)
     def list(self, request):
-        try:
-            if request.method == "GET":
-                empresas = Empresa.objects.all()
-                data = [{
-                    "id": empresa.id,
-                    "nome": empresa.nome,
-                    "cnpj": empresa.cnpj,
-                    "tipo_inscricao": empresa.tipo_inscricao,
-                    "endereco": empresa.endereco,
-                    "optante_simp_nacional": empresa.optante_simp_nacional,
-                } for empresa in empresas]
-                return Response(data)
-        except Exception as e:
-            return Response({'error': e}, status=status.HTTP_400_BAD_REQUEST)
-
+        paginator = CadastroCursorPagination()
+        contexto = EmpresaSerializer.ler_contexto(request.query_params)
+        empresas = EmpresaSerializer.otimizar_queryset(Empresa.objects.all(), contexto)
+        empresas = aplicar_filtros(empresas, request.query_params, EMPRESA_FILTROS)
+        empresas = paginator.paginate_queryset(empresas, request, view=self)
+        serializer = EmpresaSerializer(empresas, many=True, context=contexto)
+        return paginator.get_paginated_response(serializer.data)
+
+    @condicional(Empresa, Aluno)
     def retrieve(self, request, pk=None):
-        empresa = get_object_or_404(self.queryset, pk=pk)
-        serializer = EmpresaSerializer(empresa)
+        contexto = EmpresaSerializer.ler_contexto(request.query_params)
+        empresa = get_object_or_404(EmpresaSerializer.otimizar_queryset(self.queryset, contexto), pk=pk)
+        serializer = EmpresaSerializer(empresa, context=contexto)
+        return Response(serializer.data)
+
+    @action(detail=False)
+    @condicional(Empresa)
+    def catalogo(self, request):
+        # Tabela inteira, servida do cache em memória (selects do front-end)
+        serializer = EmpresaSerializer(EMPRESAS.todos(), many=True)
         return Response(serializer.data)
 
     def create(self, request):
@@ -178,35 +211,47 @@ class TurmaViewSet(viewsets.ViewSet):
     queryset = Turma.objects.all()
     serializer_class = TurmaSerializer
 
+    @condicional(Turma, Curso, Aula)
     def list(self, request):
-        try:
-            if request.method == "GET":
-                turmas = Turma.objects.all()
-                data = [{
-                    "id": turma.id,
-                    "curso_id": turma.curso_id.id,
-                    "localidade": turma.localidade,
-                    "data_inicio": turma.data_inicio,
-                    "data_fim": turma.data_fim,
-                } for turma in turmas]
-                return Response(data)
-        except Exception as e:
-            return Response({'error': e}, status=status.HTTP_400_BAD_REQUEST)
-
+        paginator = CadastroCursorPagination()
+        contexto = TurmaSerializer.ler_contexto(request.query_params)
+        turmas = TurmaSerializer.otimizar_queryset(Turma.objects.all(), contexto)
+        turmas = paginator.paginate_queryset(turmas, request, view=self)
+        serializer = TurmaSerializer(turmas, many=True, context=contexto)
+        return paginator.get_paginated_response(serializer.data)
+
+    @condicional(Turma, Curso, Aula)
     def retrieve(self, request, pk=None):
-        empresa = get_object_or_404(self.queryset, pk=pk)
-        serializer = TurmaSerializer(empresa)
+        contexto = TurmaSerializer.ler_contexto(request.query_params)
+        turma = get_object_or_404(TurmaSerializer.otimizar_queryset(self.queryset, contexto), pk=pk)
+        serializer = TurmaSerializer(turma, context=contexto)
         return Response(serializer.data)
 
     def create(self, request):
         serializer = TurmaSerializer(data=request.data)
         if serializer.is_valid():
-            turma_id = serializer.data.get('id')
-            curso_obj = Curso.objects.filter(turma_id=turma_id).first()
-            if curso_obj:
-                quant_aulas = curso_obj.quant_dias
-                
-            return Response({"message": "Turma criada com sucesso!", "data": serializer.data}, status=status.HTTP_201_CREATED)
+            dados = serializer.validated_data
+            curso = dados['curso_id']
+            disponiveis = agenda.dias_uteis(dados['data_inicio'], dados['data_fim'])
+            if disponiveis < curso.quant_dias:
+                return Response(
+                    {"error": f"O período tem {disponiveis} dia(s) útil(eis), mas o curso exige {curso.quant_dias} aula(s)."},
+                    status=status.HTTP_400_BAD_REQUEST
+                )
+
+            with transaction.atomic():
+                turma = serializer.save()
+                aulas = agenda.gerar_aulas(turma, curso)
+            # Fora da transação: renderizar não segura o lock de escrita do SQLite.
+            # Se falhar, a turma continua criada e `manage.py gerar_qrcodes` refaz depois.
+            try:
+                qrcodes.gerar_qrcodes(aulas)
+            except Exception:
+                logger.exception("Falha ao gerar os QR codes da turma %s", turma.pk)
+                aulas = list(Aula.objects.filter(turma_id=turma).order_by('data'))
+
+            data = dict(serializer.data, aulas=AulaSerializer(aulas, many=True).data)
+            return Response({"message": "Turma criada com sucesso!", "data": data}, status=status.HTTP_201_CREATED)
 
         return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
 
@@ -224,6 +269,18 @@ class TurmaViewSet(viewsets.ViewSet):
 
         return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
 
+    @action(detail=True, methods=['get'], url_path='frequencia')
+    @usar_replica
+    @condicional(ResumoFrequencia, Aluno)
+    def frequencia(self, request, pk=None):
+        turma = get_object_or_404(self.queryset, pk=pk)
+        resumos = (
+            ResumoFrequencia.objects.filter(matricula_id__turma_id=turma)
+            .select_related('matricula_id__aluno_id')
+            .order_by('matricula_id__aluno_id__nome', 'matricula_id')
+        )
+        return Response(ResumoFrequenciaSerializer(resumos, many=True).data)
+
     def destroy(self, request, pk=None):
         try:
             turma = Turma.objects.get(pk=pk)
@@ -231,4 +288,149 @@ class TurmaViewSet(viewsets.ViewSet):
             return Response({"error": "Turma não encontrada."}, status=status.HTTP_404_NOT_FOUND)
 
         turma.delete()
-        return Response({"message": "Turma deletada com sucesso!"}, status=status.HTTP_204_NO_CONTENT)
\ No newline at end of file
+        return Response({"message": "Turma deletada com sucesso!"}, status=status.HTTP_204_NO_CONTENT)
+
+class AulaViewSet(viewsets.ViewSet):
+    queryset = Aula.objects.all()
+    serializer_class = AulaSerializer
+    ordering_fields = ['data']
+
+    @condicional(Aula)
+    def list(self, request):
+        paginator = CadastroCursorPagination()
+        aulas = aplicar_filtros(Aula.objects.all(), request.query_params, AULA_FILTROS)
+        aulas = paginator.paginate_queryset(aulas, request, view=self)
+        serializer = AulaSerializer(aulas, many=True)
+        return paginator.get_paginated_response(serializer.data)
+
+    @condicional(Aula)
+    def retrieve(self, request, pk=None):
+        aula = get_object_or_404(self.queryset, pk=pk)
+        serializer = AulaSerializer(aula)
+        return Response(serializer.data)
+
+    @action(detail=True, methods=['get', 'post'], url_path='frequencia')
+    def frequencia(self, request, pk=None):
+        aula = get_object_or_404(self.queryset, pk=pk)
+
+        if request.method == 'GET':
+            registros = Frequencia.objects.filter(aula_id=aula).order_by('matricula_id')
+            return Response(FrequenciaSerializer(registros, many=True).data)
+
+        serializer = MarcarFrequenciaSerializer(data=request.data, many=True)
+        if not serializer.is_valid():
+            return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
+
+        marcacoes = serializer.validated_data
+        ids = [marcacao['matricula_id'] for marcacao in marcacoes]
+        if len(set(ids)) != len(ids):
+            return Response({"error": "Matrícula repetida na lista."}, status=status.HTTP_400_BAD_REQUEST)
+
+        matriculas = Matricula.objects.filter(id__in=ids)
+        if aula.turma_id_id:
+            matriculas = matriculas.filter(turma_id=aula.turma_id_id)
+        existentes = set(matriculas.values_list('id', flat=True))
+        faltando = sorted(set(ids) - existentes)
+        if faltando:
+            return Response({"error": f"Matrículas não encontradas nesta turma: {faltando}."}, status=status.HTTP_400_BAD_REQUEST)
+
+        total = frequencia.registrar(aula.id, marcacoes)
+        return Response({"message": f"Frequência registrada para {total} matrícula(s)."}, status=status.HTTP_200_OK)
+
+class CheckinViewSet(viewsets.ViewSet):
+
+    def create(self, request):
+        serializer = CheckinSerializer(data=request.data)
+        if not serializer.is_valid():
+            return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
+
+        erro = checkin.registrar(serializer.validated_data['token'], serializer.validated_data['matricula_id'])
+        if erro:
+            return Response({"error": erro}, status=status.HTTP_400_BAD_REQUEST)
+
+        # A gravação acontece em lote logo em seguida (cadastro.checkin)
+        return Response({"message": "Presença registrada!"}, status=status.HTTP_202_ACCEPTED)
+
+class QrCodeViewSet(viewsets.ViewSet):
+
+    def retrieve(self, request, pk=None):
+        if not qrcodes.CHAVE_VALIDA.match(pk or ''):
+            return Response({"error": "QR code não encontrado."}, status=status.HTTP_404_NOT_FOUND)
+
+        # O nome é o hash do conteúdo: o arquivo nunca muda e pode ficar em cache para sempre
+        etag = f'"{pk}"'
+        if request.META.get('HTTP_IF_NONE_MATCH') == etag:
+            response = HttpResponseNotModified()
+        else:
+            try:
+                response = FileResponse(open(qrcodes.caminho(pk), 'rb'), content_type='image/png')
+            except FileNotFoundError:
+                return Response({"error": "QR code não encontrado."}, status=status.HTTP_404_NOT_FOUND)
+        response['ETag'] = etag
+        response['Cache-Control'] = 'public, max-age=31536000, immutable'
+        return response
+
+class BuscaViewSet(viewsets.ViewSet):
+
+    def list(self, request):
+        q = request.query_params.get('q', '').strip()
+        if not q:
+            return Response({"error": "Informe o termo de busca em ?q="}, status=status.HTTP_400_BAD_REQUEST)
+
+        tipos = [t for t in request.query_params.get('tipo', '').split(',') if t]
+        invalidos = [t for t in tipos if t not in search.TIPOS]
+        if invalidos:
+            return Response({"error": f"Tipo inválido: {', '.join(invalidos)}."}, status=status.HTTP_400_BAD_REQUEST)
+
+        limite = request.query_params.get('limit')
+        if limite in (None, ''):
+            limite = search.LIMITE
+        else:
+            try:
+                limite = serializers.IntegerField(min_value=1, max_value=search.MAX_LIMITE).run_validation(limite)
+            except serializers.ValidationError as e:
+                return Response({"limit": e.detail}, status=status.HTTP_400_BAD_REQUEST)
+
+        return Response({"results": search.buscar(q, tipos=tipos, limite=limite)})
+
+class ExportViewSet(viewsets.ViewSet):
+
+    @usar_replica
+    def retrieve(self, request, pk=None):
+        if pk not in export.TABELAS:
+            return Response({"error": f"Tabela inválida. Opções: {', '.join(export.TABELAS)}."}, status=status.HTTP_404_NOT_FOUND)
+
+        formato = request.query_params.get('formato', 'ndjson')
+        if formato not in export.FORMATOS:
+            return Response({"error": f"Formato inválido. Opções: {', '.join(export.FORMATOS)}."}, status=status.HTTP_400_BAD_REQUEST)
+
+        # Sob ASGI (serve --asgi) o streaming precisa de um iterador async
+        if isinstance(request._request, ASGIRequest):
+            conteudo = export.aexportar(pk, formato)
+        else:
+            conteudo = export.exportar(pk, formato)
+        response = StreamingHttpResponse(conteudo, content_type=export.FORMATOS[formato])
+        response['Content-Disposition'] = f'attachment; filename="{pk}.{formato}"'
+        return response
+
+class FinanceiroViewSet(viewsets.ViewSet):
+
+    @usar_replica
+    @condicional(Pagamento, Curso)
+    def list(self, request):
+        pagamentos = aplicar_filtros(Pagamento.objects.all(), request.query_params, PAGAMENTO_FILTROS)
+        return Response(financeiro.resumo(pagamentos))
+
+class DashboardViewSet(viewsets.ViewSet):
+
+    @action(detail=False)
+    def summary(self, request):
+        limite = request.query_params.get('limite')
+        if limite in (None, ''):
+            limite = dashboard.RECENTES
+        else:
+            try:
+                limite = serializers.IntegerField(min_value=1, max_value=dashboard.MAX_RECENTES).run_validation(limite)
+            except serializers.ValidationError as e:
+                return Response({"limite": e.detail}, status=status.HTTP_400_BAD_REQUEST)
+        return Response(dashboard.resumo(limite))
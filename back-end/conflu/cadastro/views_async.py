@@ -0,0 +1,122 @@
+"""
+Versões async (ASGI) das leituras do cadastro, em /api/async/.
+
+Mesmos parâmetros das viewsets (?fields=, ?expand=, filtros, ?limit=,
+?cursor=) e mesmo formato de resposta, mas as consultas usam o ORM
+async (`aiterator`, `aget`): sob um servidor ASGI a requisição não ocupa
+uma thread enquanto espera o banco. As views síncronas do DRF continuam
+em /api/ para escrita e para o que ainda não tem versão async (por
+exemplo ?ordering=).
+
+Em produção estas rotas são servidas pelo uvicorn (`serve --asgi`, serviço
+conflu_async do docker-compose); a API síncrona fica no gunicorn (WSGI).
+"""
+from django.http import HttpResponse
+from django.views import View
+from rest_framework.exceptions import APIException
+from rest_framework.renderers import JSONRenderer
+from rest_framework.request import Request
+from cadastro.models import *
+from cadastro.serializers import *
+from cadastro.filters import *
+from cadastro.pagination import CadastroCursorPaginationAsync
+from cadastro.versions import condicional
+
+
+def _json(data, status=200):
+    return HttpResponse(JSONRenderer().render(data), content_type='application/json', status=status)
+
+
+class LeituraAsync(View):
+    """
+    Base das leituras async: GET sem pk lista, com pk detalha. As
+    subclasses definem model, serializer e filtros e decoram `get` com
+    `condicional`, como os métodos das viewsets.
+    """
+    model = None
+    serializer_class = None
+    filtros = {}
+
+    def _contexto(self, params):
+        if hasattr(self.serializer_class, 'ler_contexto'):
+            return self.serializer_class.ler_contexto(params)
+        return {}
+
+    def _queryset(self, contexto):
+        queryset = self.model.objects.all()
+        if hasattr(self.serializer_class, 'otimizar_queryset'):
+            queryset = self.serializer_class.otimizar_queryset(queryset, contexto)
+        return queryset
+
+    async def responder(self, request, pk=None):
+        request = Request(request)
+        try:
+            contexto = self._contexto(request.query_params)
+            queryset = self._queryset(contexto)
+
+            if pk is not None:
+                try:
+                    objeto = await queryset.aget(pk=pk)
+                except self.model.DoesNotExist:
+                    return _json({"detail": f"No {self.model._meta.object_name} matches the given query."}, status=404)
+                return _json(self.serializer_class(objeto, context=contexto).data)
+
+            paginator = CadastroCursorPaginationAsync()
+            queryset = aplicar_filtros(queryset, request.query_params, self.filtros)
+            pagina = await paginator.apaginate_queryset(queryset, request)
+        except APIException as e:
+            # Mesmo formato do exception handler do DRF
+            detalhe = e.detail if isinstance(e.detail, (list, dict)) else {'detail': e.detail}
+            return _json(detalhe, status=e.status_code)
+
+        serializer = self.serializer_class(pagina, many=True, context=contexto)
+        return _json(paginator.get_paginated_data(serializer.data))
+
+
+class AlunoAsync(LeituraAsync):
+    model = Aluno
+    serializer_class = AlunoSerializer
+    filtros = ALUNO_FILTROS
+
+    @condicional(Aluno, Empresa)
+    async def get(self, request, pk=None):
+        return await self.responder(request, pk)
+
+
+class CursoAsync(LeituraAsync):
+    model = Curso
+    serializer_class = CursoSerializer
+    filtros = CURSO_FILTROS
+
+    @condicional(Curso, Turma)
+    async def get(self, request, pk=None):
+        return await self.responder(request, pk)
+
+
+class EmpresaAsync(LeituraAsync):
+    model = Empresa
+    serializer_class = EmpresaSerializer
+    filtros = EMPRESA_FILTROS
+
+    @condicional(Empresa, Aluno)
+    async def get(self, request, pk=None):
+        return await self.responder(request, pk)
+
+
+class TurmaAsync(LeituraAsync):
+    model = Turma
+    serializer_class = TurmaSerializer
+
+    @condicional(Turma, Curso, Aula)
+    async def get(self, request, pk=None):
+        return await self.responder(request, pk)
+
+
+class AulaAsync(LeituraAsync):
+    model = Aula
+    serializer_class = AulaSerializer
+    filtros = AULA_FILTROS
+
+    @condicional(Aula)
+    async def get(self, request, pk=None):
+        return await self.responder(request, pk)
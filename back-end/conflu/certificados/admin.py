@@ -1,3 +1,5 @@
 from django.contrib import admin
-
+from certificados.models import TarefaCertificado
 # Register your models here.
+
+admin.site.register(TarefaCertificado)
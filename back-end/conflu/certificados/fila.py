@@ -0,0 +1,120 @@
+"""
+Fila de certificados no próprio banco (tabela TarefaCertificado).
+
+As views e o `manage.py emitir_certificados_turma` por email só gravam
+as tarefas (uma por aluno, no envio da turma inteira); `manage.py
+worker_certificados` gera o PDF e faz o envio SMTP fora da requisição.
+
+Reserva: o worker escolhe a tarefa mais antiga disponível e a marca como
+`processando` com um UPDATE condicional (status e proxima_tentativa
+iguais aos lidos). Se outro worker levou a mesma tarefa antes, o UPDATE
+não altera nenhuma linha e a busca recomeça, então cada tarefa fica com
+um worker só, em qualquer banco.
+
+Enquanto processa, `proxima_tentativa` guarda o fim da reserva
+(RESERVA): se o worker morrer no meio, a tarefa volta a ficar disponível
+quando ela vencer. Cada reserva conta como tentativa, então uma tarefa
+que derruba o worker vira `falhou` ao vencer a reserva da última.
+
+Falhas voltam para `pendente` com espera exponencial (ESPERA_BASE, 2x,
+4x...) até MAX_TENTATIVAS; depois a tarefa fica como `falhou`, com a
+mensagem do último erro.
+"""
+from datetime import timedelta
+from django.db.models import F, Q
+from django.utils import timezone
+from cadastro.models import Matricula
+from certificados.models import TarefaCertificado
+
+MAX_TENTATIVAS = 5
+ESPERA_BASE = timedelta(seconds=30)
+RESERVA = timedelta(minutes=5)
+
+
+def enfileirar(nome, email):
+    return TarefaCertificado.objects.create(nome=nome, email=email, proxima_tentativa=timezone.now())
+
+
+def alunos_da_turma(turma_id):
+    """(nome, email) dos alunos matriculados na turma, em ordem alfabética."""
+    return list(
+        Matricula.objects.filter(turma_id=turma_id)
+        .order_by('aluno_id__nome')
+        .values_list('aluno_id__nome', 'aluno_id__email')
+    )
+
+
+def enfileirar_turma(turma_id):
+    """Uma tarefa por aluno matriculado, gravadas de uma vez."""
+    agora = timezone.now()
+    return TarefaCertificado.objects.bulk_create([
+        TarefaCertificado(nome=nome, email=email, proxima_tentativa=agora)
+        for nome, email in alunos_da_turma(turma_id)
+    ])
+
+
+async def aenfileirar(nome, email):
+    return await TarefaCertificado.objects.acreate(nome=nome, email=email, proxima_tentativa=timezone.now())
+
+
+def espera(tentativas):
+    return ESPERA_BASE * 2 ** (tentativas - 1)
+
+
+def reservar():
+    """Reserva a próxima tarefa disponível para este worker, ou None."""
+    while True:
+        agora = timezone.now()
+        tarefa = (
+            TarefaCertificado.objects
+            .filter(Q(status=TarefaCertificado.PENDENTE) | Q(status=TarefaCertificado.PROCESSANDO),
+                    proxima_tentativa__lte=agora)
+            .order_by('proxima_tentativa', 'id')
+            .first()
+        )
+        if tarefa is None:
+            return None
+
+        if tarefa.status == TarefaCertificado.PROCESSANDO and tarefa.tentativas >= MAX_TENTATIVAS:
+            TarefaCertificado.objects.filter(
+                pk=tarefa.pk, status=tarefa.status, proxima_tentativa=tarefa.proxima_tentativa,
+            ).update(
+                status=TarefaCertificado.FALHOU,
+                erro=f"Reserva vencida na tentativa {tarefa.tentativas} (worker interrompido); limite de tentativas atingido",
+            )
+            continue
+
+        reservada = TarefaCertificado.objects.filter(
+            pk=tarefa.pk, status=tarefa.status, proxima_tentativa=tarefa.proxima_tentativa,
+        ).update(
+            status=TarefaCertificado.PROCESSANDO,
+            proxima_tentativa=agora + RESERVA,
+            tentativas=F('tentativas') + 1,
+        )
+        if reservada:
+            tarefa.refresh_from_db()
+            return tarefa
+
+
+def executar(tarefa):
+    """Gera e envia o certificado; grava o resultado e devolve True se deu certo."""
+    from certificados import tarefas
+
+    # Só grava se a tarefa ainda é desta tentativa (a reserva pode ter vencido
+    # e outro worker tê-la pegado de novo)
+    minha = TarefaCertificado.objects.filter(pk=tarefa.pk, tentativas=tarefa.tentativas)
+    try:
+        tarefas.emitir(tarefa.nome, tarefa.email)
+    except Exception as e:
+        erro = f"{type(e).__name__}: {e}"
+        if tarefa.tentativas >= MAX_TENTATIVAS:
+            status, proxima = TarefaCertificado.FALHOU, tarefa.proxima_tentativa
+        else:
+            status, proxima = TarefaCertificado.PENDENTE, timezone.now() + espera(tarefa.tentativas)
+        minha.update(status=status, proxima_tentativa=proxima, erro=erro)
+        return False
+
+    minha.update(
+        status=TarefaCertificado.CONCLUIDA, erro=None, concluido_em=timezone.now(),
+    )
+    return True
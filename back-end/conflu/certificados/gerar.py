@@ -1,13 +1,28 @@
 from reportlab.pdfgen import canvas
 from reportlab.lib.pagesizes import letter
 from reportlab.lib.colors import white
-from PyPDF2 import PdfReader, PdfWriter
+from PyPDF2 import PageObject, PdfReader, PdfWriter
 from datetime import datetime
+from functools import lru_cache
+from io import BytesIO
+import threading
 
-def gerar_certificado(nome, caminho_pdf_original, caminho_pdf_saida) -> str:
-    # Criar PDF temporário com o texto a ser inserido
-    temp_pdf = "overlay.pdf"
-    c = canvas.Canvas(temp_pdf, pagesize=letter)
+# O template é lido e parseado uma vez por processo. merge_page e add_page
+# leem objetos do PdfReader compartilhado (que guarda a posição do stream),
+# então essa parte roda sob o lock; o render do overlay fica de fora.
+_TEMPLATE_LOCK = threading.Lock()
+
+
+@lru_cache(maxsize=None)
+def _template(caminho_pdf_original) -> PdfReader:
+    with open(caminho_pdf_original, "rb") as arquivo:
+        return PdfReader(BytesIO(arquivo.read()))
+
+
+def _overlay(nome) -> PageObject:
+    # Criar PDF em memória com o texto a ser inserido
+    buffer = BytesIO()
+    c = canvas.Canvas(buffer, pagesize=letter)
 
     # ======= POSIÇÕES DO TEXTO =========
     # Ajuste se necessário após testar
@@ -19,7 +34,7 @@ def gerar_certificado(nome, caminho_pdf_original, caminho_pdf_saida) -> str:
     # ===================================
 
     # Nome (fonte grande, centralizada horizontalmente manualmente se desejar)
-    c.setFillColor(white)   
+    c.setFillColor(white)
     c.setFont("Helvetica-Bold", 26)
     c.drawString(x_nome, y_nome, nome)
 
@@ -30,18 +45,30 @@ def gerar_certificado(nome, caminho_pdf_original, caminho_pdf_saida) -> str:
     c.drawString(x_data, y_data, data_atual)
 
     c.save()
+    buffer.seek(0)
+    return PdfReader(buffer).pages[0]
 
-    # Mesclar overlay com pdf original
-    reader = PdfReader(caminho_pdf_original)
-    writer = PdfWriter()
 
-    overlay = PdfReader(temp_pdf)
-    page = reader.pages[0]
-    page.merge_page(overlay.pages[0])
-    writer.add_page(page)
+def gerar_certificado(nome, caminho_pdf_original) -> bytes:
+    """Monta o certificado de `nome` sobre o template e devolve o PDF em bytes."""
+    return gerar_certificados([nome], caminho_pdf_original)
+
+
+def gerar_certificados(nomes, caminho_pdf_original) -> bytes:
+    """Um PDF com uma página por nome; o template entra uma vez só no arquivo."""
+    overlays = [_overlay(nome) for nome in nomes]
+    writer = PdfWriter()
 
-    with open(caminho_pdf_saida, "wb") as output_file:
-        writer.write(output_file)
+    # Mesclar overlay com o template numa página nova: a página do template
+    # em cache nunca é alterada
+    with _TEMPLATE_LOCK:
+        original = _template(caminho_pdf_original).pages[0]
+        for overlay in overlays:
+            page = PageObject.create_blank_page(width=original.mediabox.width, height=original.mediabox.height)
+            page.merge_page(original)
+            page.merge_page(overlay)
+            writer.add_page(page)
 
-    print(f"✅ Certificado gerado com sucesso: {caminho_pdf_saida}")
-    return caminho_pdf_saida
\ No newline at end of file
+    saida = BytesIO()
+    writer.write(saida)
+    return saida.getvalue()
@@ -0,0 +1,102 @@
+"""
+Emissão em lote dos certificados de uma turma.
+
+O render dos PDFs é CPU-bound (reportlab + PyPDF2), então roda num
+ProcessPoolExecutor com CERTIFICADOS_PROCESSOS processos. Os workers
+sobem com `spawn` (não herdam conexões de banco, threads nem locks do
+servidor) e o inicializador já parseia o template: cada worker lê o
+arquivo uma vez e reaproveita o mesmo PdfReader em todos os certificados
+(ver certificados.gerar).
+
+O resultado sai como um PDF único (uma página por aluno) ou um ZIP com
+um arquivo por aluno. No PDF único cada worker monta um bloco contíguo de
+páginas que compartilham o template (a imagem de fundo não se repete por
+página) e o processo principal só concatena os blocos. O envio por email
+não passa por aqui: vira uma tarefa por aluno na fila (certificados.fila).
+"""
+import multiprocessing
+import zipfile
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from functools import partial
+from io import BytesIO
+from PyPDF2 import PdfReader, PdfWriter
+from certificados import fila, gerar
+from conflu_ai import settings
+
+FORMATOS = {
+    'pdf': 'application/pdf',
+    'zip': 'application/zip',
+}
+
+_POOLS = {}
+
+
+def pool(processos=None):
+    """Pool de processos, criado no primeiro lote e reaproveitado nos seguintes."""
+    processos = processos or settings.CERTIFICADOS_PROCESSOS
+    if processos not in _POOLS:
+        _POOLS[processos] = ProcessPoolExecutor(
+            max_workers=processos,
+            mp_context=multiprocessing.get_context('spawn'),
+            initializer=gerar._template,
+            initargs=(settings.CERTIFICADO_BASE,),
+        )
+    return _POOLS[processos]
+
+
+def _mapear(funcao, itens, processos, chunksize=1):
+    try:
+        return list(pool(processos).map(funcao, itens, chunksize=chunksize))
+    except BrokenProcessPool:
+        # Um worker morreu (ex.: falta de memória): o próximo lote sobe outro pool
+        _POOLS.pop(processos).shutdown(wait=False)
+        raise
+
+
+def renderizar(nomes, processos=None):
+    """PDF de cada nome, na mesma ordem, renderizados em paralelo."""
+    processos = processos or settings.CERTIFICADOS_PROCESSOS
+    # Várias páginas por tarefa: menos idas e voltas de pickle entre processos
+    chunksize = max(1, len(nomes) // (processos * 4))
+    renderizar_um = partial(gerar.gerar_certificado, caminho_pdf_original=settings.CERTIFICADO_BASE)
+    return _mapear(renderizar_um, nomes, processos, chunksize)
+
+
+def renderizar_pdf_unico(nomes, processos=None) -> bytes:
+    """Todos os certificados num PDF só, na ordem de `nomes`."""
+    processos = processos or settings.CERTIFICADOS_PROCESSOS
+    tamanho = -(-len(nomes) // processos)
+    blocos = [nomes[inicio:inicio + tamanho] for inicio in range(0, len(nomes), tamanho)]
+    renderizar_bloco = partial(gerar.gerar_certificados, caminho_pdf_original=settings.CERTIFICADO_BASE)
+
+    writer = PdfWriter()
+    for bloco in _mapear(renderizar_bloco, blocos, processos):
+        for pagina in PdfReader(BytesIO(bloco)).pages:
+            writer.add_page(pagina)
+    saida = BytesIO()
+    writer.write(saida)
+    return saida.getvalue()
+
+
+def zipar(nomes, certificados) -> bytes:
+    saida = BytesIO()
+    # PDF já é comprimido: ZIP_STORED evita gastar CPU à toa
+    with zipfile.ZipFile(saida, 'w', zipfile.ZIP_STORED) as arquivo:
+        for posicao, (nome, certificado) in enumerate(zip(nomes, certificados), start=1):
+            arquivo.writestr(f"{posicao:03d}_certificado_{nome}.pdf", certificado)
+    return saida.getvalue()
+
+
+def emitir_turma(turma_id, formato='pdf', processos=None):
+    """
+    Renderiza os certificados da turma no formato pedido ('pdf' ou 'zip') e
+    devolve (quantidade, bytes do arquivo).
+    """
+    nomes = [nome for nome, _ in fila.alunos_da_turma(turma_id)]
+    if not nomes:
+        return 0, None
+
+    if formato == 'pdf':
+        return len(nomes), renderizar_pdf_unico(nomes, processos)
+    return len(nomes), zipar(nomes, renderizar(nomes, processos))
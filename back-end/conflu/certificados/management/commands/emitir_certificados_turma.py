@@ -0,0 +1,41 @@
+import time
+from pathlib import Path
+from django.core.management.base import BaseCommand, CommandError
+from cadastro.models import Turma
+from certificados import fila, lote
+
+
+class Command(BaseCommand):
+    help = 'Emite os certificados de todos os alunos de uma turma (por email, pela fila, ou em PDF único/ZIP)'
+
+    def add_arguments(self, parser):
+        parser.add_argument('turma', type=int)
+        parser.add_argument('--formato', choices=['email', *lote.FORMATOS], default='email')
+        parser.add_argument('--saida', help='Arquivo de saída (formatos pdf e zip)')
+        parser.add_argument('--processos', type=int, help='Processos de render (padrão: CERTIFICADOS_PROCESSOS)')
+
+    def handle(self, *args, **kwargs):
+        if not Turma.objects.filter(pk=kwargs['turma']).exists():
+            raise CommandError(f"Turma {kwargs['turma']} não encontrada.")
+
+        formato = kwargs['formato']
+        if formato == 'email':
+            # Como a view: uma tarefa por aluno, com novas tentativas e status no banco
+            tarefas = fila.enfileirar_turma(kwargs['turma'])
+            if not tarefas:
+                raise CommandError("A turma não tem alunos matriculados.")
+            self.stdout.write(self.style.SUCCESS(
+                f"✅ {len(tarefas)} certificado(s) na fila de envio (processados por `manage.py worker_certificados`)."
+            ))
+            return
+
+        inicio = time.perf_counter()
+        quantidade, resultado = lote.emitir_turma(kwargs['turma'], formato, kwargs['processos'])
+        duracao = time.perf_counter() - inicio
+
+        if not quantidade:
+            raise CommandError("A turma não tem alunos matriculados.")
+
+        saida = Path(kwargs['saida'] or f"certificados_turma_{kwargs['turma']}.{formato}")
+        saida.write_bytes(resultado)
+        self.stdout.write(self.style.SUCCESS(f"✅ {quantidade} certificado(s) gerado(s) em {duracao:.1f}s: {saida}"))
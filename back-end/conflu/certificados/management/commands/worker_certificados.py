@@ -0,0 +1,33 @@
+import time
+from django.core.management.base import BaseCommand
+from django.db import DatabaseError, close_old_connections
+from certificados import fila
+
+
+class Command(BaseCommand):
+    help = 'Processa a fila de certificados (gera o PDF e envia por email), com novas tentativas em caso de erro'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--intervalo', type=float, default=2, help='Segundos de espera quando a fila está vazia')
+        parser.add_argument('--uma-vez', action='store_true', help='Esvazia a fila e encerra')
+
+    def handle(self, *args, **kwargs):
+        while True:
+            close_old_connections()
+            try:
+                tarefa = fila.reservar()
+            except DatabaseError as e:
+                # Ex.: banco ainda sendo migrado pelo `serve` na subida do container
+                self.stderr.write(f"⚠️ Fila indisponível: {e}")
+                time.sleep(kwargs['intervalo'])
+                continue
+            if tarefa is None:
+                if kwargs['uma_vez']:
+                    return
+                time.sleep(kwargs['intervalo'])
+                continue
+
+            if fila.executar(tarefa):
+                self.stdout.write(self.style.SUCCESS(f"✅ Certificado {tarefa.id} enviado para {tarefa.email}."))
+            else:
+                self.stderr.write(f"❌ Certificado {tarefa.id} ({tarefa.email}), tentativa {tarefa.tentativas}: falhou.")
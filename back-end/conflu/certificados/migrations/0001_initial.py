@@ -0,0 +1,31 @@
+# Generated by Django 5.2.7 on 2026-10-18 18:55
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    initial = True
+
+    dependencies = [
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='TarefaCertificado',
+            fields=[
+                ('id', models.AutoField(primary_key=True, serialize=False)),
+                ('nome', models.CharField(max_length=100)),
+                ('email', models.CharField(max_length=70)),
+                ('status', models.CharField(choices=[('pendente', 'Pendente'), ('processando', 'Processando'), ('concluida', 'Concluída'), ('falhou', 'Falhou')], default='pendente', max_length=20)),
+                ('tentativas', models.PositiveIntegerField(default=0)),
+                ('proxima_tentativa', models.DateTimeField()),
+                ('erro', models.TextField(blank=True, null=True)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('concluido_em', models.DateTimeField(blank=True, null=True)),
+            ],
+            options={
+                'indexes': [models.Index(fields=['status', 'proxima_tentativa'], name='tarefa_cert_fila_idx')],
+            },
+        ),
+    ]
@@ -1,3 +1,34 @@
 from django.db import models
 
 # Create your models here.
+class TarefaCertificado(models.Model):
+    # Fila de emissão de certificados, consumida por `manage.py worker_certificados` (ver certificados.fila)
+    PENDENTE = 'pendente'
+    PROCESSANDO = 'processando'
+    CONCLUIDA = 'concluida'
+    FALHOU = 'falhou'
+    STATUS = [
+        (PENDENTE, 'Pendente'),
+        (PROCESSANDO, 'Processando'),
+        (CONCLUIDA, 'Concluída'),
+        (FALHOU, 'Falhou'),
+    ]
+
+    id = models.AutoField(primary_key=True)
+    nome = models.CharField(max_length=100, null=False, blank=False)
+    email = models.CharField(max_length=70, null=False, blank=False)
+    status = models.CharField(max_length=20, choices=STATUS, default=PENDENTE)
+    tentativas = models.PositiveIntegerField(default=0)
+    # Pendente: quando pode ser tentada. Processando: até quando a reserva do worker vale.
+    proxima_tentativa = models.DateTimeField()
+    erro = models.TextField(null=True, blank=True)
+    created_at = models.DateTimeField(auto_now_add=True)
+    concluido_em = models.DateTimeField(null=True, blank=True)
+
+    class Meta:
+        indexes = [
+            models.Index(fields=['status', 'proxima_tentativa'], name='tarefa_cert_fila_idx'),
+        ]
+
+    def __str__(self):
+        return f"Certificado - {self.id} / {self.email} ({self.status})"
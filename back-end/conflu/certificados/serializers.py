@@ -0,0 +1,8 @@
+from rest_framework import serializers
+from certificados.models import TarefaCertificado
+
+
+class TarefaCertificadoSerializer(serializers.ModelSerializer):
+    class Meta:
+        model = TarefaCertificado
+        fields = ['id', 'nome', 'email', 'status', 'tentativas', 'proxima_tentativa', 'erro', 'created_at', 'concluido_em']
@@ -0,0 +1,68 @@
+"""
+Trabalho bloqueante dos certificados (montagem do PDF e envio por SMTP).
+
+`emitir` faz tudo de uma vez e é chamado pelo worker da fila
+(certificados.fila), que registra o erro e agenda a nova tentativa;
+views e comandos só enfileiram. O número de conexões SMTP simultâneas é
+o número de workers rodando.
+
+reportlab, PyPDF2 (via certificados.gerar), smtplib e ssl são importados
+no primeiro uso: carregar as URLs não paga por eles em workers que
+nunca emitem certificado.
+"""
+from email.message import EmailMessage
+from conflu_ai import settings
+
+# Segundos por operação de rede. Bem abaixo da reserva da fila
+# (fila.RESERVA, 5 min): um servidor travado vira erro e nova tentativa,
+# em vez de a reserva vencer e outro worker enviar o mesmo certificado.
+SMTP_TIMEOUT = 60
+
+
+def _mensagem(aluno_email: str, aluno_nome: str, certificado: bytes) -> EmailMessage:
+    msg = EmailMessage()
+    msg['From'] = settings.SMTP_CONFIG['admin']
+    msg['To'] = aluno_email
+    msg['Subject'] = f"CERTIFICADO - {aluno_nome}"
+
+    msg.set_content(f"""
+        Olá, {aluno_nome}! Segue em anexo o certificado referente ao curso concluído.
+            
+        Atenciosamente, Equipe Conflu AI
+    """)
+
+    # Anexa o PDF
+    msg.add_attachment(
+        certificado,
+        maintype='application',
+        subtype='pdf',
+        filename=f"certificado_{aluno_nome}.pdf"
+    )
+    return msg
+
+
+def enviar_smtp(aluno_email: str, aluno_nome: str, certificado: bytes) -> None:
+    """Envia o certificado por SMTP; erros de conexão/autenticação sobem para quem chamou."""
+    import smtplib
+    import ssl
+
+    msg = _mensagem(aluno_email, aluno_nome, certificado)
+    safe = ssl.create_default_context()
+    with smtplib.SMTP_SSL(host=str(settings.SMTP_CONFIG['server']), port=465, context=safe, timeout=SMTP_TIMEOUT) as smtp:
+        smtp.login(settings.SMTP_CONFIG['admin'], settings.SMTP_CONFIG['password'])
+        smtp.sendmail(
+            from_addr=settings.SMTP_CONFIG['admin'],
+            to_addrs=aluno_email,
+            msg=msg.as_string()
+        )
+
+
+def emitir(aluno_nome: str, aluno_email: str) -> None:
+    """Gera o certificado em memória e envia por email; erros sobem para a fila registrar."""
+    from certificados.gerar import gerar_certificado
+
+    certificado = gerar_certificado(
+        nome=aluno_nome,
+        caminho_pdf_original=settings.CERTIFICADO_BASE,
+    )
+    enviar_smtp(aluno_email, aluno_nome, certificado)
@@ -1,3 +1,226 @@
-from django.test import TestCase
+from datetime import timedelta
+from io import BytesIO
+from unittest import mock
+from PyPDF2 import PdfReader
+from django.conf import settings
+from django.core.management import CommandError, call_command
+from django.test import SimpleTestCase, TestCase, override_settings
+from django.utils import timezone
+from cadastro.models import Aluno, Curso, Matricula, Turma
+from certificados import fila, gerar
+from certificados.models import TarefaCertificado
 
-# Create your tests here.
+
+def vencer(tarefa):
+    TarefaCertificado.objects.filter(pk=tarefa.pk).update(proxima_tentativa=timezone.now() - timedelta(seconds=1))
+
+
+class FilaTests(TestCase):
+
+    def setUp(self):
+        self.tarefa = fila.enfileirar('Ana', 'ana@teste')
+
+    def test_reserva(self):
+        reservada = fila.reservar()
+        self.assertEqual(reservada.pk, self.tarefa.pk)
+        self.assertEqual(reservada.status, TarefaCertificado.PROCESSANDO)
+        self.assertEqual(reservada.tentativas, 1)
+        self.assertGreater(reservada.proxima_tentativa, timezone.now() + fila.RESERVA - timedelta(seconds=5))
+        # Reservada e dentro do prazo: ninguém mais pega
+        self.assertIsNone(fila.reservar())
+
+    def test_reserva_disputada(self):
+        # Este worker leu a tarefa, mas outro a reservou antes do UPDATE
+        lida = TarefaCertificado.objects.get(pk=self.tarefa.pk)
+        outro = fila.reservar()
+        with mock.patch('django.db.models.query.QuerySet.first', side_effect=[lida, None]):
+            self.assertIsNone(fila.reservar())
+        outro.refresh_from_db()
+        self.assertEqual(outro.tentativas, 1)
+
+    def test_sucesso(self):
+        tarefa = fila.reservar()
+        with mock.patch('certificados.tarefas.emitir') as emitir:
+            self.assertTrue(fila.executar(tarefa))
+        emitir.assert_called_once_with('Ana', 'ana@teste')
+        tarefa.refresh_from_db()
+        self.assertEqual(tarefa.status, TarefaCertificado.CONCLUIDA)
+        self.assertIsNotNone(tarefa.concluido_em)
+        self.assertIsNone(tarefa.erro)
+
+    def test_falha_reagenda_com_espera_exponencial(self):
+        with mock.patch('certificados.tarefas.emitir', side_effect=OSError('smtp fora')):
+            for tentativa in (1, 2):
+                tarefa = fila.reservar()
+                self.assertEqual(tarefa.tentativas, tentativa)
+                antes = timezone.now()
+                self.assertFalse(fila.executar(tarefa))
+                tarefa.refresh_from_db()
+                self.assertEqual(tarefa.status, TarefaCertificado.PENDENTE)
+                self.assertEqual(tarefa.erro, 'OSError: smtp fora')
+                self.assertGreaterEqual(tarefa.proxima_tentativa, antes + fila.espera(tentativa))
+                # Ainda esperando: não é reservada antes do prazo
+                self.assertIsNone(fila.reservar())
+                vencer(tarefa)
+        self.assertEqual(fila.espera(2), 2 * fila.espera(1))
+
+    def test_falha_definitiva(self):
+        with mock.patch('certificados.tarefas.emitir', side_effect=OSError('smtp fora')):
+            for _ in range(fila.MAX_TENTATIVAS):
+                self.assertFalse(fila.executar(fila.reservar()))
+                vencer(self.tarefa)
+        self.tarefa.refresh_from_db()
+        self.assertEqual(self.tarefa.status, TarefaCertificado.FALHOU)
+        self.assertEqual(self.tarefa.tentativas, fila.MAX_TENTATIVAS)
+        self.assertIsNone(fila.reservar())
+
+    def test_worker_interrompido(self):
+        # Reserva vencida sem resultado gravado: volta para a fila até o limite
+        for tentativa in range(1, fila.MAX_TENTATIVAS + 1):
+            self.assertEqual(fila.reservar().tentativas, tentativa)
+            vencer(self.tarefa)
+        self.assertIsNone(fila.reservar())
+        self.tarefa.refresh_from_db()
+        self.assertEqual(self.tarefa.status, TarefaCertificado.FALHOU)
+        self.assertIn('Reserva vencida', self.tarefa.erro)
+
+    def test_resultado_de_reserva_vencida_e_ignorado(self):
+        antiga = fila.reservar()
+        vencer(antiga)
+        atual = fila.reservar()
+        with mock.patch('certificados.tarefas.emitir', side_effect=OSError('tarde demais')):
+            fila.executar(antiga)
+        atual.refresh_from_db()
+        self.assertEqual(atual.status, TarefaCertificado.PROCESSANDO)
+        self.assertIsNone(atual.erro)
+
+
+class CertificadoViewTests(TestCase):
+
+    def test_create_enfileira(self):
+        resposta = self.client.post('/api/certificados/', {'nome': 'Ana', 'email': 'ana@teste'}, content_type='application/json')
+        self.assertEqual(resposta.status_code, 202)
+        tarefa_id = resposta.json()['data']['id']
+
+        resposta = self.client.get(f'/api/certificados/{tarefa_id}/')
+        self.assertEqual(resposta.status_code, 200)
+        self.assertEqual(resposta.json()['data']['status'], TarefaCertificado.PENDENTE)
+        self.assertEqual(self.client.get('/api/certificados/999/').status_code, 404)
+
+        resposta = self.client.post('/api/certificados/', {'nome': 'Ana'}, content_type='application/json')
+        self.assertEqual(resposta.status_code, 400)
+
+    def test_turma_por_email_enfileira(self):
+        hoje = timezone.localdate()
+        curso = Curso.objects.create(nome='Curso', valor=100, quant_dias=1)
+        turma = Turma.objects.create(curso_id=curso, localidade='Sala 1', data_inicio=hoje, data_fim=hoje)
+        vazia = Turma.objects.create(curso_id=curso, localidade='Sala 2', data_inicio=hoje, data_fim=hoje)
+        for i in range(3):
+            aluno = Aluno.objects.create(nome=f'Aluno {i}', email=f'aluno{i}@teste')
+            Matricula.objects.create(aluno_id=aluno, turma_id=turma, fonte='teste', data_matricula=hoje)
+
+        with mock.patch('certificados.tarefas.enviar_smtp') as enviar_smtp:
+            resposta = self.client.post('/api/certificados/turma/', {'turma': turma.pk}, content_type='application/json')
+        enviar_smtp.assert_not_called()
+        self.assertEqual(resposta.status_code, 202)
+        self.assertEqual(resposta.json()['data']['quantidade'], 3)
+        self.assertEqual(
+            sorted(TarefaCertificado.objects.values_list('email', flat=True)),
+            ['aluno0@teste', 'aluno1@teste', 'aluno2@teste'],
+        )
+
+        resposta = self.client.post('/api/certificados/turma/', {'turma': vazia.pk}, content_type='application/json')
+        self.assertEqual(resposta.status_code, 400)
+        resposta = self.client.post('/api/certificados/turma/', {'turma': 999}, content_type='application/json')
+        self.assertEqual(resposta.status_code, 404)
+        resposta = self.client.post('/api/certificados/turma/', {'turma': turma.pk, 'formato': 'doc'}, content_type='application/json')
+        self.assertEqual(resposta.status_code, 400)
+
+    @override_settings(CERTIFICADOS_MAX_ARQUIVO=2)
+    def test_turma_em_arquivo_tem_limite(self):
+        hoje = timezone.localdate()
+        curso = Curso.objects.create(nome='Curso', valor=100, quant_dias=1)
+        turma = Turma.objects.create(curso_id=curso, localidade='Sala 1', data_inicio=hoje, data_fim=hoje)
+
+        def matricular(i):
+            aluno = Aluno.objects.create(nome=f'Aluno {i}', email=f'aluno{i}@teste')
+            Matricula.objects.create(aluno_id=aluno, turma_id=turma, fonte='teste', data_matricula=hoje)
+
+        for i in range(2):
+            matricular(i)
+        with mock.patch('certificados.lote.emitir_turma', return_value=(2, b'%PDF')) as emitir:
+            resposta = self.client.post('/api/certificados/turma/', {'turma': turma.pk, 'formato': 'pdf'}, content_type='application/json')
+        self.assertEqual(resposta.status_code, 200)
+        self.assertEqual(resposta['Content-Type'], 'application/pdf')
+        emitir.assert_called_once_with(turma.pk, 'pdf')
+
+        matricular(2)
+        with mock.patch('certificados.lote.emitir_turma') as emitir:
+            for formato in ('pdf', 'zip'):
+                resposta = self.client.post('/api/certificados/turma/', {'turma': turma.pk, 'formato': formato}, content_type='application/json')
+                self.assertEqual(resposta.status_code, 400)
+                self.assertIn('emitir_certificados_turma', resposta.json()['msg'])
+        emitir.assert_not_called()
+
+
+class EmitirTurmaComandoTests(TestCase):
+
+    def test_email_enfileira(self):
+        hoje = timezone.localdate()
+        curso = Curso.objects.create(nome='Curso', valor=100, quant_dias=1)
+        turma = Turma.objects.create(curso_id=curso, localidade='Sala 1', data_inicio=hoje, data_fim=hoje)
+        vazia = Turma.objects.create(curso_id=curso, localidade='Sala 2', data_inicio=hoje, data_fim=hoje)
+        for i in range(2):
+            aluno = Aluno.objects.create(nome=f'Aluno {i}', email=f'aluno{i}@teste')
+            Matricula.objects.create(aluno_id=aluno, turma_id=turma, fonte='teste', data_matricula=hoje)
+
+        with mock.patch('certificados.tarefas.enviar_smtp') as enviar_smtp, \
+                mock.patch('certificados.lote.emitir_turma') as emitir_turma:
+            call_command('emitir_certificados_turma', turma.pk, stdout=mock.Mock())
+        enviar_smtp.assert_not_called()
+        emitir_turma.assert_not_called()
+        self.assertEqual(
+            list(TarefaCertificado.objects.order_by('email').values_list('email', 'status')),
+            [('aluno0@teste', TarefaCertificado.PENDENTE), ('aluno1@teste', TarefaCertificado.PENDENTE)],
+        )
+
+        with self.assertRaises(CommandError):
+            call_command('emitir_certificados_turma', vazia.pk, stdout=mock.Mock())
+        with self.assertRaises(CommandError):
+            call_command('emitir_certificados_turma', 999, stdout=mock.Mock())
+
+
+class EnvioSmtpTests(TestCase):
+
+    def test_timeout_menor_que_a_reserva(self):
+        from certificados import tarefas
+
+        with mock.patch('smtplib.SMTP_SSL') as smtp:
+            tarefas.enviar_smtp('ana@teste', 'Ana', b'%PDF')
+        timeout = smtp.call_args.kwargs['timeout']
+        self.assertLess(timeout, fila.RESERVA.total_seconds())
+
+
+class GerarCertificadoTests(SimpleTestCase):
+
+    def paginas(self, pdf):
+        return [pagina.extract_text() for pagina in PdfReader(BytesIO(pdf)).pages]
+
+    def test_nome_no_pdf(self):
+        pdf = gerar.gerar_certificado('Maria da Silva', settings.CERTIFICADO_BASE)
+        self.assertTrue(pdf.startswith(b'%PDF'))
+        [texto] = self.paginas(pdf)
+        self.assertIn('Maria da Silva', texto)
+
+    def test_template_em_cache_nao_acumula_nomes(self):
+        gerar.gerar_certificado('Maria da Silva', settings.CERTIFICADO_BASE)
+        [texto] = self.paginas(gerar.gerar_certificado('João Souza', settings.CERTIFICADO_BASE))
+        self.assertIn('João Souza', texto)
+        self.assertNotIn('Maria da Silva', texto)
+
+    def test_uma_pagina_por_nome(self):
+        textos = self.paginas(gerar.gerar_certificados(['Ana', 'Bruno Lima'], settings.CERTIFICADO_BASE))
+        self.assertEqual(len(textos), 2)
+        self.assertIn('Ana', textos[0])
+        self.assertIn('Bruno Lima', textos[1])
+        self.assertNotIn('Bruno Lima', textos[0])
@@ -9,5 +9,6 @@ router.register('certificados', views.GerarCertificadoViewSet, basename='certifi
 
 
 urlpatterns = [
-    path('', include(router.urls))
+    path('', include(router.urls)),
+    path('async/certificados/', views.GerarCertificadoAsync.as_view(), name='certificados-async'),
 ]
\ No newline at end of file
@@ -1,11 +1,16 @@
-from conflu_ai import settings
-from email.message import EmailMessage
+import json
+from django.conf import settings
+from django.http import HttpResponse, JsonResponse
+from django.utils.decorators import method_decorator
+from django.views import View
+from django.views.decorators.csrf import csrf_exempt
 from rest_framework import viewsets
+from rest_framework.decorators import action
 from rest_framework.response import Response
-from certificados.gerar import gerar_certificado
-import smtplib
-import ssl
-import os
+from cadastro.models import Matricula, Turma
+from certificados import fila
+from certificados.models import TarefaCertificado
+from certificados.serializers import TarefaCertificadoSerializer
 
 # Create your views here.
 class GerarCertificadoViewSet(viewsets.ViewSet):
@@ -17,58 +22,77 @@ class GerarCertificadoViewSet(viewsets.ViewSet):
 
             if not aluno_email or not aluno_nome:
                 return Response({"msg": "Envie o nome e o email do Aluno"}, status=400)
-            
-             # Caminhos
-            pdf_original = settings.CERTIFICADO_BASE  # coloque no settings
-            pdf_saida = f"certificado_{aluno_nome}.pdf"
-
-            path_arquivo_final = gerar_certificado(
-                nome=aluno_nome,
-                caminho_pdf_original=pdf_original,
-                caminho_pdf_saida=pdf_saida
-            )
-             # Envia o certificado
-            enviado = self.send(aluno_email, aluno_nome, path_arquivo_final)
-
-            if enviado:
-                # remove o arquivo após enviar
-                os.remove(path_arquivo_final)
-                return Response({"msg": "Certificado enviado com sucesso!"}, status=200)
-
-            return Response({"msg": "Erro ao enviar certificado"}, status=400)
-
-            
-    def send(self, aluno_email: str, aluno_nome: str, caminho_certificado: str) -> bool | None:
-        msg = EmailMessage()
-        msg['From'] = settings.SMTP_CONFIG['admin']
-        msg['To'] = aluno_email
-        msg['Subject'] = f"CERTIFICADO - {aluno_nome}"
-        
-        msg.set_content(f"""
-            Olá, {aluno_nome}! Segue em anexo o certificado referente ao curso concluído.
-                
-            Atenciosamente, Equipe Conflu AI
-        """)
-
-         # Anexa o PDF
-        with open(caminho_certificado, 'rb') as arq:
-            msg.add_attachment(
-                arq.read(),
-                maintype='application',
-                subtype='pdf',
-                filename=os.path.basename(caminho_certificado)
-            )
-
-        safe = ssl.create_default_context()
+
+            # PDF e SMTP ficam com o worker (manage.py worker_certificados)
+            tarefa = fila.enfileirar(aluno_nome, aluno_email)
+            return Response({"msg": "Certificado na fila de envio", "data": TarefaCertificadoSerializer(tarefa).data}, status=202)
+
+    def retrieve(self, request, pk=None):
+        try:
+            tarefa = TarefaCertificado.objects.get(pk=pk)
+        except (TarefaCertificado.DoesNotExist, ValueError):
+            return Response({"msg": "Tarefa não encontrada"}, status=404)
+
+        return Response({"data": TarefaCertificadoSerializer(tarefa).data}, status=200)
+
+    @action(detail=False, methods=['post'])
+    def turma(self, request):
+        turma_id = request.data.get("turma", None)
+        formato = request.data.get("formato", "email")
+
         try:
-            with smtplib.SMTP_SSL(host=str(settings.SMTP_CONFIG['server']), port=465, context=safe) as smtp:
-                smtp.login(settings.SMTP_CONFIG['admin'], settings.SMTP_CONFIG['password'])
-                smtp.sendmail(
-                    from_addr=settings.SMTP_CONFIG['admin'],
-                    to_addrs=aluno_email,
-                    msg=msg.as_string()
-                )
-            return True
-        except Exception as e:
-            print(e)
-            return False
\ No newline at end of file
+            turma = Turma.objects.get(pk=int(turma_id))
+        except (TypeError, ValueError):
+            return Response({"msg": "Envie o id da Turma"}, status=400)
+        except Turma.DoesNotExist:
+            return Response({"msg": "Turma não encontrada"}, status=404)
+
+        if formato == "email":
+            # Uma tarefa por aluno; o envio fica com o worker, como no create
+            tarefas_turma = fila.enfileirar_turma(turma.pk)
+            if not tarefas_turma:
+                return Response({"msg": "A turma não tem alunos matriculados"}, status=400)
+            dados = {"quantidade": len(tarefas_turma), "tarefas": [tarefa.id for tarefa in tarefas_turma]}
+            return Response({"msg": f"{len(tarefas_turma)} certificado(s) na fila de envio", "data": dados}, status=202)
+
+        # Importado aqui: o módulo carrega PyPDF2/reportlab (ver comando serve)
+        from certificados import lote
+
+        if formato not in lote.FORMATOS:
+            return Response({"msg": f"Formato inválido. Opções: email, {', '.join(lote.FORMATOS)}."}, status=400)
+
+        # O PDF/ZIP é renderizado dentro da requisição: turmas grandes ficam com o comando
+        alunos = Matricula.objects.filter(turma_id=turma.pk).count()
+        if alunos > settings.CERTIFICADOS_MAX_ARQUIVO:
+            return Response({
+                "msg": f"A turma tem {alunos} alunos; o {formato.upper()} pela API vai até {settings.CERTIFICADOS_MAX_ARQUIVO}. "
+                       f"Use o formato email ou `manage.py emitir_certificados_turma`."
+            }, status=400)
+
+        quantidade, resultado = lote.emitir_turma(turma.pk, formato)
+        if not quantidade:
+            return Response({"msg": "A turma não tem alunos matriculados"}, status=400)
+
+        response = HttpResponse(resultado, content_type=lote.FORMATOS[formato])
+        response['Content-Disposition'] = f'attachment; filename="certificados_turma_{turma.pk}.{formato}"'
+        return response
+
+
+# Versão async (ASGI): só grava a tarefa na fila, como a versão síncrona.
+@method_decorator(csrf_exempt, name='dispatch')
+class GerarCertificadoAsync(View):
+
+    async def post(self, request):
+        try:
+            dados = json.loads(request.body or b'{}')
+        except ValueError:
+            dados = request.POST
+
+        aluno_nome = dados.get("nome", None)
+        aluno_email = dados.get("email", None)
+
+        if not aluno_email or not aluno_nome:
+            return JsonResponse({"msg": "Envie o nome e o email do Aluno"}, status=400)
+
+        tarefa = await fila.aenfileirar(aluno_nome, aluno_email)
+        return JsonResponse({"msg": "Certificado na fila de envio", "data": TarefaCertificadoSerializer(tarefa).data}, status=202)
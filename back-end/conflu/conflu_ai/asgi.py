@@ -14,3 +14,13 @@ from django.core.asgi import get_asgi_application
 os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'conflu_ai.settings')
 
 application = get_asgi_application()
+
+# Servido por uvicorn (manage.py serve --asgi) só para as views async de
+# /api/async/; a API síncrona fica no WSGI (conflu_ai.wsgi). Em DEBUG, os
+# arquivos estáticos (admin) são servidos como no runserver.
+from django.conf import settings
+
+if settings.DEBUG:
+    from django.contrib.staticfiles.handlers import ASGIStaticFilesHandler
+
+    application = ASGIStaticFilesHandler(application)
@@ -44,6 +44,13 @@ SMTP_CONFIG = {
 
 CERTIFICADO_BASE = BASE_DIR / "data" / "template_certificado.pdf"
 
+# Processos para renderizar os certificados de uma turma inteira (ver certificados.lote)
+CERTIFICADOS_PROCESSOS = int(os.getenv("CERTIFICADOS_PROCESSOS", os.cpu_count() or 1))
+
+# Máximo de alunos para gerar o PDF/ZIP de uma turma dentro da requisição;
+# turmas maiores usam `manage.py emitir_certificados_turma`
+CERTIFICADOS_MAX_ARQUIVO = int(os.getenv("CERTIFICADOS_MAX_ARQUIVO", 300))
+
 # Application definition
 
 INSTALLED_APPS = [
@@ -56,6 +63,7 @@ INSTALLED_APPS = [
     'rest_framework',
     'corsheaders',
     'cadastro',
+    'certificados',
     'login'
 ]
 
@@ -93,13 +101,63 @@ WSGI_APPLICATION = 'conflu_ai.wsgi.application'
 # Database
 # https://docs.djangoproject.com/en/5.2/ref/settings/#databases
 
+# PRAGMAs aplicados a cada conexão nova (OPTIONS['init_command']):
+# WAL deixa leitores e um escritor trabalharem ao mesmo tempo;
+# synchronous=NORMAL é seguro em WAL e evita um fsync por commit;
+# mmap_size e cache_size (KiB, negativo) mantêm as páginas quentes em memória.
+SQLITE_PRAGMAS = {
+    'journal_mode': 'WAL',
+    'synchronous': 'NORMAL',
+    'busy_timeout': 5000,
+    'mmap_size': 134217728,
+    'cache_size': -20000,
+    'temp_store': 'MEMORY',
+}
+
+# Banco e réplica ficam fora do código para serem compartilhados entre os
+# containers (web, worker e atualizador da réplica) por um volume
+DATA_DIR = Path(os.getenv("CONFLU_DATA_DIR", BASE_DIR))
+
+REPLICA_PATH = DATA_DIR / 'db.replica.sqlite3'
+
+# Imagens dos QR codes das aulas (ver cadastro.qrcodes), no mesmo volume
+# para que todos os containers sirvam e regenerem os mesmos arquivos
+QRCODE_DIR = DATA_DIR / "media" / "qrcodes"
+
 DATABASES = {
     'default': {
         'ENGINE': 'django.db.backends.sqlite3',
-        'NAME': BASE_DIR / 'db.sqlite3',
-    }
+        'NAME': DATA_DIR / 'db.sqlite3',
+        # Reaproveita a conexão entre requisições (com checagem antes do uso)
+        'CONN_MAX_AGE': 600,
+        'CONN_HEALTH_CHECKS': True,
+        'OPTIONS': {
+            'init_command': ';'.join(f'PRAGMA {nome}={valor}' for nome, valor in SQLITE_PRAGMAS.items()),
+            # Transações de escrita pegam o lock na abertura (BEGIN IMMEDIATE)
+            # em vez de falhar com "database is locked" ao promover o lock no meio
+            'transaction_mode': 'IMMEDIATE',
+        },
+    },
+    # Cópia somente leitura para relatórios e exportações (cadastro.replica).
+    # immutable=1 dispensa locks: o arquivo nunca muda, é substituído inteiro
+    # pelo comando atualizar_replica. CONN_MAX_AGE=0 para cada requisição
+    # abrir o snapshot mais recente.
+    'replica': {
+        'ENGINE': 'django.db.backends.sqlite3',
+        'NAME': f"file:{REPLICA_PATH}?mode=ro&immutable=1",
+        'CONN_MAX_AGE': 0,
+        'OPTIONS': {
+            'init_command': ';'.join(
+                f'PRAGMA {nome}={valor}' for nome, valor in SQLITE_PRAGMAS.items()
+                if nome in ('mmap_size', 'cache_size', 'temp_store')
+            ),
+        },
+        'TEST': {'MIRROR': 'default'},
+    },
 }
 
+DATABASE_ROUTERS = ['cadastro.replica.ReplicaRouter']
+
 
 # Password validation
 # https://docs.djangoproject.com/en/5.2/ref/settings/#auth-password-validators
@@ -14,3 +14,12 @@ from django.core.wsgi import get_wsgi_application
 os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'conflu_ai.settings')
 
 application = get_wsgi_application()
+
+# Servido pelo gunicorn com workers gthread (manage.py serve). Em DEBUG,
+# os arquivos estáticos (admin) são servidos como no runserver.
+from django.conf import settings
+
+if settings.DEBUG:
+    from django.contrib.staticfiles.handlers import StaticFilesHandler
+
+    application = StaticFilesHandler(application)
@@ -15,6 +15,9 @@ export default function AlunosPage() {
     alunos,
     isLoadingList: isLoading,
     errorList: error,
+    hasMore,
+    carregarMais,
+    isLoadingMore,
     createAluno,
     updateAluno,
     deleteAluno,
@@ -125,6 +128,9 @@ export default function AlunosPage() {
         data={alunos}
         columns={columns}
         isLoading={isLoading}
+        hasMore={hasMore}
+        onLoadMore={carregarMais}
+        isLoadingMore={isLoadingMore}
         onAdd={handleAdd}
         onEdit={handleEdit}
         onView={handleView}
@@ -15,6 +15,9 @@ export default function CursosPage() {
     cursos,
     isLoadingList: isLoading,
     errorList: error,
+    hasMore,
+    carregarMais,
+    isLoadingMore,
     createCurso,
     updateCurso,
     deleteCurso,
@@ -125,6 +128,9 @@ export default function CursosPage() {
         data={cursos}
         columns={columns}
         isLoading={isLoading}
+        hasMore={hasMore}
+        onLoadMore={carregarMais}
+        isLoadingMore={isLoadingMore}
         onAdd={handleAdd}
         onEdit={handleEdit}
         onView={handleView}
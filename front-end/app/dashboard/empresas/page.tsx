@@ -15,6 +15,9 @@ export default function EmpresasPage() {
     empresas,
     isLoadingList: isLoading,
     errorList: error,
+    hasMore,
+    carregarMais,
+    isLoadingMore,
     createEmpresa,
     updateEmpresa,
     deleteEmpresa,
@@ -119,6 +122,9 @@ export default function EmpresasPage() {
         data={empresas}
         columns={columns}
         isLoading={isLoading}
+        hasMore={hasMore}
+        onLoadMore={carregarMais}
+        isLoadingMore={isLoadingMore}
         onAdd={handleAdd}
         onEdit={handleEdit}
         onView={handleView}
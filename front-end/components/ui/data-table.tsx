@@ -33,6 +33,10 @@ interface DataTableProps<T> {
   addButtonText?: string
   searchPlaceholder?: string
   emptyMessage?: string
+  // Paginação por cursor: mostra "Carregar mais" enquanto houver próxima página
+  hasMore?: boolean
+  onLoadMore?: () => void
+  isLoadingMore?: boolean
 }
 
 export function DataTable<T extends { id: number }>({
@@ -47,7 +51,10 @@ export function DataTable<T extends { id: number }>({
   onDelete,
   addButtonText = 'Adicionar',
   searchPlaceholder = 'Buscar...',
-  emptyMessage = 'Nenhum item encontrado.'
+  emptyMessage = 'Nenhum item encontrado.',
+  hasMore = false,
+  onLoadMore,
+  isLoadingMore = false
 }: DataTableProps<T>) {
   const hasActions = onEdit || onView || onDelete
 
@@ -200,6 +207,17 @@ export function DataTable<T extends { id: number }>({
           </TableBody>
         </Table>
       </div>
+
+      {onLoadMore && hasMore && (
+        <div className="flex items-center justify-between">
+          <span className="text-sm text-muted-foreground">
+            {data.length} registros carregados
+          </span>
+          <Button variant="outline" onClick={onLoadMore} disabled={isLoadingMore}>
+            {isLoadingMore ? 'Carregando...' : 'Carregar mais'}
+          </Button>
+        </div>
+      )}
     </div>
   )
 }
\ No newline at end of file
@@ -33,6 +33,11 @@ export {
   useEmpresasOptions
 } from './useEmpresas'
 
+// Hooks para o Dashboard
+export {
+  useDashboardSummary
+} from './useDashboard'
+
 // Re-export dos tipos para conveniência
 export type {
   Aluno,
@@ -1,28 +1,35 @@
 'use client'
 
-import { useQuery, useMutation, useQueryClient, UseQueryResult } from '@tanstack/react-query'
-import { apiClient } from '@/lib/api-client'
+import { useInfiniteQuery, useQuery, useMutation, useQueryClient, UseQueryResult } from '@tanstack/react-query'
+import { apiClient, cursorDaPagina } from '@/lib/api-client'
+import { dashboardSummaryQuery } from './useDashboard'
 import type { 
   Aluno, 
   CreateAlunoData, 
   UpdateAlunoData, 
   AlunoFilters,
-  PaginationParams 
+  PaginationParams,
+  DashboardSummary
 } from '@/lib/types'
 
-// Hook para listar alunos com filtros
+// Hook para listar alunos com filtros; as páginas seguintes vêm sob demanda (carregarMais)
 export function useAlunos(filters?: AlunoFilters & PaginationParams) {
-  const { data: alunos, isLoading, error, refetch } = useQuery({
+  const { data, isLoading, error, refetch, hasNextPage, fetchNextPage, isFetchingNextPage } = useInfiniteQuery({
     queryKey: ['alunos', filters],
-    queryFn: () => apiClient.alunos.list(filters),
+    queryFn: ({ pageParam }) => apiClient.alunos.list({ ...filters, cursor: pageParam }),
+    initialPageParam: filters?.cursor,
+    getNextPageParam: (page) => cursorDaPagina(page.next),
     staleTime: 5 * 60 * 1000, // 5 minutos
   })
 
   return {
-    alunos: alunos || [],
+    alunos: data?.pages.flatMap(page => page.results) || [],
     isLoading,
     error: error?.message || null,
-    refetch
+    refetch,
+    hasMore: hasNextPage,
+    carregarMais: () => fetchNextPage(),
+    isLoadingMore: isFetchingNextPage
   }
 }
 
@@ -84,7 +91,7 @@ export function useDeleteAluno() {
 
 // Hook combinado para operações CRUD de alunos
 export function useAlunosCrud(filters?: AlunoFilters & PaginationParams) {
-  const { alunos, isLoading: isLoadingList, error: errorList, refetch } = useAlunos(filters)
+  const { alunos, isLoading: isLoadingList, error: errorList, refetch, hasMore, carregarMais, isLoadingMore } = useAlunos(filters)
   const createMutation = useCreateAluno()
   const updateMutation = useUpdateAluno()
   const deleteMutation = useDeleteAluno()
@@ -95,6 +102,9 @@ export function useAlunosCrud(filters?: AlunoFilters & PaginationParams) {
     isLoadingList,
     errorList,
     refetch,
+    hasMore,
+    carregarMais,
+    isLoadingMore,
     
     // Criar
     createAluno: createMutation.mutate,
@@ -116,23 +126,10 @@ export function useAlunosCrud(filters?: AlunoFilters & PaginationParams) {
 // Hook para estatísticas de alunos
 export function useAlunosStats() {
   return useQuery({
-    queryKey: ['alunos-stats'],
-    queryFn: async () => {
-      const alunos = await apiClient.alunos.list()
-      const total = alunos.length
-      const recentes = alunos.filter(aluno => {
-        if (!aluno.created_at) return false
-        const created = new Date(aluno.created_at)
-        const thirtyDaysAgo = new Date()
-        thirtyDaysAgo.setDate(thirtyDaysAgo.getDate() - 30)
-        return created >= thirtyDaysAgo
-      }).length
-
-      return {
-        total,
-        recentes
-      }
-    },
-    staleTime: 10 * 60 * 1000, // 10 minutos
+    ...dashboardSummaryQuery,
+    select: (resumo: DashboardSummary) => ({
+      total: resumo.alunos.total,
+      recentes: resumo.alunos.recentes ?? 0
+    }),
   })
 }
\ No newline at end of file
@@ -1,28 +1,35 @@
 'use client'
 
-import { useQuery, useMutation, useQueryClient } from '@tanstack/react-query'
-import { apiClient } from '@/lib/api-client'
+import { useInfiniteQuery, useQuery, useMutation, useQueryClient } from '@tanstack/react-query'
+import { apiClient, cursorDaPagina } from '@/lib/api-client'
+import { dashboardSummaryQuery } from './useDashboard'
 import type { 
   Curso, 
   CreateCursoData, 
   UpdateCursoData, 
   CursoFilters,
-  PaginationParams 
+  PaginationParams,
+  DashboardSummary
 } from '@/lib/types'
 
-// Hook para listar cursos com filtros
+// Hook para listar cursos com filtros; as páginas seguintes vêm sob demanda (carregarMais)
 export function useCursos(filters?: CursoFilters & PaginationParams) {
-  const { data: cursos, isLoading, error, refetch } = useQuery({
+  const { data, isLoading, error, refetch, hasNextPage, fetchNextPage, isFetchingNextPage } = useInfiniteQuery({
     queryKey: ['cursos', filters],
-    queryFn: () => apiClient.cursos.list(filters),
+    queryFn: ({ pageParam }) => apiClient.cursos.list({ ...filters, cursor: pageParam }),
+    initialPageParam: filters?.cursor,
+    getNextPageParam: (page) => cursorDaPagina(page.next),
     staleTime: 5 * 60 * 1000, // 5 minutos
   })
 
   return {
-    cursos: cursos || [],
+    cursos: data?.pages.flatMap(page => page.results) || [],
     isLoading,
     error: error?.message || null,
-    refetch
+    refetch,
+    hasMore: hasNextPage,
+    carregarMais: () => fetchNextPage(),
+    isLoadingMore: isFetchingNextPage
   }
 }
 
@@ -86,6 +93,9 @@ export function useCursosCrud(filters?: CursoFilters) {
     isLoadingList: cursosQuery.isLoading,
     errorList: cursosQuery.error,
     refetch: cursosQuery.refetch,
+    hasMore: cursosQuery.hasMore,
+    carregarMais: cursosQuery.carregarMais,
+    isLoadingMore: cursosQuery.isLoadingMore,
     
     // Criar curso
     createCurso: createCurso.mutate,
@@ -107,20 +117,10 @@ export function useCursosCrud(filters?: CursoFilters) {
 // Hook para estatísticas de cursos
 export function useCursosStats() {
   return useQuery({
-    queryKey: ['cursos-stats'],
-    queryFn: async () => {
-      const cursos = await apiClient.cursos.list()
-      return {
-        total: cursos.length,
-        recentes: cursos.filter(curso => {
-          if (!curso.created_at) return false
-          const created = new Date(curso.created_at)
-          const thirtyDaysAgo = new Date()
-          thirtyDaysAgo.setDate(thirtyDaysAgo.getDate() - 30)
-          return created >= thirtyDaysAgo
-        }).length
-      }
-    },
-    staleTime: 5 * 60 * 1000,
+    ...dashboardSummaryQuery,
+    select: (resumo: DashboardSummary) => ({
+      total: resumo.cursos.total,
+      recentes: resumo.cursos.recentes ?? 0
+    }),
   })
 }
\ No newline at end of file
@@ -0,0 +1,17 @@
+'use client'
+
+import { useQuery } from '@tanstack/react-query'
+import { apiClient } from '@/lib/api-client'
+import type { DashboardSummary } from '@/lib/types'
+
+// Consulta compartilhada pelos hooks de estatísticas: uma única requisição
+// a /dashboard/summary/ alimenta todos os cards da página inicial
+export const dashboardSummaryQuery = {
+  queryKey: ['dashboard-summary'],
+  queryFn: () => apiClient.dashboard.summary(),
+  staleTime: 5 * 60 * 1000,
+}
+
+export function useDashboardSummary() {
+  return useQuery<DashboardSummary>(dashboardSummaryQuery)
+}
@@ -1,19 +1,24 @@
 'use client'
 
-import { useQuery, useMutation, useQueryClient } from '@tanstack/react-query'
-import { apiClient } from '@/lib/api-client'
+import { useInfiniteQuery, useQuery, useMutation, useQueryClient } from '@tanstack/react-query'
+import { apiClient, cursorDaPagina } from '@/lib/api-client'
+import { dashboardSummaryQuery } from './useDashboard'
 import type { 
   Empresa, 
   CreateEmpresaData, 
   UpdateEmpresaData, 
-  FilterParams 
+  FilterParams,
+  PaginationParams,
+  DashboardSummary
 } from '@/lib/types'
 
-// Hook para listar empresas
-export function useEmpresas(filters?: FilterParams) {
-  return useQuery({
+// Hook para listar empresas; as páginas seguintes vêm sob demanda (fetchNextPage)
+export function useEmpresas(filters?: FilterParams & PaginationParams) {
+  return useInfiniteQuery({
     queryKey: ['empresas', filters],
-    queryFn: () => apiClient.empresas.list(filters),
+    queryFn: ({ pageParam }) => apiClient.empresas.list({ ...filters, cursor: pageParam }),
+    initialPageParam: filters?.cursor,
+    getNextPageParam: (page) => cursorDaPagina(page.next),
     staleTime: 5 * 60 * 1000,
   })
 }
@@ -65,7 +70,7 @@ export function useDeleteEmpresa() {
 }
 
 // Hook para CRUD completo de empresas
-export function useEmpresasCrud(filters?: FilterParams) {
+export function useEmpresasCrud(filters?: FilterParams & PaginationParams) {
   const empresas = useEmpresas(filters)
   const createEmpresa = useCreateEmpresa()
   const updateEmpresa = useUpdateEmpresa()
@@ -73,10 +78,13 @@ export function useEmpresasCrud(filters?: FilterParams) {
 
   return {
     // Lista de empresas
-    empresas: empresas.data || [],
+    empresas: empresas.data?.pages.flatMap(page => page.results) || [],
     isLoadingList: empresas.isLoading,
     errorList: empresas.error,
     refetch: empresas.refetch,
+    hasMore: empresas.hasNextPage,
+    carregarMais: () => empresas.fetchNextPage(),
+    isLoadingMore: empresas.isFetchingNextPage,
     
     // Criar empresa
     createEmpresa: createEmpresa.mutate,
@@ -98,21 +106,11 @@ export function useEmpresasCrud(filters?: FilterParams) {
 // Hook para estatísticas de empresas
 export function useEmpresasStats() {
   return useQuery({
-    queryKey: ['empresas-stats'],
-    queryFn: async () => {
-      const empresas = await apiClient.empresas.list()
-      return {
-        total: empresas.length,
-        recentes: empresas.filter(empresa => {
-          if (!empresa.created_at) return false
-          const created = new Date(empresa.created_at)
-          const thirtyDaysAgo = new Date()
-          thirtyDaysAgo.setDate(thirtyDaysAgo.getDate() - 30)
-          return created >= thirtyDaysAgo
-        }).length
-      }
-    },
-    staleTime: 5 * 60 * 1000,
+    ...dashboardSummaryQuery,
+    select: (resumo: DashboardSummary) => ({
+      total: resumo.empresas.total,
+      recentes: resumo.empresas.recentes ?? 0
+    }),
   })
 }
 
@@ -121,7 +119,7 @@ export function useEmpresasOptions() {
   return useQuery({
     queryKey: ['empresas-options'],
     queryFn: async () => {
-      const empresas = await apiClient.empresas.list()
+      const empresas = await apiClient.empresas.catalogo()
       return empresas.map(empresa => ({
         value: empresa.id,
         label: empresa.nome
@@ -12,11 +12,30 @@ import {
   FilterParams,
   PaginationParams,
   AlunoFilters,
-  CursoFilters
+  CursoFilters,
+  CursorPage,
+  FinanceiroFilters,
+  FinanceiroResumo,
+  DashboardSummary
 } from './types'
 
 const API_BASE_URL = process.env.NEXT_PUBLIC_API_URL || 'http://localhost:4000/api'
 
+// Cursor da próxima página, extraído da URL `next` devolvida pelas listagens
+export function cursorDaPagina(url: string | null): string | undefined {
+  if (!url) return undefined
+  return new URL(url).searchParams.get('cursor') ?? undefined
+}
+
+// Parâmetros sem valor ficam fora da URL: o cursor da primeira página é
+// undefined e viraria "?cursor=undefined", que o backend recusa com 404
+export function montarQuery(params?: Record<string, any>): string {
+  const definidos = Object.entries(params ?? {})
+    .filter(([, valor]) => valor !== undefined && valor !== null)
+    .map(([chave, valor]): [string, string] => [chave, String(valor)])
+  return new URLSearchParams(definidos).toString()
+}
+
 export class ApiError extends Error {
   constructor(
     message: string,
@@ -89,7 +108,8 @@ class ApiClient {
 
   // Métodos HTTP genéricos
   async get<T>(endpoint: string, params?: any): Promise<T> {
-    const url = params ? `${endpoint}?${new URLSearchParams(params)}` : endpoint
+    const query = montarQuery(params)
+    const url = query ? `${endpoint}?${query}` : endpoint
     return this.request<T>(url, { method: 'GET' })
   }
 
@@ -121,7 +141,10 @@ class ApiClient {
   // Métodos para Empresas
   empresas = {
     list: (params?: FilterParams & PaginationParams) => 
-      this.get<Empresa[]>('/empresas/', params),
+      this.get<CursorPage<Empresa>>('/empresas/', params),
+    
+    catalogo: () => 
+      this.get<Empresa[]>('/empresas/catalogo/'),
     
     get: (id: number) => 
       this.get<Empresa>(`/empresas/${id}/`),
@@ -139,7 +162,7 @@ class ApiClient {
   // Métodos para Alunos
   alunos = {
     list: (params?: AlunoFilters & PaginationParams) => 
-      this.get<Aluno[]>('/alunos/', params),
+      this.get<CursorPage<Aluno>>('/alunos/', params),
     
     get: (id: number) => 
       this.get<Aluno>(`/alunos/${id}/`),
@@ -157,7 +180,10 @@ class ApiClient {
   // Métodos para Cursos
   cursos = {
     list: (params?: CursoFilters & PaginationParams) => 
-      this.get<Curso[]>('/cursos/', params),
+      this.get<CursorPage<Curso>>('/cursos/', params),
+    
+    catalogo: () => 
+      this.get<Curso[]>('/cursos/catalogo/'),
     
     get: (id: number) => 
       this.get<Curso>(`/cursos/${id}/`),
@@ -171,6 +197,18 @@ class ApiClient {
     delete: (id: number) => 
       this.delete(`/cursos/${id}/`)
   }
+
+  // Resumo do dashboard
+  dashboard = {
+    summary: (limite?: number) => 
+      this.get<DashboardSummary>('/dashboard/summary/', limite ? { limite } : undefined)
+  }
+
+  // Métodos para Financeiro
+  financeiro = {
+    resumo: (params?: FinanceiroFilters) => 
+      this.get<FinanceiroResumo>('/financeiro/', params)
+  }
 }
 
 // Instância singleton do cliente API
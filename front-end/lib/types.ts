@@ -90,27 +90,39 @@ export interface MutationState extends LoadingState {
   isSuccess: boolean
 }
 
-// Tipos para filtros e paginação (para futuras implementações)
+// Tipos para filtros e paginação
 export interface PaginationParams {
-  page?: number
+  cursor?: string
   limit?: number
 }
 
+// Página retornada pelas listagens (paginação por cursor)
+export interface CursorPage<T> {
+  next: string | null
+  previous: string | null
+  results: T[]
+}
+
 export interface FilterParams {
-  search?: string
-  empresa_id?: number
+  nome?: string // prefixo
+  ordering?: string // ex.: 'nome' ou '-created_at'
+  fields?: string // ex.: 'id,nome,email'
+  expand?: string // ex.: 'empresa'
 }
 
 export interface AlunoFilters extends FilterParams {
-  data_nascimento_inicio?: string
-  data_nascimento_fim?: string
+  empresa_id?: number
+  cpf?: string
+  email?: string
+  created_at_inicio?: string
+  created_at_fim?: string
 }
 
 export interface CursoFilters extends FilterParams {
-  preco_min?: number
-  preco_max?: number
-  carga_horaria_min?: number
-  carga_horaria_max?: number
+  valor_min?: number
+  valor_max?: number
+  created_at_inicio?: string
+  created_at_fim?: string
 }
 
 // Tipos para formulários
@@ -159,6 +171,56 @@ export interface DashboardStats {
   cursos_ativos: number
 }
 
+// Resumo do dashboard (GET /dashboard/summary/)
+export interface ResumoEntidade<T> {
+  total: number
+  recentes?: number
+  ultimos: T[]
+}
+
+export interface DashboardSummary {
+  alunos: ResumoEntidade<Pick<Aluno, 'id' | 'nome' | 'email' | 'created_at'>>
+  cursos: ResumoEntidade<Pick<Curso, 'id' | 'nome' | 'valor' | 'created_at'>>
+  empresas: ResumoEntidade<Pick<Empresa, 'id' | 'nome' | 'cnpj'>>
+  turmas_ativas: {
+    total: number
+    itens: {
+      id: number
+      curso_id: number
+      curso_id__nome: string
+      localidade: string
+      data_inicio: string
+      data_fim: string
+    }[]
+  }
+  pagamentos_pendentes: {
+    total: number
+    valor: number | null
+  }
+}
+
+// Financeiro (GET /financeiro/)
+export interface LinhaFinanceira {
+  receita: number
+  pagamentos: number
+}
+
+export interface FinanceiroFilters {
+  status?: string
+  tipo_pagamento?: string
+  curso_id?: number
+  created_at_inicio?: string
+  created_at_fim?: string
+}
+
+export interface FinanceiroResumo {
+  total: LinhaFinanceira
+  por_curso: (LinhaFinanceira & { curso_id: number; curso: string })[]
+  por_status: (LinhaFinanceira & { status: string })[]
+  por_tipo_pagamento: (LinhaFinanceira & { tipo_pagamento: string })[]
+  por_mes: (LinhaFinanceira & { mes: string })[]
+}
+
 // Tipos para validação
 export interface ValidationError {
   field: string